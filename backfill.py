@@ -0,0 +1,335 @@
+"""
+Parallel Backfill
+Splits a long date range into shards (calendar months or listing-page
+ranges, whichever the scraper's listing supports), runs them concurrently
+under the shared per-host rate limits and merges finished shards into the
+master file in batches. Per-shard progress is kept on disk so an
+interrupted backfill resumes where it stopped.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Tuple
+
+from base_scraper import ScraperOrchestrator, ScraperResult, ContentFilter
+
+
+def month_shards(start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """One shard per calendar month overlapping [start_date, end_date]"""
+    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+
+    shards = []
+    month_start = start_dt.replace(day=1)
+    while month_start <= end_dt:
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        shard_start = max(month_start, start_dt)
+        shard_end = min(next_month - timedelta(days=1), end_dt)
+        shards.append({
+            'id': month_start.strftime('%Y-%m'),
+            'start_date': shard_start.strftime('%Y-%m-%d'),
+            'end_date': shard_end.strftime('%Y-%m-%d'),
+            'kwargs': {}
+        })
+        month_start = next_month
+
+    return shards
+
+
+def single_shard(start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """The whole range as one shard, for listings that can neither be paged nor queried by date"""
+    return [{'id': 'all', 'start_date': start_date, 'end_date': end_date, 'kwargs': {}}]
+
+
+def page_shards(start_date: str, end_date: str, total_pages: int, pages_per_shard: int) -> List[Dict[str, Any]]:
+    """Shards of consecutive listing pages, each filtering by the whole date range"""
+    shards = []
+    for start_page in range(0, total_pages, pages_per_shard):
+        shards.append({
+            'id': f"pages-{start_page:05d}",
+            'start_date': start_date,
+            'end_date': end_date,
+            # Feeds only hold recent items, so page shards go straight to the listing
+            'kwargs': {
+                'start_page': start_page,
+                'max_pages': min(pages_per_shard, total_pages - start_page),
+                'use_discovery': False
+            }
+        })
+    return shards
+
+
+class Backfill:
+    """Run one scraper over many shards concurrently with resumable progress"""
+
+    def __init__(self, orchestrator: ScraperOrchestrator, scraper_name: str, start_date: str, end_date: str,
+                 shards: List[Dict[str, Any]], workers: int = 4, scrape_full_content: bool = True,
+                 restart: bool = False, merge_every: int = 10):
+        if scraper_name not in orchestrator.loaded_scrapers:
+            available = list(orchestrator.loaded_scrapers.keys())
+            raise ValueError(f"Scraper '{scraper_name}' not found. Available: {available}")
+
+        self.orchestrator = orchestrator
+        self.scraper_name = scraper_name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.shards = shards
+        self.workers = max(1, workers)
+        self.scrape_full_content = scrape_full_content
+        self.merge_every = max(1, merge_every)  # Finished shards held in memory per master file write
+
+        self.progress_path = orchestrator.output_directory / f"backfill_{scraper_name}.json"
+        self.progress = self._load_progress(restart)
+
+        self._claim_lock = threading.Lock()
+        self.claimed_urls = set()
+        self._unmerged = []  # (shard, result, failed_urls, shard_progress) not yet in the master file
+
+    def _plan_key(self) -> str:
+        return f"{self.start_date}:{self.end_date}:{','.join(shard['id'] for shard in self.shards)}"
+
+    def _load_progress(self, restart: bool) -> Dict[str, Any]:
+        """Resume a previous backfill of the same plan, or start fresh"""
+        fresh = {'plan': self._plan_key(), 'scraper': self.scraper_name, 'shards': {}}
+        if restart or not self.progress_path.exists():
+            return fresh
+
+        try:
+            with open(self.progress_path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load backfill progress, starting over: {e}")
+            return fresh
+
+        if progress.get('plan') != fresh['plan']:
+            print("Backfill plan changed since the last run, starting over")
+            return fresh
+        return progress
+
+    def _save_progress(self):
+        tmp_path = self.progress_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.progress, f, indent=2)
+        tmp_path.replace(self.progress_path)
+
+    def _new_scraper(self):
+        """A scraper instance per shard, so shards never share parsing state"""
+        scraper = type(self.orchestrator.loaded_scrapers[self.scraper_name])()
+        self.orchestrator._configure_fetcher(scraper)
+        return scraper
+
+    def _run_shard(self, shard: Dict[str, Any]) -> Tuple[ScraperResult, List[Dict[str, Any]], Dict[str, Any]]:
+        """Scrape one shard; the result is merged into the master file later, with other shards"""
+        scraper = self._new_scraper()
+        scraper.failed_urls = []
+        scraper_info = scraper.get_scraper_info()
+
+        result = ScraperResult(
+            scraper_info['name'],
+            scraper_info.get('website', 'Unknown'),
+            None,
+            ContentFilter(self.orchestrator.filter_config),
+            self.orchestrator.raw_store
+        )
+
+        announcements = scraper.scrape_announcements(shard['start_date'], shard['end_date'], **shard['kwargs'])
+
+        # Every shard dedups against the same set, so an item on a shard boundary is kept once
+        new_urls = []
+        with self._claim_lock:
+            for announcement in announcements:
+                url = announcement.get('url')
+                if url in self.claimed_urls:
+                    result.skipped_duplicates += 1
+                    continue
+                if result.add_announcement(announcement) and url:
+                    self.claimed_urls.add(url)
+                    new_urls.append(url)
+
+        new_urls = self.orchestrator._fetchable(new_urls, scraper.failed_urls)
+        if self.scrape_full_content and new_urls:
+            for content in scraper.scrape_full_content(new_urls):
+                result.add_full_content(content)
+
+        return result, scraper.failed_urls, {
+            'status': 'done',
+            'announcements': len(result.announcements),
+            'full_content': len(result.full_content),
+            'failed_urls': len(scraper.failed_urls),
+            'finished_at': datetime.now().isoformat()
+        }
+
+    def _merge(self):
+        """Write the finished shards held in memory to the master file in one update"""
+        if not self._unmerged:
+            return
+        first_result = self._unmerged[0][1]
+        combined = ScraperResult(first_result.scraper_name, first_result.website,
+                                 content_filter=ContentFilter(self.orchestrator.filter_config),
+                                 raw_store=self.orchestrator.raw_store)
+        for shard, result, failed_urls, _ in self._unmerged:
+            combined.announcements.extend(result.announcements)
+            combined.full_content.extend(result.full_content)
+            combined.errors.extend(result.errors)
+            combined.skipped_duplicates += result.skipped_duplicates
+            combined.filtered_items += result.filtered_items
+            for reason, count in result.content_filter.filter_reasons.items():
+                combined.content_filter.filtered_count += count
+                combined.content_filter.filter_reasons[reason] = combined.content_filter.filter_reasons.get(reason, 0) + count
+            for failure in failed_urls:
+                self.orchestrator.retry_queue.add(self.scraper_name, failure, shard['start_date'], shard['end_date'])
+        combined.statistics['date_range'] = f"{self.start_date} to {self.end_date}"
+
+        self.orchestrator.update_master_file({self.scraper_name: combined})
+        # Shards count as done only once their items are stored
+        for shard, _, _, shard_progress in self._unmerged:
+            self.progress['shards'][shard['id']] = shard_progress
+        self._save_progress()
+        self.orchestrator.retry_queue.save()
+        print(f"Merged {len(self._unmerged)} shards into the master file")
+        self._unmerged = []
+
+    def _collect(self, shard: Dict[str, Any], future: Any):
+        """Hold a finished shard's result for the next merge, or record its failure"""
+        try:
+            result, failed_urls, shard_progress = future.result()
+        except Exception as e:
+            print(f"Shard {shard['id']} failed: {e}")
+            self.progress['shards'][shard['id']] = {
+                'status': 'failed', 'error': str(e), 'finished_at': datetime.now().isoformat()
+            }
+            self._save_progress()
+            return
+
+        print(f"Shard {shard['id']} done: {shard_progress['announcements']} announcements, "
+              f"{shard_progress['full_content']} full content")
+        self._unmerged.append((shard, result, failed_urls, shard_progress))
+
+    def run(self) -> Dict[str, Any]:
+        """Run all unfinished shards; returns totals"""
+        pending = [
+            shard for shard in self.shards
+            if self.progress['shards'].get(shard['id'], {}).get('status') != 'done'
+        ]
+        print(f"Backfill {self.scraper_name} {self.start_date} to {self.end_date}: "
+              f"{len(pending)} of {len(self.shards)} shards to run with {self.workers} workers")
+
+        # Dedup against what is already stored, including shards finished in earlier runs
+        self.claimed_urls.update(self.orchestrator.get_existing_urls(self.scraper_name, self.start_date, self.end_date))
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='backfill')
+        futures = {executor.submit(self._run_shard, shard): shard for shard in pending}
+        collected = set()
+        try:
+            for future in as_completed(futures):
+                collected.add(future)
+                self._collect(futures[future], future)
+                if len(self._unmerged) >= self.merge_every:
+                    self._merge()
+        except KeyboardInterrupt:
+            # Let running shards finish but start no more, then keep what finished
+            print("Interrupted: waiting for running shards, queued shards are left for the next run")
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future, shard in futures.items():
+                if future not in collected and future.done() and not future.cancelled():
+                    self._collect(shard, future)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            self._merge()
+            self.orchestrator.retry_queue.save()
+            if self.orchestrator.rate_controller:
+                self.orchestrator.rate_controller.save_state()
+            if self.orchestrator.robots:
+                self.orchestrator.robots.save_state()
+
+        shard_states = [self.progress['shards'].get(shard['id'], {}) for shard in self.shards]
+        return {
+            'shards_done': sum(1 for state in shard_states if state.get('status') == 'done'),
+            'shards_failed': sum(1 for state in shard_states if state.get('status') == 'failed'),
+            'announcements': sum(state.get('announcements', 0) for state in shard_states),
+            'full_content': sum(state.get('full_content', 0) for state in shard_states)
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backfill a long date range in parallel, resumable shards')
+    parser.add_argument('--scraper', required=True, help='Scraper to backfill')
+    parser.add_argument('--start-date', required=True, help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', required=True, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--shard-by', choices=['auto', 'month', 'pages', 'single'], default='auto',
+                        help="Split by calendar month, listing-page range or not at all (default: what the "
+                             "scraper's listing supports: pages for FDA, single for alz.org)")
+    parser.add_argument('--total-pages', type=int, default=200, help='Listing pages to cover with --shard-by pages')
+    parser.add_argument('--pages-per-shard', type=int, default=10, help='Listing pages per shard with --shard-by pages')
+    parser.add_argument('--workers', type=int, default=4, help='Shards run concurrently')
+    parser.add_argument('--merge-every', type=int, default=10,
+                        help='Finished shards merged into the master file per write (default: 10)')
+    parser.add_argument('--no-full-content', action='store_true', help='Skip full content scraping')
+    parser.add_argument('--restart', action='store_true', help='Ignore saved progress and run every shard')
+    parser.add_argument('--scrapers-dir', default='scrapers', help='Directory containing scraper modules')
+    parser.add_argument('--output-dir', default='scraped_data', help='Output directory')
+    parser.add_argument('--master-file', default='master_scraped_data.json', help='Master file name')
+    parser.add_argument('--partitioned-store', action='store_true',
+                        help='Store items in monthly partitions instead of one master file')
+
+    args = parser.parse_args()
+
+    orchestrator = ScraperOrchestrator(
+        args.scrapers_dir,
+        args.output_dir,
+        args.master_file,
+        partitioned=args.partitioned_store
+    )
+    orchestrator.discover_scrapers()
+
+    if args.scraper not in orchestrator.loaded_scrapers:
+        print(f"Error: Scraper '{args.scraper}' not found. Available: {list(orchestrator.loaded_scrapers.keys())}")
+        sys.exit(1)
+
+    shard_by = args.shard_by
+    if shard_by == 'auto':
+        shard_by = getattr(orchestrator.loaded_scrapers[args.scraper], 'backfill_shard_by', 'single')
+    if shard_by == 'pages':
+        shards = page_shards(args.start_date, args.end_date, args.total_pages, args.pages_per_shard)
+    elif shard_by == 'month':
+        shards = month_shards(args.start_date, args.end_date)
+    else:
+        shards = single_shard(args.start_date, args.end_date)
+    print(f"Sharding {args.scraper} by {shard_by}: {len(shards)} shards")
+
+    backfill = Backfill(orchestrator, args.scraper, args.start_date, args.end_date, shards,
+                        workers=args.workers, scrape_full_content=not args.no_full_content,
+                        restart=args.restart, merge_every=args.merge_every)
+
+    try:
+        totals = backfill.run()
+    except KeyboardInterrupt:
+        print("Backfill interrupted; re-run the same command to resume")
+        sys.exit(130)
+
+    print(f"\nShards done: {totals['shards_done']}/{len(shards)}")
+    if totals['shards_failed']:
+        print(f"Shards failed: {totals['shards_failed']} (re-run the same command to retry them)")
+    print(f"New announcements: {totals['announcements']}")
+    print(f"New full content: {totals['full_content']}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# USAGE EXAMPLES:
+#
+# 1. Backfill FDA by listing-page ranges (chosen automatically; its listing is one long paginated list):
+#    python backfill.py --scraper fda_scraper --start-date 2020-01-01 --end-date 2025-12-31 \
+#        --total-pages 400 --pages-per-shard 20 --workers 6
+#
+# 2. Backfill alz.org (a single shard: one news page covers every date):
+#    python backfill.py --scraper alz_org_scraper --start-date 2020-01-01 --end-date 2025-12-31
+#
+# 3. Resume after an interruption: run the same command again; finished shards are skipped
@@ -1,13 +1,33 @@
+import contextlib
+import functools
+import itertools
 import json
+import math
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-import importlib.util
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Set
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Set, Iterable, Iterator, Mapping, Tuple, Callable
 import uuid
 
+from raw_store import RawDataStore
+from near_duplicates import NearDuplicateIndex, simhash, fingerprint_to_hex, fingerprint_from_hex
+from partitioned_store import PartitionedMasterStore, open_store_for_master, get_item_date, DATE_FIELDS
+from rate_limiter import get_shared_rate_limiter, AdaptiveRateController, set_shared_rate_controller
+from retry_policy import RetryQueue
+from document_store import DocumentStore
+from transport import build_transport, set_shared_transport, install_dns_cache
+from robots import RobotsCache
+from plugin_manifest import PluginManifest, LazyScraperRegistry
+from content_priority import ContentPriorityScorer, ContentPriorityQueue
+from run_budget import RunBudget
+from instrumentation import Instrumentation
+
 class ContentFilter:
     """Flexible content filtering system"""
     
@@ -113,13 +133,17 @@ class ContentFilter:
             should_filter, reason = self.should_filter(item)
             
             if should_filter:
-                self.filtered_count += 1
-                self.filter_reasons[reason] = self.filter_reasons.get(reason, 0) + 1
+                self.record_filtered(reason)
             else:
                 filtered_items.append(item)
         
         return filtered_items
     
+    def record_filtered(self, reason: str):
+        """Count an item dropped for the given reason"""
+        self.filtered_count += 1
+        self.filter_reasons[reason] = self.filter_reasons.get(reason, 0) + 1
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get filtering statistics"""
         return {
@@ -135,6 +159,10 @@ class ContentFilter:
 class BaseScraperInterface(ABC):
     """Abstract base class that all website scrapers must implement"""
     
+    # How backfill.py splits a long range: 'month' if the listing can be queried by date,
+    # 'pages' if scrape_announcements takes start_page/max_pages, 'single' otherwise
+    backfill_shard_by = 'single'
+    
     @abstractmethod
     def get_scraper_info(self) -> Dict[str, str]:
         """Return scraper metadata (name, version, supported_sites, etc.)"""
@@ -154,11 +182,109 @@ class BaseScraperInterface(ABC):
     def validate_date_format(self, date_str: str) -> bool:
         """Validate if date format is supported by this scraper"""
         pass
+    
+    def iter_announcements(self, start_date: str, end_date: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield announcements as they are found (default: all at once from scrape_announcements)"""
+        yield from self.scrape_announcements(start_date, end_date, **kwargs)
+    
+    def iter_full_content(self, announcement_urls: Iterable[str], **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield full content as URLs arrive (default: scrape_full_content one URL at a time)"""
+        for url in announcement_urls:
+            yield from self.scrape_full_content([url], **kwargs)
+    
+    def scrape_listing_page(self, url: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Re-scrape a listing page that failed in an earlier run (default: the whole range again)"""
+        return self.scrape_announcements(start_date, end_date)
+    
+    def parse_full_content(self, url: str, html: bytes) -> Dict[str, Any]:
+        """Extract full content from an already fetched page; lets re-crawls use conditional GETs"""
+        raise NotImplementedError
+
+@dataclass(slots=True)
+class AnnouncementRecord:
+    """Compact standardized announcement, serialized to a dict only when written"""
+    id: str
+    title: str
+    url: str
+    date: str
+    category: str
+    excerpt: str
+    source_website: str
+    scraped_at: str
+    simhash: str
+    raw_ref: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the master file dict shape"""
+        data = {
+            'id': self.id,
+            'title': self.title,
+            'url': self.url,
+            'date': self.date,
+            'category': self.category,
+            'excerpt': self.excerpt,
+            'source_website': self.source_website,
+            'scraped_at': self.scraped_at,
+            'simhash': self.simhash
+        }
+        if self.raw_ref is not None:
+            data['raw_ref'] = self.raw_ref
+        else:
+            data['raw_data'] = self.raw_data
+        return data
+
+@dataclass(slots=True)
+class ContentRecord:
+    """Compact standardized full content item, serialized to a dict only when written"""
+    id: str
+    url: str
+    title: str
+    date_published: str
+    full_content: str
+    word_count: int
+    images: List[Any]
+    links: List[Any]
+    contact_info: str
+    tags: List[str]
+    comments: List[Dict[str, Any]]
+    metadata: Dict[str, Any]
+    source_website: str
+    scraped_at: str
+    simhash: str
+    raw_ref: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the master file dict shape"""
+        data = {
+            'id': self.id,
+            'url': self.url,
+            'title': self.title,
+            'date_published': self.date_published,
+            'full_content': self.full_content,
+            'word_count': self.word_count,
+            'images': self.images,
+            'links': self.links,
+            'contact_info': self.contact_info,
+            'tags': self.tags,
+            'comments': self.comments,
+            'metadata': self.metadata,
+            'source_website': self.source_website,
+            'scraped_at': self.scraped_at,
+            'simhash': self.simhash
+        }
+        if self.raw_ref is not None:
+            data['raw_ref'] = self.raw_ref
+        else:
+            data['raw_data'] = self.raw_data
+        return data
 
 class ScraperResult:
     """Standardized result container with deduplication and filtering support"""
     
-    def __init__(self, scraper_name: str, website: str, existing_urls: Set[str] = None, content_filter: ContentFilter = None):
+    def __init__(self, scraper_name: str, website: str, existing_urls: Set[str] = None, content_filter: ContentFilter = None,
+                 raw_store: RawDataStore = None):
         self.scraper_name = scraper_name
         self.website = website
         self.scraped_at = datetime.now().isoformat()
@@ -173,6 +299,8 @@ class ScraperResult:
         self.skipped_duplicates = 0
         self.content_filter = content_filter or ContentFilter()
         self.filtered_items = 0
+        self.raw_store = raw_store
+        self.metrics = None  # Instrumentation of the run that produced this result
     
     def add_announcement(self, announcement: Dict[str, Any]):
         """Add announcement if URL is not a duplicate and passes filters"""
@@ -181,6 +309,7 @@ class ScraperResult:
         # Apply content filter first
         should_filter, reason = self.content_filter.should_filter(announcement)
         if should_filter:
+            self.content_filter.record_filtered(reason)
             self.filtered_items += 1
             return False  # Skip filtered item
         
@@ -202,39 +331,51 @@ class ScraperResult:
         standardized = self._standardize_content(content)
         self.full_content.append(standardized)
     
-    def _standardize_announcement(self, announcement: Dict[str, Any]) -> Dict[str, Any]:
+    def _standardize_announcement(self, announcement: Dict[str, Any]) -> AnnouncementRecord:
         """Standardize announcement format"""
-        return {
-            'id': announcement.get('id', str(uuid.uuid4())),
-            'title': announcement.get('title', ''),
-            'url': announcement.get('url', ''),
-            'date': announcement.get('date', ''),
-            'category': announcement.get('category', 'General'),
-            'excerpt': announcement.get('excerpt', ''),
-            'source_website': self.website,
-            'scraped_at': self.scraped_at,
-            'raw_data': announcement  # Preserve original data
-        }
+        raw_ref, raw_data = self._raw_reference(announcement)  # Preserve original data
+        return AnnouncementRecord(
+            id=announcement.get('id', str(uuid.uuid4())),
+            title=announcement.get('title', ''),
+            url=announcement.get('url', ''),
+            date=announcement.get('date', ''),
+            category=announcement.get('category', 'General'),
+            excerpt=announcement.get('excerpt', ''),
+            source_website=self.website,
+            scraped_at=self.scraped_at,
+            simhash=fingerprint_to_hex(simhash(announcement.get('title', ''))),
+            raw_ref=raw_ref,
+            raw_data=raw_data
+        )
     
-    def _standardize_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
+    def _standardize_content(self, content: Dict[str, Any]) -> ContentRecord:
         """Standardize full content format"""
-        return {
-            'id': content.get('id', str(uuid.uuid4())),
-            'url': content.get('url', ''),
-            'title': content.get('title', ''),
-            'date_published': content.get('date_published', ''),
-            'full_content': content.get('full_content', ''),
-            'word_count': content.get('word_count', 0),
-            'images': content.get('images', []),
-            'links': content.get('links', []),
-            'contact_info': content.get('contact_info', ''),
-            'tags': content.get('tags', []),
-            'comments': content.get('comments', []),
-            'metadata': content.get('metadata', {}),
-            'source_website': self.website,
-            'scraped_at': self.scraped_at,
-            'raw_data': content  # Preserve original data
-        }
+        raw_ref, raw_data = self._raw_reference(content)  # Preserve original data
+        return ContentRecord(
+            id=content.get('id', str(uuid.uuid4())),
+            url=content.get('url', ''),
+            title=content.get('title', ''),
+            date_published=content.get('date_published', ''),
+            full_content=content.get('full_content', ''),
+            word_count=content.get('word_count', 0),
+            images=content.get('images', []),
+            links=content.get('links', []),
+            contact_info=content.get('contact_info', ''),
+            tags=content.get('tags', []),
+            comments=content.get('comments', []),
+            metadata=content.get('metadata', {}),
+            source_website=self.website,
+            scraped_at=self.scraped_at,
+            simhash=fingerprint_to_hex(simhash(content.get('full_content', '') or content.get('title', ''))),
+            raw_ref=raw_ref,
+            raw_data=raw_data
+        )
+    
+    def _raw_reference(self, raw: Dict[str, Any]) -> tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Reference the original payload in the side store, or inline it if there is none"""
+        if self.raw_store is None:
+            return None, raw
+        return self.raw_store.put(raw), None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -257,8 +398,8 @@ class ScraperResult:
                 'new_urls_found': len(self.new_urls),
                 **self.statistics
             },
-            'announcements': self.announcements,
-            'full_content': self.full_content,
+            'announcements': [announcement.to_dict() for announcement in self.announcements],
+            'full_content': [content.to_dict() for content in self.full_content],
             'metadata': self.metadata,
             'errors': self.errors
         }
@@ -266,8 +407,11 @@ class ScraperResult:
 class FeedGenerator:
     """Generate lightweight JSON feeds for web display"""
     
-    def __init__(self, feeds_directory: str = "feeds"):
+    def __init__(self, feeds_directory: str = "feeds", near_duplicate_distance: int = 6,
+                 metrics: Instrumentation = None):
         self.feeds_directory = Path(feeds_directory)
+        self.near_duplicate_distance = near_duplicate_distance  # Max SimHash bit difference
+        self.metrics = metrics or Instrumentation()
         self.feeds_directory.mkdir(exist_ok=True)
         
         # Create subdirectories
@@ -302,17 +446,77 @@ class FeedGenerator:
                 'word_count': item.get('word_count', 0)
             }
     
-    def generate_latest_feed(self, master_data: Dict[str, Any], max_items: int = None) -> str:
+    def _content_fingerprints(self, master_data: Dict[str, Any]) -> Dict[str, int]:
+        """Map URL to the SimHash of its full content, across all scrapers"""
+        fingerprints = {}
+        for scraper_data in master_data.get('results_by_scraper', {}).values():
+            for content in scraper_data.get('full_content', []):
+                url = content.get('url')
+                if not url:
+                    continue
+                fingerprint = fingerprint_from_hex(content.get('simhash'))
+                if fingerprint is None:
+                    fingerprint = simhash(content.get('full_content', ''))
+                if fingerprint:
+                    fingerprints[url] = fingerprint
+        return fingerprints
+    
+    def _announcement_fingerprint(self, announcement: Dict[str, Any], content_fingerprints: Dict[str, int]) -> int:
+        """Prefer the full content signature, fall back to the title"""
+        fingerprint = content_fingerprints.get(announcement.get('url', ''))
+        if fingerprint:
+            return fingerprint
+        fingerprint = fingerprint_from_hex(announcement.get('simhash'))
+        if fingerprint is None:
+            fingerprint = simhash(announcement.get('title', ''))
+        return fingerprint
+    
+    def flag_near_duplicates(self, items: List[Dict[str, Any]], fingerprints: List[int]) -> int:
+        """
+        Cluster near-duplicate feed items and flag all but the earliest of each cluster
+        Returns: number of items flagged as duplicates
+        """
+        index = NearDuplicateIndex(self.near_duplicate_distance)
+        for position, fingerprint in enumerate(fingerprints):
+            index.add(str(position), fingerprint)
+        
+        flagged = 0
+        for members in index.clusters().values():
+            cluster_items = sorted(
+                (items[int(member)] for member in members),
+                key=lambda x: (x.get('date', '') or x.get('scraped_at', ''), x.get('scraped_at', ''))
+            )
+            canonical = cluster_items[0]
+            for item in cluster_items:
+                item['duplicate_cluster'] = canonical['id']
+                if item is not canonical:
+                    item['near_duplicate_of'] = canonical['id']
+                    flagged += 1
+        
+        return flagged
+    
+    def generate_latest_feed(self, master_data: Dict[str, Any], max_items: int = None,
+                             collapse_duplicates: bool = False) -> str:
         """Generate latest feed across all scrapers"""
         
         all_items = []
+        fingerprints = []
+        with self.metrics.timer('feed_collect'):
+            content_fingerprints = self._content_fingerprints(master_data)
+            
+            for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
+                # Collect announcements
+                for announcement in scraper_data.get('announcements', []):
+                    lightweight_item = self.create_lightweight_item(announcement, 'announcement')
+                    lightweight_item['scraper'] = scraper_name
+                    all_items.append(lightweight_item)
+                    fingerprints.append(self._announcement_fingerprint(announcement, content_fingerprints))
         
-        for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
-            # Collect announcements
-            for announcement in scraper_data.get('announcements', []):
-                lightweight_item = self.create_lightweight_item(announcement, 'announcement')
-                lightweight_item['scraper'] = scraper_name
-                all_items.append(lightweight_item)
+        # Flag the same story published by several sources
+        with self.metrics.timer('feed_near_duplicates'):
+            duplicates = self.flag_near_duplicates(all_items, fingerprints)
+        if collapse_duplicates:
+            all_items = [item for item in all_items if 'near_duplicate_of' not in item]
         
         # Sort by date (most recent first)
         all_items.sort(key=lambda x: x.get('date', '') or x.get('scraped_at', ''), reverse=True)
@@ -328,12 +532,14 @@ class FeedGenerator:
             'generated_at': datetime.now().isoformat(),
             'total_items': len(latest_items),
             'max_items': max_items if max_items is not None else 'all',
+            'near_duplicates': duplicates,
+            'duplicates_collapsed': collapse_duplicates,
             'items': latest_items
         }
         
         # Save feed
         feed_path = self.feeds_directory / "latest_feed.json"
-        with open(feed_path, 'w', encoding='utf-8') as f:
+        with self.metrics.timer('feed_write'), open(feed_path, 'w', encoding='utf-8') as f:
             json.dump(feed, f, indent=2, ensure_ascii=False)
         
         print(f"Latest feed generated: {feed_path} ({len(latest_items)} items)")
@@ -342,6 +548,10 @@ class FeedGenerator:
     def generate_scraper_feeds(self, master_data: Dict[str, Any], max_items_per_scraper: int = 50) -> List[str]:
         """Generate individual feeds for each scraper"""
         
+        with self.metrics.timer('feed_scraper_feeds'):
+            return self._generate_scraper_feeds(master_data, max_items_per_scraper)
+    
+    def _generate_scraper_feeds(self, master_data: Dict[str, Any], max_items_per_scraper: int) -> List[str]:
         feed_paths = []
         
         for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
@@ -383,6 +593,8 @@ class FeedGenerator:
         
         month_str = f"{year}-{month:02d}"
         all_items = []
+        fingerprints = []
+        content_fingerprints = self._content_fingerprints(master_data)
         
         for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
             # Collect items from specified month
@@ -392,6 +604,9 @@ class FeedGenerator:
                     lightweight_item = self.create_lightweight_item(announcement, 'announcement')
                     lightweight_item['scraper'] = scraper_name
                     all_items.append(lightweight_item)
+                    fingerprints.append(self._announcement_fingerprint(announcement, content_fingerprints))
+        
+        duplicates = self.flag_near_duplicates(all_items, fingerprints)
         
         # Sort by date
         all_items.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -402,6 +617,7 @@ class FeedGenerator:
             'month': month,
             'generated_at': datetime.now().isoformat(),
             'total_items': len(all_items),
+            'near_duplicates': duplicates,
             'items': all_items
         }
         
@@ -452,13 +668,98 @@ class ScraperOrchestrator:
                  output_directory: str = "scraped_data", 
                  master_file: str = "master_scraped_data.json",
                  feeds_directory: str = "feeds",
-                 filter_config: Dict[str, Any] = None):
+                 filter_config: Dict[str, Any] = None,
+                 partitioned: bool = False,
+                 hot_months: int = 3,
+                 rate_limit_config: Dict[str, Any] = None,
+                 adaptive_rate: bool = True,
+                 max_rate: float = None,
+                 save_documents: bool = False,
+                 max_page_bytes: int = None,
+                 http_backend: str = 'requests',
+                 pool_size: int = 10,
+                 dns_cache_ttl: float = 300.0,
+                 respect_robots: bool = True,
+                 priority_keywords: List[str] = None,
+                 source_weights: Dict[str, float] = None,
+                 max_content_fetches: int = None,
+                 content_time_budget: float = None,
+                 max_run_seconds: float = None,
+                 max_run_requests: int = None,
+                 max_run_bytes: int = None,
+                 metrics_file: str = None):
         self.scrapers_directory = Path(scrapers_directory)
         self.output_directory = Path(output_directory)
         self.output_directory.mkdir(exist_ok=True)
         self.master_file_path = self.output_directory / master_file
         
-        self.feed_generator = FeedGenerator(feeds_directory)
+        # Original scraper payloads live in a compressed side store next to the master file
+        self.raw_store = RawDataStore(self.output_directory / "raw")
+        
+        # Optional month-partitioned item storage (hot/cold tiers); the master file then only keeps metadata
+        self.partitioned = partitioned
+        self.partition_store = PartitionedMasterStore(self.output_directory / "partitions", hot_months) if partitioned else None
+        
+        # Stage timings of every run in this process (master file and feed writes included),
+        # exported in Prometheus text format to metrics_file if set
+        self.metrics = Instrumentation()
+        self.metrics_file = metrics_file
+        self.started = time.time()
+        self.profiler = None  # profiling.Profiler with --profile: a cProfile per scraper and phase
+        
+        self.feed_generator = FeedGenerator(feeds_directory, metrics=self.metrics)
+        
+        # Every scraper's Fetcher waits on this shared per-host limiter
+        self.rate_limiter = get_shared_rate_limiter()
+        if rate_limit_config:
+            self.rate_limiter.configure(**rate_limit_config)
+        
+        # AIMD tuning of each host's rate from observed latency/errors, remembered across runs
+        self.rate_controller = None
+        if adaptive_rate:
+            if max_rate is None:
+                # An explicit default rate is also how high the controller may climb
+                max_rate = (rate_limit_config or {}).get('default_rate', 2.0)
+            self.rate_controller = AdaptiveRateController(
+                self.rate_limiter, self.output_directory / "host_state.json", max_rate=max_rate
+            )
+            # Explicit per-host rates act as ceilings the controller never exceeds
+            for host, setting in (rate_limit_config or {}).get('host_rates', {}).items():
+                rate = setting['rate'] if isinstance(setting, dict) else setting
+                self.rate_controller.set_ceiling(host, float(rate))
+        set_shared_rate_controller(self.rate_controller)
+        
+        # URLs that failed transiently are fetched first on the next run
+        self.retry_queue = RetryQueue(self.output_directory / "retry_queue.json")
+        
+        # Linked PDFs and other non-HTML documents are skipped unless a store is configured
+        self.document_store = DocumentStore(self.output_directory / "documents") if save_documents else None
+        self.max_page_bytes = max_page_bytes
+        
+        # One keep-alive pool (optionally HTTP/2) shared by every scraper, plus cached DNS lookups.
+        # Both are set up on first use, so feeds-only runs never import an HTTP client or patch the resolver.
+        self.http_backend = http_backend
+        self.pool_size = pool_size
+        self.dns_cache_ttl = dns_cache_ttl
+        self._transport = None
+        
+        # Cached robots.txt per host: disallowed URLs are never fetched or queued, Crawl-delay caps the rate
+        self.robots = None
+        if respect_robots:
+            self.robots = RobotsCache(None, state_file=self.output_directory / "robots_cache.json",
+                                      rate_limiter=self.rate_limiter, controller=self.rate_controller)
+            self.robots.apply_saved_delays()
+        
+        # Full content is fetched most valuable first (recent, keyword-matching, heavily weighted sources);
+        # whatever a fetch or time budget leaves over is deferred to the next run
+        self.content_scorer = ContentPriorityScorer(priority_keywords, source_weights)
+        self.max_content_fetches = max_content_fetches
+        self.content_time_budget = content_time_budget
+        
+        # Wall time / request / byte caps across all scrapers and phases; URLs left over go to the retry queue
+        self.run_budget = None
+        if max_run_seconds is not None or max_run_requests is not None or max_run_bytes is not None:
+            self.run_budget = RunBudget(max_run_seconds, max_run_requests, max_run_bytes)
         
         # Content filter configuration
         self.filter_config = filter_config or self._get_default_filter_config()
@@ -466,6 +767,21 @@ class ScraperOrchestrator:
         
         self.loaded_scrapers = {}
         self.results = {}
+        
+        # Stored URLs per scraper, kept in memory by long-running processes (see warm_url_index)
+        self.url_index = None
+    
+    @property
+    def transport(self):
+        """The HTTP transport shared by all scrapers (and robots.txt fetches)"""
+        if self._transport is None:
+            if self.dns_cache_ttl:
+                install_dns_cache(self.dns_cache_ttl)
+            self._transport = build_transport(self.http_backend, self.pool_size)
+            set_shared_transport(self._transport)
+            if self.robots:
+                self.robots.session = self._transport
+        return self._transport
     
     def _get_default_filter_config(self) -> Dict[str, Any]:
         """Get default filter configuration"""
@@ -504,120 +820,132 @@ class ScraperOrchestrator:
         self.content_filter = ContentFilter(self.filter_config)
         print("Filter configuration updated")
     
-    def load_existing_data(self) -> Dict[str, Any]:
-        """Load existing data from master file"""
+    def _empty_master_data(self) -> Dict[str, Any]:
+        """Return the structure of a fresh master file"""
+        return {
+            'scraping_history': {
+                'first_scrape': datetime.now().isoformat(),
+                'last_updated': datetime.now().isoformat(),
+                'total_scrapes': 0
+            },
+            'summary': {
+                'total_announcements': 0,
+                'total_full_content': 0,
+                'total_errors': 0
+            },
+            'results_by_scraper': {}
+        }
+    
+    def load_existing_data(self, start_date: str = None, end_date: str = None,
+                           include_items: bool = True) -> Dict[str, Any]:
+        """
+        Load existing data from master file
+        
+        With partitioned storage only the monthly partitions overlapping
+        start_date..end_date are read; include_items=False skips them entirely.
+        """
         if not self.master_file_path.exists():
-            return {
-                'scraping_history': {
-                    'first_scrape': datetime.now().isoformat(),
-                    'last_updated': datetime.now().isoformat(),
-                    'total_scrapes': 0
-                },
-                'summary': {
-                    'total_announcements': 0,
-                    'total_full_content': 0,
-                    'total_errors': 0
-                },
-                'results_by_scraper': {}
-            }
+            return self._empty_master_data()
         
         try:
             with open(self.master_file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                existing_data = json.load(f)
         except Exception as e:
             print(f"Warning: Could not load existing data: {e}")
-            return self.load_existing_data()  # Return empty structure
+            return self._empty_master_data()  # Return empty structure
+        
+        store = open_store_for_master(existing_data, self.master_file_path)
+        if store is not None:
+            for scraper_name, scraper_data in existing_data.get('results_by_scraper', {}).items():
+                items = store.load(scraper_name, start_date, end_date) if include_items else {}
+                scraper_data['announcements'] = items.get('announcements', [])
+                scraper_data['full_content'] = items.get('full_content', [])
+        
+        return existing_data
     
-    def get_existing_urls(self, scraper_name: str = None) -> Set[str]:
-        """Get set of existing URLs from master file"""
+    def warm_url_index(self):
+        """Load every stored URL once; dedup then never re-reads the master file or partitions"""
+        self.url_index = None
         existing_data = self.load_existing_data()
+        self.url_index = {
+            scraper_name: self._collect_urls(scraper_data)
+            for scraper_name, scraper_data in existing_data.get('results_by_scraper', {}).items()
+        }
+        print(f"URL index warmed: {sum(len(urls) for urls in self.url_index.values())} URLs")
+    
+    def _collect_urls(self, scraper_data: Dict[str, Any]) -> Set[str]:
+        """URLs of a scraper's stored announcements and full content"""
+        urls = set()
+        for item in scraper_data.get('announcements', []) + scraper_data.get('full_content', []):
+            url = item.get('url')
+            if url:
+                urls.add(url)
+        return urls
+    
+    def get_existing_urls(self, scraper_name: str = None, start_date: str = None, end_date: str = None) -> Set[str]:
+        """Get set of existing URLs from master file (pruned to a date range with partitioned storage)"""
+        if self.url_index is not None:
+            # The warm index covers all dates, a superset of any range
+            if scraper_name:
+                return self.url_index.setdefault(scraper_name, set())
+            return set().union(*self.url_index.values())
+        
+        existing_data = self.load_existing_data(start_date, end_date)
         existing_urls = set()
         
         scrapers_to_check = [scraper_name] if scraper_name else existing_data.get('results_by_scraper', {}).keys()
         
         for scraper in scrapers_to_check:
-            scraper_data = existing_data.get('results_by_scraper', {}).get(scraper, {})
-            
-            # Get URLs from announcements
-            for announcement in scraper_data.get('announcements', []):
-                url = announcement.get('url')
-                if url:
-                    existing_urls.add(url)
-            
-            # Get URLs from full content
-            for content in scraper_data.get('full_content', []):
-                url = content.get('url')
-                if url:
-                    existing_urls.add(url)
+            existing_urls |= self._collect_urls(existing_data.get('results_by_scraper', {}).get(scraper, {}))
         
         return existing_urls
     
-    def discover_scrapers(self) -> Dict[str, BaseScraperInterface]:
-        """Dynamically discover and load scraper modules"""
-        scrapers = {}
+    def load_raw_data(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Lazily load the original scraper payload of a master file record"""
+        return self.raw_store.resolve(item)
+    
+    def discover_scrapers(self) -> Mapping[str, BaseScraperInterface]:
+        """
+        Find the available scrapers without importing them
         
+        Scraper classes are read from source and cached in a manifest keyed by
+        file mtime and hash. The returned mapping imports and instantiates a
+        scraper only when it is looked up, so a single-scraper run never loads
+        the others.
+        """
         if not self.scrapers_directory.exists():
             print(f"Scrapers directory not found: {self.scrapers_directory}")
-            return scrapers
+            self.loaded_scrapers = {}
+            return self.loaded_scrapers
         
-        # Add the scrapers directory to Python path temporarily
-        scrapers_path_str = str(self.scrapers_directory.absolute())
-        if scrapers_path_str not in sys.path:
-            sys.path.insert(0, scrapers_path_str)
+        manifest = PluginManifest(self.scrapers_directory, self.output_directory / "scraper_manifest.json")
+        entries = manifest.scan()
+        print(f"Found {len(entries)} scrapers in {self.scrapers_directory}")
         
-        scraper_files = list(self.scrapers_directory.glob("*_scraper.py"))
-        print(f"Found {len(scraper_files)} potential scraper files")
-        
-        for scraper_file in scraper_files:
-            try:
-                scraper_name = scraper_file.stem
-                spec = importlib.util.spec_from_file_location(scraper_name, scraper_file)
-                if spec is None:
-                    continue
-                
-                module = importlib.util.module_from_spec(spec)
-                if module is None:
-                    continue
-                
-                sys.modules[scraper_name] = module
-                spec.loader.exec_module(module)
-                
-                # Look for scraper classes
-                for attr_name in dir(module):
-                    if attr_name.startswith('_') or attr_name == 'BaseScraperInterface':
-                        continue
-                        
-                    attr = getattr(module, attr_name)
-                    
-                    if (isinstance(attr, type) and 
-                        hasattr(attr, '__bases__') and
-                        attr != BaseScraperInterface):
-                        
-                        # Check if it inherits from BaseScraperInterface
-                        for base in attr.__mro__:
-                            if base.__name__ == 'BaseScraperInterface':
-                                try:
-                                    scraper_instance = attr()
-                                    if hasattr(scraper_instance, 'get_scraper_info'):
-                                        scrapers[scraper_name] = scraper_instance
-                                        print(f"Loaded scraper: {scraper_name}")
-                                except Exception as e:
-                                    print(f"Error instantiating {attr_name}: {e}")
-                                break
-                        
-            except Exception as e:
-                print(f"Error loading scraper {scraper_file}: {e}")
-        
-        # Clean up sys.path
-        if scrapers_path_str in sys.path:
-            sys.path.remove(scrapers_path_str)
-        
-        self.loaded_scrapers = scrapers
-        return scrapers
+        self.loaded_scrapers = LazyScraperRegistry(entries, self.scrapers_directory, self._configure_fetcher)
+        return self.loaded_scrapers
+    
+    def _configure_fetcher(self, scraper: BaseScraperInterface):
+        """Apply orchestrator-wide fetch settings to a scraper's Fetcher"""
+        fetcher = getattr(scraper, 'fetcher', None)
+        if fetcher is None:
+            return
+        fetcher.use_transport(self.transport)
+        fetcher.robots = self.robots
+        fetcher.budget = self.run_budget
+        fetcher.document_handler = self.document_store
+        if self.max_page_bytes:
+            fetcher.max_bytes = self.max_page_bytes
     
     def run_scraper(self, scraper_name: str, start_date: str, end_date: str, 
-                   scrape_full_content: bool = True, **kwargs) -> ScraperResult:
-        """Run a specific scraper with deduplication and filtering"""
+                   scrape_full_content: bool = True, pipelined: bool = False,
+                   queue_size: int = 20, **kwargs) -> ScraperResult:
+        """
+        Run a specific scraper with deduplication and filtering
+        
+        With pipelined=True, full content is fetched while pagination is still
+        running, through a URL queue of at most queue_size entries
+        """
         
         if scraper_name not in self.loaded_scrapers:
             available = list(self.loaded_scrapers.keys())
@@ -627,9 +955,19 @@ class ScraperOrchestrator:
         scraper_info = scraper.get_scraper_info()
         
         print(f"Running scraper: {scraper_info['name']} for {scraper_info.get('website', 'Unknown')}")
-        
-        # Get existing URLs for this scraper
-        existing_urls = self.get_existing_urls(scraper_name)
+        run_started = time.time()
+        
+        # Stage timings and fetch stats of this run; the scraper's fetcher records into it too
+        metrics = Instrumentation()
+        fetcher = getattr(scraper, 'fetcher', None)
+        if fetcher is not None:
+            fetcher.metrics = metrics
+            fetcher.profiler = self.profiler
+        
+        # Get existing URLs for this scraper. Some sources only date items to the
+        # year (alz.org), so partition pruning covers whole calendar years.
+        with self._stage(metrics, scraper_name, 'existing_urls'):
+            existing_urls = self.get_existing_urls(scraper_name, f"{start_date[:4]}-01-01", f"{end_date[:4]}-12-31")
         print(f"Found {len(existing_urls)} existing URLs, checking for duplicates...")
         
         # Create result container with existing URLs and content filter
@@ -637,65 +975,356 @@ class ScraperOrchestrator:
             scraper_info['name'], 
             scraper_info.get('website', 'Unknown'),
             existing_urls,
-            ContentFilter(self.filter_config)
+            ContentFilter(self.filter_config),
+            self.raw_store
         )
         
+        # Transient failures of earlier runs go first
+        queued_listings = self.retry_queue.pending(scraper_name, 'listing')
+        queued_content = self.retry_queue.pending(scraper_name, 'content')
+        if queued_listings or queued_content:
+            print(f"Retrying {len(queued_listings)} listing pages and {len(queued_content)} content URLs from earlier runs")
+        scraper.failed_urls = []
+        deferred = []
+        completed = False
+        
         try:
-            # Step 1: Scrape announcements
-            print("Step 1: Scraping announcements list...")
-            announcements = scraper.scrape_announcements(start_date, end_date, **kwargs)
-            
-            new_announcements = []
-            for announcement in announcements:
-                if result.add_announcement(announcement):
-                    new_announcements.append(announcement)
+            queued = self._queued_content(scraper_name, queued_content, scraper.failed_urls) if scrape_full_content else []
             
-            print(f"Found {len(announcements)} total announcements")
-            print(f"Added {len(new_announcements)} new announcements")
-            print(f"Skipped {result.skipped_duplicates} duplicates")
-            print(f"Filtered {result.filtered_items} unwanted items")
-            
-            # Show filter reasons
-            filter_stats = result.content_filter.get_statistics()
-            if filter_stats['filter_reasons']:
-                print("Filter breakdown:")
-                for reason, count in filter_stats['filter_reasons'].items():
-                    print(f"  - {reason}: {count}")
+            if pipelined:
+                with self._stage(metrics, scraper_name, 'pipelined'):
+                    self._run_pipelined(scraper, result, start_date, end_date, queued_listings, queued,
+                                        scrape_full_content, queue_size, deferred, **kwargs)
+                queued = []
+                new_announcements = []
+            else:
+                # Step 0: Listing pages that failed before
+                with self._stage(metrics, scraper_name, 'retry_listings'):
+                    announcements = self._retry_listings(scraper, queued_listings, start_date, end_date, **kwargs)
+                
+                # Step 1: Scrape announcements
+                print("Step 1: Scraping announcements list...")
+                with self._stage(metrics, scraper_name, 'listing'):
+                    announcements.extend(scraper.scrape_announcements(start_date, end_date, **kwargs))
+                
+                new_announcements = []
+                with self._stage(metrics, scraper_name, 'filter_dedup'):
+                    for announcement in announcements:
+                        if result.add_announcement(announcement):
+                            new_announcements.append(announcement)
+                
+                self._print_announcement_summary(result, len(announcements), len(new_announcements))
             
-            # Step 2: Scrape full content for new URLs only
-            if scrape_full_content and new_announcements:
+            # Step 2: Scrape full content for queued and new URLs only, most valuable first
+            if scrape_full_content and (new_announcements or queued):
                 print("Step 2: Scraping full content for new items only...")
-                new_urls = [ann.get('url', '') for ann in new_announcements if ann.get('url')]
+                pending = ContentPriorityQueue()
+                for url, score, item in queued:
+                    pending.push(url, score, item)
+                fetchable = set(self._fetchable([ann.get('url') for ann in new_announcements if ann.get('url')],
+                                                scraper.failed_urls))
+                for ann in new_announcements:
+                    if ann.get('url') in fetchable:
+                        pending.push(ann['url'], self.content_scorer.score(ann, scraper_name),
+                                     self.content_scorer.summary(ann))
                 
-                if new_urls:
-                    full_content_data = scraper.scrape_full_content(new_urls, **kwargs)
-                    
-                    for content in full_content_data:
-                        result.add_full_content(content)
+                if pending:
+                    with self._stage(metrics, scraper_name, 'full_content'):
+                        if self._content_budgeted():
+                            iter_full_content = getattr(scraper, 'iter_full_content', None) or \
+                                functools.partial(BaseScraperInterface.iter_full_content, scraper)
+                            full_content_data = iter_full_content(self._within_budget(pending.drain(), deferred), **kwargs)
+                        else:
+                            full_content_data = scraper.scrape_full_content([url for url, _, _ in pending.drain()], **kwargs)
+                        
+                        fetched = 0
+                        for content in full_content_data:
+                            result.add_full_content(content)
+                            fetched += 1
                     
-                    print(f"Scraped full content for {len(full_content_data)} new items")
+                    print(f"Scraped full content for {fetched} new items")
+                    if deferred:
+                        print(f"Budget reached: deferred {len(deferred)} content URLs to the next run")
             
             # Update statistics
             result.statistics.update({
                 'date_range': f"{start_date} to {end_date}",
                 'success_rate': len(result.full_content) / len(result.announcements) if result.announcements else 0
             })
+            if self.run_budget:
+                result.statistics['run_budget'] = self.run_budget.usage()
+            completed = True
             
         except Exception as e:
             error_msg = f"Error running scraper {scraper_name}: {e}"
             result.errors.append(error_msg)
             print(error_msg)
         
+        attempted = (queued_listings + queued_content) if completed else []
+        self._update_retry_queue(scraper_name, scraper, attempted, start_date, end_date, scrape_full_content,
+                                 deferred)
+        
+        if self.rate_controller:
+            self.rate_controller.save_state()
+        if self.robots:
+            self.robots.save_state()
+        
+        if fetcher is not None:
+            fetcher.metrics = None
+        self._record_run_metrics(metrics, result, run_started)
+        result.metrics = metrics
+        result.statistics['timings'] = metrics.summary()
+        self.metrics.merge(metrics, scraper=scraper_name)
+        
         # Store result
         self.results[scraper_name] = result
         return result
     
+    @contextlib.contextmanager
+    def _stage(self, metrics: Instrumentation, scraper_name: str, stage: str):
+        """Time a stage of a scraper run and, with --profile, profile it on its own"""
+        with metrics.timer(stage), self._profiled(f"{scraper_name}.{stage}"):
+            yield
+    
+    def _profiled(self, section: str):
+        return self.profiler.section(section) if self.profiler else contextlib.nullcontext()
+    
+    def _record_run_metrics(self, metrics: Instrumentation, result: ScraperResult, run_started: float):
+        """Item counts and run duration of a scraper run, for the metrics export"""
+        new_items = len(result.announcements)
+        metrics.count('items_found_total', new_items + result.skipped_duplicates + result.filtered_items)
+        metrics.count('items_new_total', new_items)
+        metrics.count('items_duplicate_total', result.skipped_duplicates)
+        for reason, count in result.content_filter.get_statistics()['filter_reasons'].items():
+            metrics.count('items_filtered_total', count, reason=reason)
+        metrics.count('content_fetched_total', len(result.full_content))
+        metrics.count('errors_total', len(result.errors))
+        metrics.gauge('last_run_duration_seconds', round(time.time() - run_started, 3))
+        metrics.gauge('last_run_timestamp_seconds', int(time.time()))
+        metrics.gauge('last_run_success', 0 if result.errors else 1)
+    
+    def _fetchable(self, urls: List[str], failures: List[Dict[str, Any]] = None) -> List[str]:
+        """
+        URLs robots.txt lets us fetch
+        
+        URLs of hosts whose robots.txt couldn't be fetched are added to
+        failures (a scraper's failed_urls), so they go to the retry queue.
+        """
+        if not self.robots:
+            return urls
+        if failures is None:
+            return self.robots.filter_urls(urls)
+        unreachable = []
+        fetchable = self.robots.filter_urls(urls, unreachable)
+        failures.extend({'url': url, 'kind': 'content', 'error': 'robots.txt unreachable'} for url in unreachable)
+        return fetchable
+    
+    def _queued_content(self, scraper_name: str, entries: List[Dict[str, Any]],
+                        failures: List[Dict[str, Any]] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """(url, priority, summary) of queued content URLs; earlier failures go before everything new"""
+        fetchable = set(self._fetchable([entry['url'] for entry in entries], failures))
+        return [
+            (entry['url'], self.content_scorer.score(entry['item'], scraper_name) if entry.get('item') else math.inf,
+             entry.get('item'))
+            for entry in entries if entry['url'] in fetchable
+        ]
+    
+    def _content_budgeted(self) -> bool:
+        return self.max_content_fetches is not None or self.content_time_budget is not None or \
+            self.run_budget is not None
+    
+    def _within_budget(self, urls: Iterable[Tuple[str, float, Dict[str, Any]]],
+                       deferred: List[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Yield URLs (in the given priority order) until the fetch or time budget runs out
+        
+        URLs past the budget are still consumed, so a pipelined producer never
+        blocks, and collected in deferred for the next run.
+        """
+        started = time.monotonic()
+        fetched = 0
+        for url, _, item in urls:
+            over_count = self.max_content_fetches is not None and fetched >= self.max_content_fetches
+            over_time = self.content_time_budget is not None and time.monotonic() - started >= self.content_time_budget
+            if over_count or over_time or (self.run_budget and self.run_budget.exhausted):
+                deferred.append({'url': url, 'item': item})
+                continue
+            fetched += 1
+            yield url
+    
+    def _retry_listings(self, scraper: BaseScraperInterface, queued_listings: List[Dict[str, Any]],
+                        start_date: str, end_date: str, **kwargs) -> List[Dict[str, Any]]:
+        """Re-scrape listing pages that failed in earlier runs"""
+        announcements = []
+        retry_listing = getattr(scraper, 'scrape_listing_page', None)
+        for entry in queued_listings:
+            if retry_listing:
+                announcements.extend(retry_listing(entry['url'], entry['start_date'] or start_date,
+                                                   entry['end_date'] or end_date))
+            else:
+                announcements.extend(scraper.scrape_announcements(entry['start_date'] or start_date,
+                                                                  entry['end_date'] or end_date, **kwargs))
+        return announcements
+    
+    def _print_announcement_summary(self, result: ScraperResult, total: int, added: int):
+        """Print announcement counts and the filter breakdown"""
+        print(f"Found {total} total announcements")
+        print(f"Added {added} new announcements")
+        print(f"Skipped {result.skipped_duplicates} duplicates")
+        print(f"Filtered {result.filtered_items} unwanted items")
+        
+        # Show filter reasons
+        filter_stats = result.content_filter.get_statistics()
+        if filter_stats['filter_reasons']:
+            print("Filter breakdown:")
+            for reason, count in filter_stats['filter_reasons'].items():
+                print(f"  - {reason}: {count}")
+    
+    def _run_pipelined(self, scraper: BaseScraperInterface, result: ScraperResult, start_date: str,
+                       end_date: str, queued_listings: List[Dict[str, Any]],
+                       queued: List[Tuple[str, float, Dict[str, Any]]], scrape_full_content: bool,
+                       queue_size: int, deferred: List[Dict[str, Any]], **kwargs):
+        """
+        Paginate in a producer thread and fetch full content in this one
+        
+        New announcements go through filtering and dedup and their URLs into a
+        bounded queue as soon as they are found, so content fetching overlaps
+        pagination and a slow consumer holds pagination back instead of
+        letting URLs pile up in memory. The queue hands out the most valuable
+        URL it holds first.
+        """
+        url_queue = queue.PriorityQueue(maxsize=max(1, queue_size))
+        stop = threading.Event()
+        done = object()
+        sequence = itertools.count()  # Ties keep arrival order, and entries never compare URLs
+        producer_errors = []
+        counts = {'total': 0, 'added': 0}
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    url_queue.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                seen = set()
+                for url, score, item in queued:
+                    seen.add(url)
+                    if not put((-score, next(sequence), url, item)):
+                        return
+                
+                # Scrapers with their own copy of the interface may lack the streaming methods
+                iter_announcements = getattr(scraper, 'iter_announcements', None) or \
+                    functools.partial(BaseScraperInterface.iter_announcements, scraper)
+                
+                print("Step 1: Scraping announcements list (pipelined)...")
+                retried = self._retry_listings(scraper, queued_listings, start_date, end_date, **kwargs)
+                for source in (retried, iter_announcements(start_date, end_date, **kwargs)):
+                    for announcement in source:
+                        counts['total'] += 1
+                        if not result.add_announcement(announcement):
+                            continue
+                        counts['added'] += 1
+                        url = announcement.get('url')
+                        if scrape_full_content and url and url not in seen:
+                            seen.add(url)
+                            if self.robots and not self._fetchable([url], scraper.failed_urls):
+                                continue
+                            score = self.content_scorer.score(announcement, result.scraper_name)
+                            if not put((-score, next(sequence), url, self.content_scorer.summary(announcement))):
+                                return
+            except Exception as e:
+                producer_errors.append(e)
+            finally:
+                put((math.inf, next(sequence), done, None))
+        
+        def prioritized():
+            while True:
+                neg_score, _, url, item = url_queue.get()
+                if url is done:
+                    return
+                yield url, -neg_score, item
+        
+        if self.profiler:
+            produce = self.profiler.wrap(produce)  # Profiled under the pipelined stage, not missed
+        producer = threading.Thread(target=produce, name="pagination-producer", daemon=True)
+        producer.start()
+        
+        fetched = 0
+        try:
+            urls = self._within_budget(prioritized(), deferred)
+            if scrape_full_content:
+                print("Step 2: Scraping full content as new items arrive...")
+                iter_full_content = getattr(scraper, 'iter_full_content', None) or \
+                    functools.partial(BaseScraperInterface.iter_full_content, scraper)
+                for content in iter_full_content(urls, **kwargs):
+                    result.add_full_content(content)
+                    fetched += 1
+            else:
+                for _ in urls:
+                    pass
+        finally:
+            stop.set()
+            producer.join()
+        
+        self._print_announcement_summary(result, counts['total'], counts['added'])
+        if scrape_full_content:
+            print(f"Scraped full content for {fetched} new items")
+            if deferred:
+                print(f"Budget reached: deferred {len(deferred)} content URLs to the next run")
+        
+        if producer_errors:
+            raise producer_errors[0]
+    
+    def _update_retry_queue(self, scraper_name: str, scraper: BaseScraperInterface,
+                            attempted: List[Dict[str, Any]], start_date: str, end_date: str,
+                            scrape_full_content: bool, deferred: List[Dict[str, Any]] = None):
+        """Queue this run's transient failures and deferred URLs, and clear queued URLs that went through"""
+        failures = getattr(scraper, 'failed_urls', [])
+        deferred = list(deferred or [])
+        if self.run_budget and self.run_budget.refused:
+            # Never sent because the run budget ran out: unfinished, not failed
+            for failure in failures:
+                if failure['url'] in self.run_budget.refused:
+                    deferred.append({'url': failure['url'], 'kind': failure.get('kind', 'content'), 'item': None})
+            failures = [failure for failure in failures if failure['url'] not in self.run_budget.refused]
+        failed = {failure['url'] for failure in failures}
+        not_fetched = failed | {entry['url'] for entry in deferred}
+        
+        for entry in attempted:
+            if entry['kind'] == 'content' and not scrape_full_content:
+                continue  # Not attempted this run
+            if entry['url'] not in not_fetched:
+                self.retry_queue.remove(scraper_name, entry['url'])
+        
+        for failure in failures:
+            self.retry_queue.add(scraper_name, failure, start_date, end_date)
+        for entry in deferred:
+            self.retry_queue.defer(scraper_name, entry['url'], entry['item'], entry.get('kind', 'content'),
+                                   start_date, end_date)
+        
+        if failures:
+            print(f"Queued {len(failures)} failed URLs for the next run")
+        if deferred:
+            print(f"Queued {len(deferred)} unfinished URLs for the next run")
+        self.retry_queue.prune()
+        self.retry_queue.save()
+    
     def run_all_scrapers(self, start_date: str, end_date: str, 
                         scrape_full_content: bool = True, **kwargs) -> Dict[str, ScraperResult]:
         """Run all available scrapers with deduplication and filtering"""
         results = {}
+        if self.run_budget:
+            self.run_budget.reset()
         
         for scraper_name in self.loaded_scrapers:
+            if self.run_budget and self.run_budget.exhausted:
+                print(f"Skipping {scraper_name}: run budget exhausted ({self.run_budget.exhausted})")
+                continue
             try:
                 result = self.run_scraper(scraper_name, start_date, end_date, 
                                         scrape_full_content, **kwargs)
@@ -705,62 +1334,142 @@ class ScraperOrchestrator:
         
         return results
     
-    def update_master_file(self, new_results: Dict[str, ScraperResult]) -> str:
-        """Update the master JSON file with new results"""
+    def _item_counts(self, scraper_name: str, scraper_data: Dict[str, Any]) -> Dict[str, int]:
+        """Count stored items of a scraper without loading partitions"""
+        if self.partition_store is not None:
+            return self.partition_store.counts(scraper_name)
+        return {
+            'announcements': len(scraper_data.get('announcements', [])),
+            'full_content': len(scraper_data.get('full_content', []))
+        }
+    
+    def _migrate_storage_layout(self, existing_data: Dict[str, Any]):
+        """Switch the master file between single-file and partitioned item storage"""
+        is_partitioned = existing_data.get('storage', {}).get('layout') == 'partitioned'
+        
+        if self.partition_store is not None and not is_partitioned:
+            moved = 0
+            for scraper_name, scraper_data in existing_data['results_by_scraper'].items():
+                announcements = scraper_data.pop('announcements', [])
+                full_content = scraper_data.pop('full_content', [])
+                self.partition_store.append(scraper_name, announcements, full_content)
+                moved += len(announcements) + len(full_content)
+            existing_data['storage'] = {
+                'layout': 'partitioned',
+                'directory': self.partition_store.directory.name,
+                'hot_months': self.partition_store.hot_months
+            }
+            print(f"Moved {moved} items into monthly partitions: {self.partition_store.directory}")
+        elif self.partition_store is None and is_partitioned:
+            # Items were loaded from the partitions and get written back inline
+            existing_data.pop('storage')
+            print("Converting partitioned storage back to a single master file")
+    
+    def update_master_file(self, new_results: Dict[str, ScraperResult], merge_content: Callable = None) -> str:
+        """
+        Update the master JSON file with new results
         
-        # Load existing data
-        existing_data = self.load_existing_data()
+        With merge_content(stored, new), full content of an already stored URL
+        replaces the stored item instead of being appended next to it.
+        """
+        
+        with self._profiled('master_file'):
+            return self._update_master_file(new_results, merge_content)
+    
+    def _replace_content(self, stored_items: List[Dict[str, Any]], items: List[Dict[str, Any]],
+                         merge: Callable) -> List[Dict[str, Any]]:
+        """Swap stored full content for merge(stored, new) by URL; returns the items with no stored match"""
+        pending = {item['url']: item for item in items if item.get('url')}
+        for i, stored in enumerate(stored_items):
+            new = pending.pop(stored.get('url'), None)
+            if new is not None:
+                stored_items[i] = merge(stored, new)
+        return [item for item in items if not item.get('url') or item['url'] in pending]
+    
+    def _update_master_file(self, new_results: Dict[str, ScraperResult], merge_content: Callable = None) -> str:
+        # Load existing data (partitioned items are appended without being read)
+        with self.metrics.timer('master_load'):
+            existing_data = self.load_existing_data(include_items=self.partition_store is None)
+        
+        # Move any payloads still inlined by older versions into the side store
+        migrated = self.raw_store.externalize_master(existing_data)
+        if migrated:
+            print(f"Moved {migrated} inline raw payloads to {self.raw_store.directory}")
+        
+        self._migrate_storage_layout(existing_data)
         
         # Update metadata
         existing_data['scraping_history']['last_updated'] = datetime.now().isoformat()
         existing_data['scraping_history']['total_scrapes'] = existing_data['scraping_history'].get('total_scrapes', 0) + 1
         
         # Update each scraper's data
+        merge_started = time.perf_counter()
         for scraper_name, result in new_results.items():
+            new_scraper_data = result.to_dict()
+            
+            if merge_content is not None:
+                if self.partition_store is not None:
+                    new_scraper_data['full_content'] = self.partition_store.replace(
+                        scraper_name, 'full_content', new_scraper_data['full_content'], merge_content
+                    )
+                elif scraper_name in existing_data['results_by_scraper']:
+                    new_scraper_data['full_content'] = self._replace_content(
+                        existing_data['results_by_scraper'][scraper_name]['full_content'],
+                        new_scraper_data['full_content'], merge_content
+                    )
+            
+            if self.partition_store is not None:
+                # Items go to their monthly partitions, the master file keeps metadata only
+                self.partition_store.append(
+                    scraper_name,
+                    new_scraper_data.pop('announcements'),
+                    new_scraper_data.pop('full_content')
+                )
+            
             if scraper_name not in existing_data['results_by_scraper']:
                 # New scraper - add all data
-                existing_data['results_by_scraper'][scraper_name] = result.to_dict()
+                existing_data['results_by_scraper'][scraper_name] = new_scraper_data
             else:
                 # Existing scraper - append new data
                 existing_scraper_data = existing_data['results_by_scraper'][scraper_name]
-                new_scraper_data = result.to_dict()
                 
                 # Update scraper info (in case version changed)
                 existing_scraper_data['scraper_info'].update(new_scraper_data['scraper_info'])
                 
-                # Append new announcements
-                existing_scraper_data['announcements'].extend(new_scraper_data['announcements'])
-                
-                # Append new full content
-                existing_scraper_data['full_content'].extend(new_scraper_data['full_content'])
+                if self.partition_store is None:
+                    # Append new announcements
+                    existing_scraper_data['announcements'].extend(new_scraper_data['announcements'])
+                    
+                    # Append new full content
+                    existing_scraper_data['full_content'].extend(new_scraper_data['full_content'])
                 
                 # Append errors
                 existing_scraper_data['errors'].extend(new_scraper_data['errors'])
                 
                 # Update statistics
-                old_stats = existing_scraper_data['statistics']
                 new_stats = new_scraper_data['statistics']
+                counts = self._item_counts(scraper_name, existing_scraper_data)
                 
                 existing_scraper_data['statistics'] = {
-                    'total_announcements': len(existing_scraper_data['announcements']),
-                    'total_full_content': len(existing_scraper_data['full_content']),
+                    'total_announcements': counts['announcements'],
+                    'total_full_content': counts['full_content'],
                     'total_errors': len(existing_scraper_data['errors']),
                     'last_scrape_new_items': new_stats.get('total_announcements', 0),
                     'last_scrape_skipped': new_stats.get('skipped_duplicates', 0),
                     'last_scrape_filtered': new_stats.get('filtered_items', 0),
                     'filter_reasons': new_stats.get('filter_reasons', {}),
+                    'last_scrape_timings': new_stats.get('timings', {}),
                     'last_scrape_date': new_scraper_data['scraper_info']['scraped_at']
                 }
+        self.metrics.observe('stage_seconds', time.perf_counter() - merge_started, stage='master_merge')
         
         # Update summary
-        total_announcements = sum(
-            len(data['announcements']) 
-            for data in existing_data['results_by_scraper'].values()
-        )
-        total_full_content = sum(
-            len(data['full_content']) 
-            for data in existing_data['results_by_scraper'].values()
-        )
+        counts = [
+            self._item_counts(name, data)
+            for name, data in existing_data['results_by_scraper'].items()
+        ]
+        total_announcements = sum(c['announcements'] for c in counts)
+        total_full_content = sum(c['full_content'] for c in counts)
         total_errors = sum(
             len(data['errors']) 
             for data in existing_data['results_by_scraper'].values()
@@ -774,22 +1483,74 @@ class ScraperOrchestrator:
             'last_updated': datetime.now().isoformat()
         }
         
+        if self.url_index is not None:
+            for scraper_name, result in new_results.items():
+                urls = self.url_index.setdefault(scraper_name, set())
+                urls.update(record.url for record in result.announcements + result.full_content if record.url)
+        
+        if self.partition_store is not None:
+            # Age old months into the compressed cold tier
+            with self.metrics.timer('master_compact'):
+                self.partition_store.compact()
+            existing_data['storage']['tiers'] = self.partition_store.tier_summary()
+            for scraper_data in existing_data['results_by_scraper'].values():
+                scraper_data.pop('announcements', None)
+                scraper_data.pop('full_content', None)
+        
         # Save updated data
-        with open(self.master_file_path, 'w', encoding='utf-8') as f:
+        with self.metrics.timer('master_write'), open(self.master_file_path, 'w', encoding='utf-8') as f:
             json.dump(existing_data, f, indent=2, ensure_ascii=False)
+        self.metrics.gauge('master_file_bytes', self.master_file_path.stat().st_size)
+        self.metrics.gauge('stored_items', total_announcements, kind='announcement')
+        self.metrics.gauge('stored_items', total_full_content, kind='full_content')
         
         print(f"Master file updated: {self.master_file_path}")
         return str(self.master_file_path)
     
-    def generate_feeds(self, max_latest_items: int = None, max_per_scraper: int = 50):
-        """Generate all feed files"""
+    def export_metrics(self) -> Optional[str]:
+        """Write the Prometheus textfile if a metrics file is configured"""
+        if not self.metrics_file:
+            return None
+        from metrics_export import write_textfile
+        
+        self.metrics.gauge('run_duration_seconds', round(time.time() - self.started, 3))
+        try:
+            return write_textfile(self.metrics, self.metrics_file)
+        except OSError as e:
+            print(f"Warning: Could not write metrics file: {e}")
+            return None
+    
+    def generate_feeds(self, max_latest_items: int = None, max_per_scraper: int = 50,
+                       collapse_duplicates: bool = False, start_date: str = None, end_date: str = None):
+        """Generate all feed files (optionally only from items in a date range)"""
+        with self._profiled('feeds'):
+            self._generate_feeds(max_latest_items, max_per_scraper, collapse_duplicates, start_date, end_date)
+    
+    @staticmethod
+    def _filter_by_date(master_data: Dict[str, Any], start_date: str = None, end_date: str = None):
+        """Keep items dated within start_date..end_date (in place); items without a full date stay"""
+        for scraper_data in master_data.get('results_by_scraper', {}).values():
+            for key, date_field in DATE_FIELDS.items():
+                kept = []
+                for item in scraper_data.get(key, []):
+                    date = get_item_date(item, date_field)
+                    if date and ((start_date and date < start_date) or (end_date and date > end_date)):
+                        continue
+                    kept.append(item)
+                scraper_data[key] = kept
+    
+    def _generate_feeds(self, max_latest_items: int, max_per_scraper: int, collapse_duplicates: bool,
+                        start_date: str, end_date: str):
         print("\n=== Generating Feeds ===")
         
         # Load master data
-        master_data = self.load_existing_data()
+        with self.metrics.timer('feeds_load'):
+            master_data = self.load_existing_data(start_date, end_date)
+            if start_date or end_date:
+                self._filter_by_date(master_data, start_date, end_date)
         
         # Generate latest feed
-        self.feed_generator.generate_latest_feed(master_data, max_latest_items)
+        self.feed_generator.generate_latest_feed(master_data, max_latest_items, collapse_duplicates)
         
         # Generate scraper-specific feeds
         self.feed_generator.generate_scraper_feeds(master_data, max_per_scraper)
@@ -801,7 +1562,7 @@ class ScraperOrchestrator:
     
     def generate_report(self, results: Dict[str, ScraperResult]) -> str:
         """Generate a summary report including deduplication and filtering stats"""
-        existing_data = self.load_existing_data()
+        existing_data = self.load_existing_data(include_items=False)
         
         report_lines = [
             "WEB SCRAPING REPORT",
@@ -810,6 +1571,15 @@ class ScraperOrchestrator:
             ""
         ]
         
+        if self.run_budget:
+            usage = self.run_budget.usage()
+            report_lines.extend([
+                f"Run budget: {usage['seconds']}s, {usage['requests']} requests, "
+                f"{usage['bytes'] / (1024 * 1024):.1f} MB used"
+                + (f" (stopped by the {usage['exhausted']})" if usage['exhausted'] else ""),
+                ""
+            ])
+        
         # Current run stats
         new_announcements = 0
         new_content = 0
@@ -827,6 +1597,9 @@ class ScraperOrchestrator:
                 f"  Errors: {len(result.errors)}",
             ])
             
+            if result.metrics:
+                report_lines.extend(result.metrics.report_lines("  "))
+            
             # Show filter breakdown if any items were filtered
             if result.filtered_items > 0:
                 filter_stats = result.content_filter.get_statistics()
@@ -866,24 +1639,129 @@ class ScraperOrchestrator:
             f"Exact title exclusions: {', '.join(self.filter_config.get('title_exclude_exact', []))}",
         ])
         
+        # Master file and feed stages (per-scraper stages are listed above)
+        stages = {
+            stage: stats for stage, stats in self.metrics.summary()['stages'].items()
+            if 'scraper=' not in stage
+        }
+        if stages:
+            report_lines.extend(["", "STAGE TIMINGS (total / count / max, seconds)"])
+            for stage, stats in sorted(stages.items(), key=lambda item: -item[1]['total']):
+                report_lines.append(f"  - {stage}: {stats['total']:.3f} / {stats['count']} / {stats['max']:.3f}")
+        
         return "\n".join(report_lines)
 
 def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='Universal Web Scraper Orchestrator with Flexible Filtering')
-    parser.add_argument('--start-date', required=True, help='Start date (YYYY-MM-DD)')
-    parser.add_argument('--end-date', required=True, help='End date (YYYY-MM-DD)')
+    parser.add_argument('--start-date', help='Start date (YYYY-MM-DD); required unless --feeds-only')
+    parser.add_argument('--end-date', help='End date (YYYY-MM-DD); required unless --feeds-only')
     parser.add_argument('--scraper', help='Run specific scraper (default: run all)')
     parser.add_argument('--scrapers-dir', default='scrapers', help='Directory containing scraper modules')
     parser.add_argument('--output-dir', default='scraped_data', help='Output directory')
     parser.add_argument('--feeds-dir', default='feeds', help='Feeds output directory')
     parser.add_argument('--master-file', default='master_scraped_data.json', help='Master file name')
     parser.add_argument('--no-full-content', action='store_true', help='Skip full content scraping')
+    parser.add_argument('--pipelined', action='store_true',
+                        help='Fetch full content while pagination is still running')
+    parser.add_argument('--queue-size', type=int, default=20,
+                        help='Max URLs waiting for full content fetch in --pipelined mode')
+    parser.add_argument('--no-discovery', action='store_true',
+                        help='Skip sitemap/RSS discovery and always parse HTML listing pages')
+    parser.add_argument('--sitemap-discovery', action='store_true',
+                        help='Also find alz.org articles through its sitemap (one extra page fetch per article '
+                             'missing from the news page)')
     parser.add_argument('--report-only', action='store_true', help='Generate report only')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Keep running and poll each scraper on an interval adapted to how often it publishes')
+    parser.add_argument('--min-interval', type=float, default=15,
+                        help='Shortest polling interval per scraper in minutes with --daemon (default: 15)')
+    parser.add_argument('--max-interval', type=float, default=24 * 60,
+                        help='Longest polling interval per scraper in minutes with --daemon (default: 1440)')
+    parser.add_argument('--lookback-days', type=int, default=7,
+                        help='Days before the last poll each --daemon poll re-checks (default: 7)')
+    parser.add_argument('--recrawl', action='store_true',
+                        help='Re-fetch stored URLs that are due (conditional GET) and store versions whose text changed')
+    parser.add_argument('--recrawl-limit', type=int,
+                        help='Most URLs re-crawled per scraper with --recrawl (default: all due)')
+    parser.add_argument('--recrawl-max-interval', type=float, default=90,
+                        help='Longest gap in days between re-crawls of an old article (default: 90)')
     parser.add_argument('--max-latest', type=int, default=None, help='Max items in latest feed (None for all)')
     parser.add_argument('--max-per-scraper', type=int, default=50, help='Max items per scraper feed')
     parser.add_argument('--feeds-only', action='store_true', help='Only regenerate feeds from existing data')
+    parser.add_argument('--collapse-duplicates', action='store_true',
+                        help='Drop near-duplicate stories from the latest feed instead of only flagging them')
+    parser.add_argument('--feeds-start-date',
+                        help='Only build feeds from items dated on or after this date (YYYY-MM-DD); undated items are kept')
+    parser.add_argument('--feeds-end-date',
+                        help='Only build feeds from items dated on or before this date (YYYY-MM-DD); undated items are kept')
+    
+    # Politeness arguments
+    parser.add_argument('--rate', type=float,
+                        help='Requests per second allowed per host (default: 1.0); '
+                             'with adaptive rates also the ceiling unless --max-rate is given')
+    parser.add_argument('--burst', type=int, help='Requests allowed back-to-back per host (default: 1)')
+    parser.add_argument('--host-rate', nargs='+', metavar='HOST=RATE', help='Per-host rate overrides, e.g. www.fda.gov=2')
+    parser.add_argument('--max-rate', type=float,
+                        help='Highest per-host rate the adaptive controller may ramp up to '
+                             '(default: --rate if given, else 2.0)')
+    parser.add_argument('--no-adaptive-rate', action='store_true',
+                        help='Keep host rates fixed instead of adapting them to latency and errors')
+    parser.add_argument('--max-page-size', type=float, default=5,
+                        help='Abort HTML pages larger than this many MB (default: 5)')
+    parser.add_argument('--save-documents', action='store_true',
+                        help='Save linked PDFs to <output-dir>/documents instead of skipping them')
+    parser.add_argument('--http-backend', choices=['requests', 'httpx'], default='requests',
+                        help='HTTP client shared by all scrapers; httpx uses HTTP/2 when h2 is installed')
+    parser.add_argument('--pool-size', type=int, default=10,
+                        help='Keep-alive connections kept per host (default: 10)')
+    parser.add_argument('--ignore-robots', action='store_true',
+                        help='Do not fetch or honor robots.txt (only for sites you are allowed to crawl)')
+    parser.add_argument('--dns-cache-ttl', type=float, default=300,
+                        help='Seconds to cache DNS lookups, 0 to disable (default: 300)')
+    
+    # Full content priority arguments
+    parser.add_argument('--priority-keywords', metavar='FILE',
+                        help='Keyword file (e.g. alzheimer_keywords.txt); matching items get full content first')
+    parser.add_argument('--source-weight', nargs='+', metavar='SCRAPER=WEIGHT',
+                        help='Priority multipliers per scraper, e.g. fda_scraper=2 (default: 1)')
+    parser.add_argument('--max-content-fetches', type=int,
+                        help='Full content pages fetched per scraper per run; the rest waits for the next run')
+    parser.add_argument('--content-time-budget', type=float,
+                        help='Seconds of full content fetching per scraper per run; the rest waits for the next run')
+    
+    # Run budget arguments
+    parser.add_argument('--time-budget', type=float,
+                        help='Stop the run after this many minutes, saving what was fetched (with --daemon: per poll)')
+    parser.add_argument('--request-budget', type=int,
+                        help='Stop the run after this many HTTP requests across all scrapers')
+    parser.add_argument('--byte-budget', type=float,
+                        help='Stop the run after downloading this many MB across all scrapers')
+    
+    # Metrics arguments
+    parser.add_argument('--metrics-file', metavar='PATH',
+                        help='Write Prometheus metrics here after each run (e.g. a node-exporter textfile '
+                             'directory: /var/lib/node_exporter/textfile/scraper.prom)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics on this local port at /metrics with --daemon')
+    parser.add_argument('--metrics-host', default='127.0.0.1',
+                        help='Address for --metrics-port (default: 127.0.0.1)')
+    
+    # Profiling arguments
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile each scraper phase (worker threads included), master file update and feed generation with cProfile; '
+                             '.prof files and summary.txt go to OUTPUT_DIR/profiles/')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='With --profile, also trace allocations per phase with tracemalloc (slow)')
+    parser.add_argument('--profile-top', type=int, default=25,
+                        help='Functions and allocation sites listed per phase in summary.txt (default: 25)')
+    
+    # Storage layout arguments
+    parser.add_argument('--partitioned-store', action='store_true',
+                        help='Store items in monthly partitions instead of one master file')
+    parser.add_argument('--hot-months', type=int, default=3,
+                        help='Number of recent months kept uncompressed with --partitioned-store')
     
     # Filter configuration arguments
     parser.add_argument('--filter-config', help='Path to filter configuration JSON file')
@@ -895,6 +1773,10 @@ def main():
     parser.add_argument('--case-sensitive', action='store_true', help='Enable case-sensitive filtering')
     
     args = parser.parse_args()
+    if not (args.feeds_only or args.daemon or args.recrawl) and not (args.start_date and args.end_date):
+        parser.error('--start-date and --end-date are required unless --feeds-only, --daemon or --recrawl is given')
+    if args.metrics_port is not None and not args.daemon:
+        parser.error('--metrics-port needs --daemon; use --metrics-file for single runs')
     
     # Build filter configuration
     filter_config = None
@@ -920,15 +1802,62 @@ def main():
         if args.case_sensitive:
             filter_config['case_sensitive'] = True
     
+    # Build rate limit configuration
+    rate_limit_config = {}
+    if args.rate:
+        rate_limit_config['default_rate'] = args.rate
+    if args.burst:
+        rate_limit_config['default_burst'] = args.burst
+    if args.host_rate:
+        rate_limit_config['host_rates'] = {}
+        for setting in args.host_rate:
+            host, _, rate = setting.partition('=')
+            rate_limit_config['host_rates'][host] = float(rate)
+    
+    priority_keywords = None
+    if args.priority_keywords:
+        from keyword_search import load_keywords_from_file
+        priority_keywords = load_keywords_from_file(args.priority_keywords)
+    source_weights = {}
+    for setting in args.source_weight or []:
+        scraper_name, _, weight = setting.partition('=')
+        source_weights[scraper_name] = float(weight)
+    
     # Create orchestrator
     orchestrator = ScraperOrchestrator(
         args.scrapers_dir, 
         args.output_dir, 
         args.master_file, 
         args.feeds_dir,
-        filter_config if filter_config else None
+        filter_config if filter_config else None,
+        partitioned=args.partitioned_store,
+        hot_months=args.hot_months,
+        rate_limit_config=rate_limit_config,
+        adaptive_rate=not args.no_adaptive_rate,
+        max_rate=args.max_rate,
+        save_documents=args.save_documents,
+        max_page_bytes=int(args.max_page_size * 1024 * 1024),
+        http_backend=args.http_backend,
+        pool_size=args.pool_size,
+        dns_cache_ttl=args.dns_cache_ttl,
+        respect_robots=not args.ignore_robots,
+        priority_keywords=priority_keywords,
+        source_weights=source_weights,
+        max_content_fetches=args.max_content_fetches,
+        content_time_budget=args.content_time_budget,
+        max_run_seconds=args.time_budget * 60 if args.time_budget else None,
+        max_run_requests=args.request_budget,
+        max_run_bytes=int(args.byte_budget * 1024 * 1024) if args.byte_budget else None,
+        metrics_file=args.metrics_file
     )
     
+    if args.profile or args.profile_memory:
+        import atexit
+        from profiling import Profiler
+        
+        orchestrator.profiler = Profiler(orchestrator.output_directory, args.profile_top, memory=args.profile_memory)
+        atexit.register(orchestrator.profiler.write)  # Every exit path, daemon shutdown included
+    
     # Save filter config if requested
     if args.save_filter_config:
         orchestrator.save_filter_config(args.save_filter_config)
@@ -939,7 +1868,8 @@ def main():
     # If feeds-only mode, skip scraping
     if args.feeds_only:
         print("Feeds-only mode: Regenerating feeds from existing data...")
-        orchestrator.generate_feeds(args.max_latest, args.max_per_scraper)
+        orchestrator.generate_feeds(args.max_latest, args.max_per_scraper, args.collapse_duplicates,
+                                    args.feeds_start_date, args.feeds_end_date)
         print("Feeds regenerated successfully!")
         sys.exit(0)
     
@@ -955,15 +1885,70 @@ def main():
     # Run scrapers
     scrape_full_content = not args.no_full_content
     
+    if args.daemon:
+        from scheduler import PollingScheduler
+        
+        if args.scraper and args.scraper not in scrapers:
+            print(f"Scraper '{args.scraper}' not found")
+            sys.exit(1)
+        scheduler = PollingScheduler(
+            orchestrator,
+            [args.scraper] if args.scraper else None,
+            min_interval=args.min_interval * 60,
+            max_interval=args.max_interval * 60,
+            lookback_days=args.lookback_days,
+            scrape_full_content=scrape_full_content,
+            feed_options={
+                'max_latest_items': args.max_latest,
+                'max_per_scraper': args.max_per_scraper,
+                'collapse_duplicates': args.collapse_duplicates
+            },
+            run_kwargs={
+                'pipelined': args.pipelined,
+                'queue_size': args.queue_size,
+                'use_discovery': not args.no_discovery,
+                'sitemap_discovery': args.sitemap_discovery
+            }
+        )
+        if args.metrics_port is not None:
+            from metrics_export import MetricsServer
+            MetricsServer(orchestrator.metrics, args.metrics_port, args.metrics_host).start()
+        scheduler.run()
+        sys.exit(0)
+    
+    if args.recrawl:
+        from recrawl import RecrawlScheduler
+        
+        if args.scraper and args.scraper not in scrapers:
+            print(f"Scraper '{args.scraper}' not found")
+            sys.exit(1)
+        recrawler = RecrawlScheduler(orchestrator, max_interval_days=args.recrawl_max_interval)
+        results = recrawler.run([args.scraper] if args.scraper else None, args.recrawl_limit)
+        if any(result.full_content for result in results.values()):
+            orchestrator.generate_feeds(args.max_latest, args.max_per_scraper, args.collapse_duplicates,
+                                        args.feeds_start_date, args.feeds_end_date)
+        if orchestrator.rate_controller:
+            orchestrator.rate_controller.save_state()
+        orchestrator.export_metrics()
+        sys.exit(0)
+    
     if args.scraper:
         # Run specific scraper
+        if orchestrator.run_budget:
+            orchestrator.run_budget.reset()
         if args.scraper not in scrapers:
             print(f"Scraper '{args.scraper}' not found")
             sys.exit(1)
-        results = {args.scraper: orchestrator.run_scraper(args.scraper, args.start_date, args.end_date, scrape_full_content)}
+        results = {args.scraper: orchestrator.run_scraper(args.scraper, args.start_date, args.end_date, scrape_full_content,
+                                                          pipelined=args.pipelined, queue_size=args.queue_size,
+                                                          use_discovery=not args.no_discovery,
+                                                          sitemap_discovery=args.sitemap_discovery)}
     else:
         # Run all scrapers
-        results = orchestrator.run_all_scrapers(args.start_date, args.end_date, scrape_full_content)
+        results = orchestrator.run_all_scrapers(args.start_date, args.end_date, scrape_full_content,
+                                                pipelined=args.pipelined, queue_size=args.queue_size,
+                                                use_discovery=not args.no_discovery,
+                                                sitemap_discovery=args.sitemap_discovery)
     
     # Update master file
     if not args.report_only:
@@ -971,7 +1956,8 @@ def main():
         print(f"Data saved to master file: {master_file}")
         
         # Generate feeds after updating master file
-        orchestrator.generate_feeds(args.max_latest, args.max_per_scraper)
+        orchestrator.generate_feeds(args.max_latest, args.max_per_scraper, args.collapse_duplicates,
+                                    args.feeds_start_date, args.feeds_end_date)
     
     # Generate and print report
     report = orchestrator.generate_report(results)
@@ -983,6 +1969,10 @@ def main():
     with open(report_file, 'w', encoding='utf-8') as f:
         f.write(report)
     print(f"Report saved to: {report_file}")
+    
+    metrics_file = orchestrator.export_metrics()
+    if metrics_file:
+        print(f"Metrics written to: {metrics_file}")
 
 if __name__ == "__main__":
     main()
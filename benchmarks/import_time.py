@@ -0,0 +1,104 @@
+"""
+CLI Cold-Start Benchmark
+Measures how long each entry point takes to start in a fresh interpreter and
+uses `python -X importtime` to check that entry points which never fetch or
+parse pages don't import the HTTP/HTML stack. With --check it exits non-zero
+when a budget is exceeded, so it can guard against import-time regressions.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Any
+
+ROOT = Path(__file__).parent.parent
+
+# Modules only the fetch and parse paths may import
+HEAVY_MODULES = ('requests', 'urllib3', 'bs4', 'lxml', 'httpx', 'h2', 'pandas', 'pyarrow', 'numpy')
+
+# (name, arguments); {tmp} is replaced by a scratch directory
+ENTRY_POINTS = [
+    ('keyword_search --help', ['keyword_search.py', '--help']),
+    ('base_scraper --feeds-only', ['base_scraper.py', '--feeds-only',
+                                   '--output-dir', '{tmp}/data', '--feeds-dir', '{tmp}/feeds']),
+    ('columnar_export --help', ['columnar_export.py', '--help']),
+    ('backfill --help', ['backfill.py', '--help']),
+]
+
+
+def _command(args: List[str], tmp: str, importtime: bool = False) -> List[str]:
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    return command + [arg.replace('{tmp}', tmp) for arg in args]
+
+
+def wall_times(args: List[str], tmp: str, runs: int) -> List[float]:
+    """Wall-clock milliseconds of each run"""
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(_command(args, tmp), cwd=ROOT, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=True)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def import_profile(args: List[str], tmp: str) -> Dict[str, Any]:
+    """Total import time (ms) and the top-level packages imported, from -X importtime"""
+    completed = subprocess.run(_command(args, tmp, importtime=True), cwd=ROOT, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, text=True, check=True)
+    total_us = 0
+    packages = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        packages.add(name.strip().split('.')[0])
+    return {'import_ms': total_us / 1000, 'packages': packages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold-start time of the CLI entry points')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per entry point')
+    parser.add_argument('--budget-ms', type=float, default=150,
+                        help='Median startup budget per entry point above a bare interpreter (with --check)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit 1 if an entry point imports a heavy module or exceeds the budget')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        bare = statistics.median(wall_times(['-c', 'pass'], tmp, args.runs))
+        print(f"Bare interpreter: {bare:.0f} ms\n")
+        print(f"{'Entry point':<28} {'median':>8} {'min':>8} {'over bare':>10} {'imports':>9}  heavy modules")
+
+        for name, entry_args in ENTRY_POINTS:
+            times = wall_times(entry_args, tmp, args.runs)
+            profile = import_profile(entry_args, tmp)
+            heavy = sorted(profile['packages'].intersection(HEAVY_MODULES))
+            median = statistics.median(times)
+
+            print(f"{name:<28} {median:>6.0f}ms {min(times):>6.0f}ms {median - bare:>8.0f}ms "
+                  f"{profile['import_ms']:>7.0f}ms  {', '.join(heavy) or '-'}")
+
+            if heavy:
+                failures.append(f"{name} imports {', '.join(heavy)}")
+            if median - bare > args.budget_ms:
+                failures.append(f"{name} starts in {median - bare:.0f} ms over bare, budget {args.budget_ms:.0f} ms")
+
+    if failures:
+        print("\nOver budget:")
+        for failure in failures:
+            print(f"  - {failure}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
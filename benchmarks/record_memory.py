@@ -0,0 +1,92 @@
+"""
+Record Memory Benchmark
+Compares the memory held by standardized records stored as plain dicts
+(the old ScraperResult layout) against the slotted record classes
+"""
+
+import gc
+import sys
+import tracemalloc
+import uuid
+import argparse
+from pathlib import Path
+from typing import Callable, List, Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from base_scraper import ScraperResult, AnnouncementRecord, ContentRecord
+
+
+def _announcement(i: int) -> dict:
+    return {
+        'id': str(uuid.uuid4()),
+        'title': f"FDA Roundup: announcement number {i} about drug safety",
+        'url': f"https://www.fda.gov/news-events/press-announcements/item-{i}",
+        'date': '2025-09-17',
+        'category': 'Drug Safety',
+        'excerpt': f"FDA Roundup: announcement number {i} about drug safety",
+        'source': 'FDA Press Announcements'
+    }
+
+
+def _content(i: int) -> dict:
+    return {
+        'id': str(uuid.uuid4()),
+        'url': f"https://www.fda.gov/news-events/press-announcements/item-{i}",
+        'title': f"Announcement {i}",
+        'date_published': '2025-09-17',
+        'full_content': f"Paragraph text for item {i}. " * 40,
+        'word_count': 200,
+        'images': [],
+        'links': [],
+        'contact_info': '',
+        'tags': [],
+        'comments': [],
+        'metadata': {}
+    }
+
+
+def measure(build: Callable[[], List[Any]]) -> int:
+    """Return the bytes still allocated by whatever build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dict vs slotted record memory usage')
+    parser.add_argument('--items', type=int, default=20000, help='Number of records of each kind')
+    args = parser.parse_args()
+
+    # Standardize once up front so both layouts reference the same field values
+    # and only the per-record container overhead is measured
+    result = ScraperResult('benchmark', 'fda.gov')
+    announcement_dicts = [result._standardize_announcement(_announcement(i)).to_dict() for i in range(args.items)]
+    content_dicts = [result._standardize_content(_content(i)).to_dict() for i in range(args.items)]
+
+    def build_dicts():
+        return ([dict(a) for a in announcement_dicts],
+                [dict(c) for c in content_dicts])
+
+    def build_records():
+        return ([AnnouncementRecord(**a) for a in announcement_dicts],
+                [ContentRecord(**c) for c in content_dicts])
+
+    dict_bytes = measure(build_dicts)
+    record_bytes = measure(build_records)
+
+    print(f"Records per kind: {args.items}")
+    print(f"Dict layout:    {dict_bytes / 1024 / 1024:8.2f} MiB ({dict_bytes / (2 * args.items):.0f} bytes/record)")
+    print(f"Slotted layout: {record_bytes / 1024 / 1024:8.2f} MiB ({record_bytes / (2 * args.items):.0f} bytes/record)")
+    if dict_bytes:
+        print(f"Saved: {(1 - record_bytes / dict_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Columnar Export
+Writes the master dataset as Parquet (or Arrow/Feather) files partitioned by
+scraper and month, so analysts can load only the columns and months they need
+"""
+
+import json
+import sys
+import argparse
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+
+from partitioned_store import get_item_month, open_store_for_master
+
+
+class ColumnarExporter:
+    """Export announcements and full content to hive-partitioned columnar files"""
+
+    DATASETS = {
+        'announcements': {
+            'date_field': 'date',
+            'columns': ['id', 'title', 'url', 'date', 'category', 'excerpt',
+                        'source_website', 'scraped_at', 'simhash', 'raw_ref']
+        },
+        'full_content': {
+            'date_field': 'date_published',
+            'columns': ['id', 'url', 'title', 'date_published', 'full_content', 'word_count',
+                        'images', 'links', 'contact_info', 'tags', 'comments', 'metadata',
+                        'source_website', 'scraped_at', 'simhash', 'raw_ref']
+        }
+    }
+
+    # Nested fields are stored as JSON strings; their shapes differ between scrapers
+    NESTED_COLUMNS = {'images', 'links', 'tags', 'comments', 'metadata'}
+
+    FORMATS = {
+        'parquet': '.parquet',
+        'arrow': '.arrow'
+    }
+
+    def __init__(self, output_directory: str = "scraped_data/columnar", file_format: str = 'parquet'):
+        if file_format not in self.FORMATS:
+            raise ValueError(f"Unsupported format: {file_format}. Use one of {list(self.FORMATS)}")
+
+        self.output_directory = Path(output_directory)
+        self.file_format = file_format
+        self.manifest_path = self.output_directory / "_export_manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the record of ids already exported per partition"""
+        if not self.manifest_path.exists():
+            return {'exports': 0, 'partitions': {}}
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load export manifest, exporting everything: {e}")
+            return {'exports': 0, 'partitions': {}}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        """Persist the export manifest"""
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+
+    def _to_row(self, item: Dict[str, Any], columns: List[str]) -> Dict[str, Any]:
+        """Flatten a record into a row of scalar columns"""
+        row = {}
+        for column in columns:
+            value = item.get(column)
+            if column in self.NESTED_COLUMNS:
+                value = json.dumps(value if value is not None else [], ensure_ascii=False)
+            elif column == 'word_count':
+                value = int(value or 0)
+            else:
+                value = '' if value is None else str(value)
+            row[column] = value
+        return row
+
+    def _partition_rows(self, master_data: Dict[str, Any], dataset: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Group rows of one dataset by their scraper=/month= partition path"""
+        spec = self.DATASETS[dataset]
+        partitions = {}
+
+        for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
+            for item in scraper_data.get(dataset, []):
+                month = get_item_month(item, spec['date_field'])
+                partition = f"{dataset}/scraper={scraper_name}/month={month}"
+                partitions.setdefault(partition, []).append(self._to_row(item, spec['columns']))
+
+        return partitions
+
+    def _write_part(self, rows: List[Dict[str, Any]], columns: List[str], path: Path):
+        """Write one part file"""
+        import pandas as pd
+
+        frame = pd.DataFrame(rows, columns=columns)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.file_format == 'parquet':
+            frame.to_parquet(path, index=False, compression='zstd')
+        else:
+            frame.to_feather(path, compression='zstd')
+
+    def export(self, master_data: Dict[str, Any], full: bool = False) -> Dict[str, Any]:
+        """
+        Export master data, appending only rows not exported before
+
+        Args:
+            master_data: Master file structure
+            full: Ignore the manifest and rewrite every partition
+
+        Returns:
+            Export statistics
+        """
+        manifest = {'exports': 0, 'partitions': {}} if full else self._load_manifest()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        stats = {'partitions_written': 0, 'rows_written': 0, 'rows_skipped': 0}
+
+        for dataset, spec in self.DATASETS.items():
+            for partition, rows in self._partition_rows(master_data, dataset).items():
+                exported_ids = set(manifest['partitions'].get(partition, []))
+                new_rows = [row for row in rows if row['id'] not in exported_ids]
+                stats['rows_skipped'] += len(rows) - len(new_rows)
+
+                if not new_rows:
+                    continue
+
+                partition_dir = self.output_directory / partition
+                if full and partition_dir.exists():
+                    for old_part in partition_dir.glob(f"part-*{self.FORMATS[self.file_format]}"):
+                        old_part.unlink()
+
+                part_path = partition_dir / f"part-{timestamp}-{uuid.uuid4().hex[:8]}{self.FORMATS[self.file_format]}"
+                self._write_part(new_rows, spec['columns'], part_path)
+
+                manifest['partitions'][partition] = sorted(exported_ids | {row['id'] for row in new_rows})
+                stats['partitions_written'] += 1
+                stats['rows_written'] += len(new_rows)
+                print(f"Wrote {len(new_rows)} rows to {part_path}")
+
+        manifest['exports'] = manifest.get('exports', 0) + 1
+        manifest['last_export'] = datetime.now().isoformat()
+        manifest['format'] = self.file_format
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        self._save_manifest(manifest)
+
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export master JSON to columnar files partitioned by scraper and month'
+    )
+    parser.add_argument('--master-file', default='scraped_data/master_scraped_data.json',
+                       help='Path to master JSON file')
+    parser.add_argument('--output-dir', default='scraped_data/columnar',
+                       help='Directory for the partitioned dataset')
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet',
+                       help='Columnar file format')
+    parser.add_argument('--full', action='store_true',
+                       help='Rewrite all partitions instead of appending new rows only')
+
+    args = parser.parse_args()
+
+    master_path = Path(args.master_file)
+    if not master_path.exists():
+        print(f"Error: Master file not found: {master_path}")
+        sys.exit(1)
+
+    with open(master_path, 'r', encoding='utf-8') as f:
+        master_data = json.load(f)
+
+    # A partitioned master keeps its items in monthly partition files
+    store = open_store_for_master(master_data, master_path)
+    if store is not None:
+        for scraper_name, scraper_data in master_data.get('results_by_scraper', {}).items():
+            items = store.load(scraper_name)
+            scraper_data['announcements'] = items['announcements']
+            scraper_data['full_content'] = items['full_content']
+        print(f"Loaded partitions from: {store.directory}")
+
+    exporter = ColumnarExporter(args.output_dir, args.format)
+    stats = exporter.export(master_data, full=args.full)
+
+    print(f"\nPartitions written: {stats['partitions_written']}")
+    print(f"Rows written: {stats['rows_written']}")
+    print(f"Rows already exported: {stats['rows_skipped']}")
+
+
+if __name__ == "__main__":
+    main()
+
+
+# USAGE EXAMPLES:
+#
+# 1. Export new rows since the last export:
+#    python columnar_export.py
+#
+# 2. Rebuild the whole dataset as Arrow files:
+#    python columnar_export.py --format arrow --full
+#
+# 3. Read only two columns of recent FDA announcements in pandas:
+#    pd.read_parquet('scraped_data/columnar/announcements', columns=['title', 'date'],
+#                    filters=[('scraper', '=', 'fda_scraper'), ('month', '>=', '2025-01')])
@@ -0,0 +1,200 @@
+"""
+Sitemap and RSS Discovery
+Lets scrapers find announcement URLs from one small XML fetch instead of
+downloading and parsing HTML listing pages. Scrapers opt in and fall back to
+their HTML listing when DiscoveryUnavailable is raised. URLs robots.txt
+disallows are dropped when the fetcher has a robots cache.
+"""
+
+import re
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Any, Optional
+
+
+class DiscoveryUnavailable(Exception):
+    """The sitemap/feed can't be used (missing, unparseable or incomplete for the range)"""
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _child_text(element: ET.Element, name: str) -> str:
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or '').strip()
+    return ''
+
+
+def parse_feed_date(value: str) -> Optional[datetime]:
+    """Parse W3C (sitemap/Atom) and RFC 822 (RSS) dates into a naive datetime"""
+    value = (value or '').strip()
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed.replace(tzinfo=None)
+    except ValueError:
+        pass
+
+    try:
+        return parsedate_to_datetime(value).replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+
+class Discovery:
+    """Read sitemaps, sitemap indexes and RSS/Atom feeds through a scraper's Fetcher"""
+
+    def __init__(self, fetcher: Any, max_sitemaps: int = 50):
+        self.fetcher = fetcher
+        self.max_sitemaps = max_sitemaps
+
+    def _allowed(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop entries robots.txt disallows, so they are never queued"""
+        robots = getattr(self.fetcher, 'robots', None)
+        if not robots:
+            return entries
+        allowed = set(robots.filter_urls([entry['url'] for entry in entries]))
+        return [entry for entry in entries if entry['url'] in allowed]
+
+    def _fetch_xml(self, url: str) -> ET.Element:
+        # Capped at the fetcher's page size limit, before and after decompression
+        max_bytes = self.fetcher.max_bytes
+        try:
+            data = self.fetcher.get_limited(url).content
+        except Exception as e:
+            raise DiscoveryUnavailable(f"Could not fetch {url}: {e}")
+
+        if data[:2] == b'\x1f\x8b':
+            # sitemap.xml.gz
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            try:
+                data = decompressor.decompress(data, max_bytes + 1)
+            except zlib.error as e:
+                raise DiscoveryUnavailable(f"Could not decompress {url}: {e}")
+            if len(data) > max_bytes:
+                raise DiscoveryUnavailable(f"Decompressed sitemap exceeds {max_bytes} bytes: {url}")
+
+        try:
+            return ET.fromstring(data)
+        except ET.ParseError as e:
+            raise DiscoveryUnavailable(f"Could not parse {url}: {e}")
+
+    def sitemap_entries(self, url: str, start_date: str = None, url_pattern: str = None) -> List[Dict[str, Any]]:
+        """
+        List the URLs of a sitemap (following sitemap indexes)
+
+        Entries and child sitemaps whose lastmod is before start_date are
+        skipped: nothing in them can have been published in the range. A
+        later lastmod may just be an edit, so the upper bound is left to the
+        scraper.
+        """
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        pattern = re.compile(url_pattern) if url_pattern else None
+
+        entries = []
+        matched = 0
+        skipped_sitemaps = 0
+        pending = [url]
+        fetched = 0
+
+        while pending and fetched < self.max_sitemaps:
+            root = self._fetch_xml(pending.pop(0))
+            fetched += 1
+
+            for element in root:
+                loc = _child_text(element, 'loc')
+                if not loc:
+                    continue
+                lastmod = parse_feed_date(_child_text(element, 'lastmod'))
+                too_old = start_dt is not None and lastmod is not None and lastmod < start_dt
+
+                if _local_name(element.tag) == 'sitemap':
+                    if too_old:
+                        skipped_sitemaps += 1
+                    else:
+                        pending.append(loc)
+                    continue
+
+                if pattern and not pattern.search(loc):
+                    continue
+                matched += 1
+                if not too_old:
+                    entries.append({
+                        'url': loc,
+                        'lastmod': lastmod.strftime('%Y-%m-%d') if lastmod else '',
+                        'title': '',
+                        'summary': ''
+                    })
+
+        if pending:
+            raise DiscoveryUnavailable(f"More than {self.max_sitemaps} sitemaps under {url}")
+        # Nothing matching at all means the sitemap doesn't cover this source,
+        # unless the matches may sit in child sitemaps skipped as too old
+        if pattern and not matched and not skipped_sitemaps:
+            raise DiscoveryUnavailable(f"No URLs in {url} match {url_pattern}")
+
+        return self._allowed(entries)
+
+    def feed_entries(self, url: str, start_date: str = None, end_date: str = None,
+                     url_pattern: str = None) -> List[Dict[str, Any]]:
+        """
+        List RSS or Atom items published in [start_date, end_date]
+
+        Feeds only hold recent items, so DiscoveryUnavailable is raised when the
+        oldest item is newer than start_date and older items may be missing.
+        """
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d') if start_date else None
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d') if end_date else None
+        pattern = re.compile(url_pattern) if url_pattern else None
+
+        root = self._fetch_xml(url)
+        items = [element for element in root.iter() if _local_name(element.tag) in ('item', 'entry')]
+        if not items:
+            raise DiscoveryUnavailable(f"No items in feed {url}")
+
+        entries = []
+        oldest = None
+
+        for item in items:
+            link = _child_text(item, 'link')
+            if not link:
+                # Atom puts the URL in an attribute
+                for child in item:
+                    if _local_name(child.tag) == 'link' and child.get('href'):
+                        link = child.get('href')
+                        break
+            published = parse_feed_date(
+                _child_text(item, 'pubDate') or _child_text(item, 'published') or _child_text(item, 'updated')
+            )
+            if not link or published is None:
+                continue
+            if pattern and not pattern.search(link):
+                continue
+
+            oldest = published if oldest is None else min(oldest, published)
+            day = published.replace(hour=0, minute=0, second=0, microsecond=0)
+            if (start_dt and day < start_dt) or (end_dt and day > end_dt):
+                continue
+
+            entries.append({
+                'url': link,
+                'lastmod': published.strftime('%Y-%m-%d'),
+                'title': _child_text(item, 'title'),
+                'summary': _child_text(item, 'description') or _child_text(item, 'summary')
+            })
+
+        if oldest is None:
+            raise DiscoveryUnavailable(f"No dated items in feed {url}")
+        if start_dt and oldest > start_dt:
+            raise DiscoveryUnavailable(
+                f"Feed only goes back to {oldest.strftime('%Y-%m-%d')}, range starts {start_date}"
+            )
+
+        return self._allowed(entries)
@@ -0,0 +1,356 @@
+"""
+Multi-Process Crawling
+Splits a run into tasks on a shared WorkQueue. Workers lease listing and
+content tasks, run the scrapers and push what they found; a single writer
+dedups and filters announcements, queues content tasks for the new URLs
+and merges everything into the master store.
+
+Each process has its own per-host rate limiter, so with N workers on the
+same host give each one 1/N of the rate the site tolerates (--rate).
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Dict, List, Any
+
+from base_scraper import ScraperOrchestrator, ScraperResult, ContentFilter
+from backfill import month_shards
+from work_queue import WorkQueue, SQLiteWorkQueue, Task, default_worker_id
+
+
+class TaskError(Exception):
+    """A task failure that knows whether another attempt can succeed"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def enqueue_run(queue: WorkQueue, scraper_names: List[str], start_date: str, end_date: str,
+                shard_by_month: bool = False, **kwargs) -> int:
+    """Queue listing tasks for a date range, one per scraper (or per scraper and month)"""
+    if shard_by_month:
+        shards = month_shards(start_date, end_date)
+    else:
+        shards = [{'id': 'all', 'start_date': start_date, 'end_date': end_date, 'kwargs': {}}]
+
+    queued = 0
+    for scraper_name in scraper_names:
+        for shard in shards:
+            key = f"{shard['start_date']}:{shard['end_date']}"
+            payload = {
+                'start_date': shard['start_date'],
+                'end_date': shard['end_date'],
+                'kwargs': {**kwargs, **shard['kwargs']}
+            }
+            if queue.push('listing', scraper_name, key, payload):
+                queued += 1
+    return queued
+
+
+class Worker:
+    """Lease tasks, run the scraper for each and push its output to the writer"""
+
+    def __init__(self, orchestrator: ScraperOrchestrator, queue: WorkQueue, worker_id: str = None,
+                 kinds: List[str] = None, idle_sleep: float = 5):
+        self.orchestrator = orchestrator
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.kinds = kinds or ['listing', 'listing_page', 'content']
+        self.idle_sleep = idle_sleep
+        self.processed = 0
+
+    def _heartbeat(self, task: Task, done: threading.Event):
+        """Keep the lease alive while a long listing task runs"""
+        interval = max(1.0, self.queue.visibility_timeout / 3)
+        while not done.wait(interval):
+            if not self.queue.extend(task, self.worker_id):
+                print(f"Lost the lease on task {task.id}")
+                return
+
+    def execute(self, task: Task) -> List[Dict[str, Any]]:
+        """Run one task; returns the results for the writer"""
+        scraper = self.orchestrator.loaded_scrapers[task.scraper]
+        scraper.failed_urls = []
+        payload = task.payload
+
+        if task.kind == 'content':
+            contents = scraper.scrape_full_content([payload['url']])
+            if not contents:
+                # Scrapers only report transient failures; anything else (404, not HTML, robots.txt) is final
+                transient = [failure for failure in scraper.failed_urls if failure['url'] == payload['url']]
+                if transient:
+                    raise TaskError(transient[-1].get('error', 'fetch failed'))
+                raise TaskError(f"No content for {payload['url']}", retryable=False)
+            return [{'kind': 'content', 'payload': {'content': content}} for content in contents]
+
+        if task.kind == 'listing_page':
+            announcements = scraper.scrape_listing_page(payload['url'], payload['start_date'], payload['end_date'])
+        else:
+            announcements = scraper.scrape_announcements(payload['start_date'], payload['end_date'],
+                                                         **payload.get('kwargs', {}))
+
+        # Listing pages that failed transiently become their own tasks
+        for failure in scraper.failed_urls:
+            if failure.get('kind') == 'listing':
+                self.queue.push('listing_page', task.scraper, failure['url'], {
+                    'url': failure['url'],
+                    'start_date': payload['start_date'],
+                    'end_date': payload['end_date']
+                })
+
+        return [{'kind': 'announcements', 'payload': {
+            'scraper_info': scraper.get_scraper_info(),
+            'announcements': announcements,
+            'date_range': f"{payload['start_date']} to {payload['end_date']}"
+        }}]
+
+    def _retryable(self, task: Task, error: Exception) -> bool:
+        """Whether a failed task is worth another attempt"""
+        if isinstance(error, TaskError):
+            return error.retryable
+        fetcher = getattr(self.orchestrator.loaded_scrapers.get(task.scraper), 'fetcher', None)
+        return fetcher.is_retryable(error) if fetcher is not None else True
+
+    def run_task(self, task: Task):
+        print(f"[{self.worker_id}] {task.kind} task {task.id} for {task.scraper} (attempt {task.attempts})")
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task, done), daemon=True)
+        heartbeat.start()
+        try:
+            results = self.execute(task)
+        except Exception as e:
+            retry = self._retryable(task, e)
+            print(f"Task {task.id} failed{'' if retry else ' permanently'}: {e}")
+            self.queue.fail(task, self.worker_id, str(e), retry=retry)
+            return
+        finally:
+            done.set()
+
+        if not self.queue.complete(task, self.worker_id, results):
+            print(f"Task {task.id} was taken over by another worker, dropping its results")
+        self.processed += 1
+
+    def run(self, exit_when_idle: bool = False):
+        """Work until stopped; with exit_when_idle, stop once the queue has nothing left"""
+        print(f"Worker {self.worker_id} started ({', '.join(self.kinds)})")
+        try:
+            while True:
+                tasks = self.queue.lease(self.worker_id, self.kinds)
+                if not tasks:
+                    if exit_when_idle and self.queue.outstanding() == 0:
+                        break
+                    time.sleep(self.idle_sleep)
+                    continue
+                for task in tasks:
+                    self.run_task(task)
+        except KeyboardInterrupt:
+            print("Worker interrupted; leased tasks return to the queue when their leases expire")
+        finally:
+            if self.orchestrator.rate_controller:
+                self.orchestrator.rate_controller.save_state()
+        print(f"Worker {self.worker_id} processed {self.processed} tasks")
+
+
+class ResultWriter:
+    """The single process that dedups, filters and stores what workers found"""
+
+    LOCK_NAME = 'writer'
+
+    def __init__(self, orchestrator: ScraperOrchestrator, queue: WorkQueue, scrape_full_content: bool = True,
+                 batch_size: int = 200, idle_sleep: float = 5, generate_feeds: bool = True):
+        self.orchestrator = orchestrator
+        self.queue = queue
+        self.scrape_full_content = scrape_full_content
+        self.batch_size = batch_size
+        self.idle_sleep = idle_sleep
+        self.generate_feeds = generate_feeds
+        self.owner = default_worker_id()
+
+    def _scraper_info(self, scraper_name: str) -> Dict[str, Any]:
+        """Display name and website of a scraper, for batches that carry no listing payload"""
+        scraper = self.orchestrator.loaded_scrapers.get(scraper_name)
+        if scraper is not None:
+            return scraper.get_scraper_info()
+        stored = self.orchestrator.load_existing_data(include_items=False)['results_by_scraper'].get(scraper_name, {})
+        return stored.get('scraper_info') or {'name': scraper_name, 'website': 'Unknown'}
+
+    def _result_for(self, results: Dict[str, ScraperResult], scraper_name: str,
+                    scraper_info: Dict[str, Any] = None) -> ScraperResult:
+        if scraper_name not in results:
+            info = scraper_info or self._scraper_info(scraper_name)
+            results[scraper_name] = ScraperResult(
+                info['name'],
+                info.get('website', 'Unknown'),
+                self.orchestrator.get_existing_urls(scraper_name),
+                ContentFilter(self.orchestrator.filter_config),
+                self.orchestrator.raw_store
+            )
+        return results[scraper_name]
+
+    def process_batch(self) -> int:
+        """Store one batch of results; returns how many results were handled"""
+        batch = self.queue.results(self.batch_size)
+        if not batch:
+            return 0
+
+        results = {}
+        new_urls = {}
+        for task_result in batch:
+            payload = task_result.payload
+            if task_result.kind == 'announcements':
+                result = self._result_for(results, task_result.scraper, payload['scraper_info'])
+                result.statistics['date_range'] = payload.get('date_range', '')
+                for announcement in payload['announcements']:
+                    url = announcement.get('url')
+                    if url and url in result.new_urls:
+                        continue  # Found by two overlapping listing tasks
+                    if result.add_announcement(announcement) and url:
+                        new_urls.setdefault(task_result.scraper, {})[url] = announcement
+            else:
+                self._result_for(results, task_result.scraper).add_full_content(payload['content'])
+
+        # Fetching full content is work for the workers as well, most valuable pages first
+        queued = 0
+        if self.scrape_full_content:
+            scorer = self.orchestrator.content_scorer
+            for scraper_name, announcements in new_urls.items():
+                # URLs of hosts whose robots.txt is unreachable are queued too; workers retry them with backoff
+                postponed = []
+                urls = self.orchestrator._fetchable(list(announcements), postponed)
+                for url in urls + [failure['url'] for failure in postponed]:
+                    priority = scorer.score(announcements[url], scraper_name)
+                    if self.queue.push('content', scraper_name, url, {'url': url}, priority):
+                        queued += 1
+
+        self.orchestrator.update_master_file(results)
+        self.queue.ack_results([task_result.id for task_result in batch])
+
+        added = sum(len(result.announcements) for result in results.values())
+        contents = sum(len(result.full_content) for result in results.values())
+        print(f"Stored {added} new announcements and {contents} full content items, queued {queued} content tasks")
+        if self.generate_feeds and (added or contents):
+            self.orchestrator.generate_feeds()
+        return len(batch)
+
+    def run(self, exit_when_idle: bool = False):
+        """Store results until stopped; refuses to start while another writer is active"""
+        lock_ttl = max(60.0, self.idle_sleep * 6)
+        if not self.queue.acquire_lock(self.LOCK_NAME, self.owner, lock_ttl):
+            print("Another writer is active on this queue, exiting")
+            return
+
+        self.orchestrator.warm_url_index()
+        print(f"Writer {self.owner} started")
+        try:
+            while True:
+                self.queue.acquire_lock(self.LOCK_NAME, self.owner, lock_ttl)
+                if self.process_batch():
+                    continue
+                if exit_when_idle and self.queue.outstanding() == 0:
+                    break
+                time.sleep(self.idle_sleep)
+        except KeyboardInterrupt:
+            print("Writer interrupted; unstored results stay in the queue")
+        finally:
+            self.queue.release_lock(self.LOCK_NAME, self.owner)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl with several worker processes sharing a SQLite work queue')
+    parser.add_argument('command', choices=['enqueue', 'worker', 'writer', 'status'],
+                        help='enqueue a run, run a worker, run the single writer, or show queue counts')
+    parser.add_argument('--queue', default='scraped_data/work_queue.db', help='SQLite queue file shared by all processes')
+    parser.add_argument('--shared-queue', action='store_true',
+                        help='The queue file is on a network filesystem used by several hosts '
+                             '(rollback journal instead of WAL); every process must pass it')
+    parser.add_argument('--start-date', help='Start date (YYYY-MM-DD) for enqueue')
+    parser.add_argument('--end-date', help='End date (YYYY-MM-DD) for enqueue')
+    parser.add_argument('--scraper', help='Enqueue one scraper (default: all)')
+    parser.add_argument('--shard-by-month', action='store_true', help='One listing task per scraper and month')
+    parser.add_argument('--no-discovery', action='store_true', help='Always parse HTML listing pages')
+    parser.add_argument('--kinds', nargs='+', choices=['listing', 'listing_page', 'content'],
+                        help='Task kinds this worker takes (default: all)')
+    parser.add_argument('--no-full-content', action='store_true', help='Writer: do not queue content tasks')
+    parser.add_argument('--priority-keywords', metavar='FILE',
+                        help='Writer: keyword file; content tasks of matching items are leased first')
+    parser.add_argument('--source-weight', nargs='+', metavar='SCRAPER=WEIGHT',
+                        help='Writer: content task priority multipliers per scraper')
+    parser.add_argument('--exit-when-idle', action='store_true', help='Stop once no tasks or results are left')
+    parser.add_argument('--visibility-timeout', type=float, default=600,
+                        help='Seconds a leased task stays hidden from other workers (default: 600)')
+    parser.add_argument('--rate', type=float, help='Requests per second per host for this process')
+    parser.add_argument('--ignore-robots', action='store_true', help='Do not fetch or honor robots.txt')
+    parser.add_argument('--scrapers-dir', default='scrapers', help='Directory containing scraper modules')
+    parser.add_argument('--output-dir', default='scraped_data', help='Output directory')
+    parser.add_argument('--feeds-dir', default='feeds', help='Feeds output directory')
+    parser.add_argument('--master-file', default='master_scraped_data.json', help='Master file name')
+    parser.add_argument('--partitioned-store', action='store_true',
+                        help='Store items in monthly partitions instead of one master file')
+
+    args = parser.parse_args()
+
+    queue = SQLiteWorkQueue(args.queue, visibility_timeout=args.visibility_timeout, shared=args.shared_queue)
+    if args.command == 'status':
+        print(json.dumps(queue.stats(), indent=2))
+        return
+
+    priority_keywords = None
+    if args.priority_keywords:
+        from keyword_search import load_keywords_from_file
+        priority_keywords = load_keywords_from_file(args.priority_keywords)
+    source_weights = {}
+    for setting in args.source_weight or []:
+        scraper_name, _, weight = setting.partition('=')
+        source_weights[scraper_name] = float(weight)
+
+    orchestrator = ScraperOrchestrator(
+        args.scrapers_dir,
+        args.output_dir,
+        args.master_file,
+        args.feeds_dir,
+        partitioned=args.partitioned_store,
+        respect_robots=not args.ignore_robots,
+        rate_limit_config={'default_rate': args.rate} if args.rate else None,
+        priority_keywords=priority_keywords,
+        source_weights=source_weights
+    )
+    scrapers = orchestrator.discover_scrapers()
+
+    if args.command == 'enqueue':
+        if not (args.start_date and args.end_date):
+            parser.error('enqueue needs --start-date and --end-date')
+        if args.scraper and args.scraper not in scrapers:
+            print(f"Scraper '{args.scraper}' not found")
+            sys.exit(1)
+        names = [args.scraper] if args.scraper else list(scrapers)
+        queued = enqueue_run(queue, names, args.start_date, args.end_date, args.shard_by_month,
+                             use_discovery=not args.no_discovery)
+        print(f"Queued {queued} listing tasks")
+    elif args.command == 'worker':
+        Worker(orchestrator, queue, kinds=args.kinds).run(args.exit_when_idle)
+    else:
+        ResultWriter(orchestrator, queue, scrape_full_content=not args.no_full_content).run(args.exit_when_idle)
+
+
+if __name__ == "__main__":
+    main()
+
+
+# USAGE EXAMPLES:
+#
+# 1. Queue a run, then start one writer and as many workers as you like
+#    (workers on other hosts need --shared-queue on every process):
+#    python distributed_crawl.py enqueue --start-date 2025-01-01 --end-date 2025-06-30 --shard-by-month
+#    python distributed_crawl.py writer &
+#    python distributed_crawl.py worker --rate 0.5 &
+#    python distributed_crawl.py worker --rate 0.5 &
+#
+# 2. Dedicated content fetchers:
+#    python distributed_crawl.py worker --kinds content
+#
+# 3. Check progress:
+#    python distributed_crawl.py status
@@ -0,0 +1,74 @@
+"""
+Non-HTML Document Store
+Optional handler for links that point at PDFs, spreadsheets and other
+documents. The Fetcher hands such responses here instead of parsing them.
+"""
+
+import hashlib
+import json
+import mimetypes
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+class DocumentStore:
+    """Stream non-HTML responses to disk under their SHA-256, up to a size cap"""
+
+    def __init__(self, directory: str = "scraped_data/documents", max_bytes: int = 50 * 1024 * 1024,
+                 content_types: tuple = ('application/pdf',)):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.content_types = content_types  # Prefixes of the types worth keeping
+        self.index_path = self.directory / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def accepts(self, content_type: str) -> bool:
+        """Whether a document of this type should be saved"""
+        return any(content_type.startswith(prefix) for prefix in self.content_types)
+
+    def handle(self, url: str, response: Any, content_type: str) -> Optional[Dict[str, Any]]:
+        """Save a streamed response; returns its index entry, or None if skipped"""
+        if not self.accepts(content_type):
+            print(f"Skipping {content_type or 'unknown'} document: {url}")
+            return None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f".{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        print(f"Document larger than {self.max_bytes} bytes, not saved: {url}")
+                        return None
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            doc_id = digest.hexdigest()
+            extension = mimetypes.guess_extension(content_type) or '.bin'
+            path = self.directory / doc_id[:2] / f"{doc_id}{extension}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        entry = {
+            'url': url,
+            'sha256': doc_id,
+            'content_type': content_type,
+            'bytes': size,
+            'path': str(path.relative_to(self.directory)),
+            'saved_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+        print(f"Saved {content_type} document ({size} bytes): {url}")
+        return entry
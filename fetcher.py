@@ -0,0 +1,231 @@
+"""
+Shared Fetch Path
+Every scraper request goes through a Fetcher so that politeness rules
+are applied in one place instead of in each scraper
+"""
+
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Any, Callable
+
+from rate_limiter import (
+    HostRateLimiter, AdaptiveRateController,
+    get_shared_rate_limiter, get_shared_rate_controller, host_of
+)
+from retry_policy import RetryPolicy, CircuitBreaker, CircuitOpenError, get_shared_circuit_breaker
+from run_budget import BudgetExhaustedError
+
+
+class SkippedResponseError(Exception):
+    """Raised when a body is not downloaded because of its type or size"""
+
+
+class NotHTMLError(SkippedResponseError):
+    """The response is a document (PDF, video, ...) rather than a web page"""
+
+
+class ResponseTooLargeError(SkippedResponseError):
+    """The response is larger than the fetcher's size cap"""
+
+
+class DisallowedByRobotsError(SkippedResponseError):
+    """robots.txt does not let us fetch the URL"""
+
+
+class RobotsUnavailableError(Exception):
+    """The host's robots.txt couldn't be fetched yet; worth retrying later"""
+
+
+@dataclass(slots=True)
+class FetchedPage:
+    """An HTML body read through the size cap"""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+class Fetcher:
+    """HTTP GET wrapper that waits on the per-host rate limiter only when needed"""
+
+    HTML_TYPES = {'text/html', 'application/xhtml+xml'}
+
+    def __init__(self, session, rate_limiter: HostRateLimiter = None, timeout: float = 30,
+                 controller: AdaptiveRateController = None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None, max_bytes: int = 5 * 1024 * 1024,
+                 document_handler: Any = None):
+        self.session = session
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.timeout = timeout
+        self._controller = controller
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or get_shared_circuit_breaker()
+        self.max_bytes = max_bytes
+        self.document_handler = document_handler  # e.g. DocumentStore; None drops non-HTML bodies
+        self.headers = {}  # Per-request headers, set when sending through a shared transport
+        self.robots = None  # RobotsCache; None skips robots.txt checks
+        self.budget = None  # RunBudget shared by the run; None means unlimited
+        self.metrics = None  # Instrumentation of the current run; None records nothing
+        self.profiler = None  # profiling.Profiler with --profile; None profiles nothing
+
+    @property
+    def controller(self):
+        """Adaptive controller in use (the shared one unless one was passed in)"""
+        return self._controller or get_shared_rate_controller()
+
+    def set_min_interval(self, url: str, seconds: float):
+        """Translate a legacy per-request delay into a host rate"""
+        if seconds and seconds > 0:
+            self.rate_limiter.set_host_rate(url, 1.0 / seconds)
+            if self.controller:
+                self.controller.set_ceiling(url, 1.0 / seconds)
+
+    def use_transport(self, transport: Any):
+        """Send requests through a shared transport, keeping the headers this scraper set"""
+        import requests
+
+        if self.session is transport:
+            return
+        defaults = requests.utils.default_headers()
+        self.headers = {
+            name: value for name, value in getattr(self.session, 'headers', {}).items()
+            if defaults.get(name) != value
+        }
+        self.session = transport
+
+    def timed(self, stage: str):
+        """Context manager timing a scraper stage (e.g. parsing) into the run's metrics"""
+        return self.metrics.timer(stage) if self.metrics else nullcontext()
+
+    def in_thread(self, function: Callable) -> Callable:
+        """Wrap a function handed to a worker thread so --profile attributes it to the calling stage"""
+        return self.profiler.wrap(function) if self.profiler else function
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failure is worth queueing for a later run"""
+        return isinstance(error, (CircuitOpenError, BudgetExhaustedError, RobotsUnavailableError)) or \
+            self.retry_policy.is_retryable(error)
+
+    def _read_html(self, url: str, response: Any) -> FetchedPage:
+        """Check headers before reading, then read the body up to max_bytes"""
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in self.HTML_TYPES:
+            if self.document_handler:
+                self.document_handler.handle(url, response, content_type)
+            raise NotHTMLError(f"Not an HTML page ({content_type}): {url}")
+
+        return self._read_body(url, response)
+
+    def _read_body(self, url: str, response: Any) -> FetchedPage:
+        """Read a streamed body up to max_bytes"""
+        length = response.headers.get('Content-Length', '')
+        if length.isdigit() and int(length) > self.max_bytes:
+            raise ResponseTooLargeError(f"Page of {length} bytes exceeds {self.max_bytes}: {url}")
+
+        # Content-Length may be missing or wrong, so count while reading
+        chunks = []
+        size = 0
+        try:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise ResponseTooLargeError(f"Page exceeds {self.max_bytes} bytes: {url}")
+                chunks.append(chunk)
+        finally:
+            if self.budget:
+                self.budget.record_bytes(size)
+            if self.metrics:
+                self.metrics.observe('fetch_bytes', size, host=host_of(url))
+
+        return FetchedPage(response.url, response.status_code, dict(response.headers), b''.join(chunks))
+
+    def _attempt(self, url: str, timeout: float, reader: Any = None, **kwargs) -> Any:
+        """Send one request, reporting its outcome to the adaptive controller"""
+        controller = self.controller
+        metrics = self.metrics
+        host = host_of(url)
+        with controller.slot(url) if controller else nullcontext():
+            waiting = time.monotonic()
+            self.rate_limiter.acquire(url)
+            started = time.monotonic()
+            if self.headers:
+                kwargs['headers'] = {**self.headers, **kwargs.get('headers', {})}
+            try:
+                response = self.session.get(url, timeout=timeout, **kwargs)
+            except Exception:
+                if controller:
+                    controller.record(url, None, time.monotonic() - started)
+                if metrics:
+                    metrics.count('requests_total', host=host, status='error')
+                raise
+
+            latency = time.monotonic() - started
+            if controller:
+                controller.record(url, response.status_code, latency, response.headers.get('Retry-After'))
+            if metrics:
+                metrics.observe('rate_limit_wait_seconds', started - waiting, host=host)
+                metrics.observe('fetch_seconds', latency, host=host)
+                metrics.count('requests_total', host=host, status=response.status_code)
+
+        if not kwargs.get('stream'):
+            if self.budget:
+                self.budget.record_bytes(len(response.content))
+            if metrics:
+                metrics.observe('fetch_bytes', len(response.content), host=host)
+
+        try:
+            response.raise_for_status()
+            return reader(url, response) if reader else response
+        finally:
+            if kwargs.get('stream'):
+                response.close()
+
+    def get_html(self, url: str, **kwargs) -> FetchedPage:
+        """
+        Fetch a web page as a stream, aborting non-HTML or oversized bodies
+
+        Non-HTML responses are passed to the document handler (if any) and
+        raise NotHTMLError; bodies over max_bytes raise ResponseTooLargeError.
+        """
+        return self._fetch(url, self._read_html, stream=True, **kwargs)
+
+    def get_limited(self, url: str, **kwargs) -> FetchedPage:
+        """Fetch a body of any type as a stream, aborting it past max_bytes like get_html"""
+        return self._fetch(url, self._read_body, stream=True, **kwargs)
+
+    def get(self, url: str, **kwargs) -> Any:
+        """Fetch a URL, retrying transient failures; raises for HTTP errors, open circuits and robots.txt"""
+        return self._fetch(url, None, **kwargs)
+
+    def _fetch(self, url: str, reader: Any, **kwargs) -> Any:
+        """Retry loop shared by get and get_html"""
+        timeout = kwargs.pop('timeout', self.timeout)
+        if self.robots and not self.robots.allowed(url):
+            if self.robots.unreachable(url):
+                raise RobotsUnavailableError(f"robots.txt of {host_of(url)} could not be fetched: {url}")
+            raise DisallowedByRobotsError(f"Disallowed by robots.txt: {url}")
+
+        for attempt in range(self.retry_policy.max_attempts):
+            if self.budget:
+                self.budget.acquire(url)  # Retries count against the request budget too
+            self.circuit_breaker.check(url)
+            try:
+                response = self._attempt(url, timeout, reader, **kwargs)
+            except Exception as e:
+                if not self.retry_policy.is_retryable(e):
+                    # Not a sign of the host being down (e.g. a 404)
+                    self.circuit_breaker.record_success(url)
+                    raise
+
+                self.circuit_breaker.record_failure(url)
+                if attempt + 1 >= self.retry_policy.max_attempts:
+                    raise
+
+                wait = self.retry_policy.backoff(attempt)
+                print(f"Retrying {url} in {wait:.1f}s after: {e}")
+                time.sleep(wait)
+                continue
+
+            self.circuit_breaker.record_success(url)
+            return response
@@ -0,0 +1,198 @@
+"""
+Run Instrumentation
+Lightweight timers, counters, gauges and histograms for the hot paths:
+stages of a scraper run, each fetch (latency, body size, rate-limit wait),
+master file writes and feed generation. Metrics carry labels (stage, host, ...) and
+fixed buckets, so recording is a dict lookup and a bisect under a lock.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple
+
+# Bucket upper bounds, picked by metric name suffix
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> LabelKey:
+    return name, tuple(sorted((label, str(value)) for label, value in labels.items()))
+
+
+def format_key(key: LabelKey) -> str:
+    """name{label=value,...}"""
+    name, labels = key
+    if not labels:
+        return name
+    return name + '{' + ','.join(f"{label}={value}" for label, value in labels) + '}'
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max"""
+
+    __slots__ = ('bounds', 'buckets', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'Histogram'):
+        for i, count in enumerate(other.buckets):
+            self.buckets[i] += count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def quantile(self, q: float) -> float:
+        """Estimate, interpolating linearly inside the bucket that holds the q-th value"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                # Clamped to the observed range, so a lone sample reports itself
+                lower = max(self.bounds[i - 1], self.min) if i > 0 else self.min
+                upper = min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'max': round(self.max, 6) if self.max is not None else 0.0
+        }
+
+
+class Instrumentation:
+    """Labeled counters, gauges and histograms, safe to share between threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[LabelKey, float] = {}
+        self.gauges: Dict[LabelKey, float] = {}
+        self.histograms: Dict[LabelKey, Histogram] = {}
+
+    @staticmethod
+    def _bounds(name: str) -> Tuple[float, ...]:
+        return BYTES_BUCKETS if name.endswith('_bytes') else SECONDS_BUCKETS
+
+    def count(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, **labels):
+        """Set a value that can go down (file sizes, last run duration)"""
+        key = _key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self._bounds(name))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        """Time a block into stage_seconds{stage=...}"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('stage_seconds', time.perf_counter() - started, stage=stage, **labels)
+
+    def merge(self, other: 'Instrumentation', **labels):
+        """Add another registry's metrics, tagging them with extra labels (e.g. scraper=...)"""
+        with other._lock:
+            counters = list(other.counters.items())
+            gauges = list(other.gauges.items())
+            histograms = list(other.histograms.items())
+        with self._lock:
+            for (name, own), value in counters:
+                key = _key(name, {**dict(own), **labels})
+                self.counters[key] = self.counters.get(key, 0) + value
+            for (name, own), value in gauges:
+                self.gauges[_key(name, {**dict(own), **labels})] = value
+            for (name, own), histogram in histograms:
+                key = _key(name, {**dict(own), **labels})
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(histogram.bounds)
+                self.histograms[key].merge(histogram)
+
+    def snapshot(self) -> Tuple[Dict[LabelKey, float], Dict[LabelKey, float], Dict[LabelKey, Histogram]]:
+        """Consistent copies of the counters, gauges and histograms, for exporters"""
+        with self._lock:
+            histograms = {}
+            for key, histogram in self.histograms.items():
+                histograms[key] = Histogram(histogram.bounds)
+                histograms[key].merge(histogram)
+            return dict(self.counters), dict(self.gauges), histograms
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot: stage timings, per-host fetch stats, counters and gauges"""
+        counters, gauges, histograms = self.snapshot()
+        histograms = list(histograms.items())
+
+        stages = {}
+        fetches = {}
+        for (name, labels), histogram in sorted(histograms, key=lambda item: format_key(item[0])):
+            label_map = dict(labels)
+            if name == 'stage_seconds':
+                # Extra labels (e.g. scraper=... in a merged registry) keep stages apart
+                stage = label_map.pop('stage')
+                stages[format_key((stage, tuple(label_map.items())))] = histogram.to_dict()
+            elif name.startswith('fetch_') or name == 'rate_limit_wait_seconds':
+                host = label_map.pop('host', '')
+                fetches.setdefault(format_key((host, tuple(label_map.items()))), {})[name] = histogram.to_dict()
+        return {
+            'stages': stages,
+            'fetches': fetches,
+            'counters': {format_key(key): value for key, value in sorted(counters.items(), key=lambda item: format_key(item[0]))},
+            'gauges': {format_key(key): value for key, value in sorted(gauges.items(), key=lambda item: format_key(item[0]))}
+        }
+
+    def report_lines(self, indent: str = "  ") -> List[str]:
+        """Stage and fetch timings as text report lines, slowest stages first"""
+        summary = self.summary()
+        lines = []
+        if summary['stages']:
+            lines.append(f"{indent}Stage timings (total / count / p50 / p95 / max, seconds):")
+            for stage, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+                lines.append(f"{indent}  - {stage}: {stats['total']:.3f} / {stats['count']} / "
+                             f"{stats['p50']:.3f} / {stats['p95']:.3f} / {stats['max']:.3f}")
+        for host, stats in summary['fetches'].items():
+            latency = stats.get('fetch_seconds')
+            if not latency:
+                continue
+            size = stats.get('fetch_bytes', {})
+            wait = stats.get('rate_limit_wait_seconds', {})
+            lines.append(f"{indent}Fetches from {host}: {latency['count']} requests, latency p50 {latency['p50']:.3f}s "
+                         f"p95 {latency['p95']:.3f}s, {size.get('total', 0) / 1024:.0f} KB read, "
+                         f"{wait.get('total', 0):.1f}s waiting on the rate limit")
+        return lines
@@ -5,6 +5,10 @@ from pathlib import Path
 from typing import Dict, List, Any, Set
 import re
 import argparse
+from contextlib import nullcontext
+
+from raw_store import RawDataStore
+from partitioned_store import open_store_for_master
 
 class KeywordSearcher:
     """Search and filter master JSON data by keywords"""
@@ -12,6 +16,7 @@ class KeywordSearcher:
     def __init__(self, master_file: str = "scraped_data/master_scraped_data.json"):
         self.master_file = Path(master_file)
         self.master_data = None
+        self.raw_store = RawDataStore(self.master_file.parent / "raw")
         self.search_results = {
             'search_info': {
                 'searched_at': datetime.now().isoformat(),
@@ -25,8 +30,13 @@ class KeywordSearcher:
             'results_by_scraper': {}
         }
         
-    def load_master_data(self) -> bool:
-        """Load the master JSON file"""
+    def load_master_data(self, start_date: str = None, end_date: str = None) -> bool:
+        """
+        Load the master JSON file
+        
+        With partitioned storage only the monthly partitions overlapping
+        start_date..end_date are read, so cold history is skipped.
+        """
         if not self.master_file.exists():
             print(f"Error: Master file not found: {self.master_file}")
             return False
@@ -34,6 +44,15 @@ class KeywordSearcher:
         try:
             with open(self.master_file, 'r', encoding='utf-8') as f:
                 self.master_data = json.load(f)
+            
+            store = open_store_for_master(self.master_data, self.master_file)
+            if store is not None:
+                for scraper_name, scraper_data in self.master_data.get('results_by_scraper', {}).items():
+                    items = store.load(scraper_name, start_date, end_date)
+                    scraper_data['announcements'] = items['announcements']
+                    scraper_data['full_content'] = items['full_content']
+                print(f"Loaded partitions for {start_date or 'beginning'} to {end_date or 'now'}")
+            
             print(f"Loaded master data from: {self.master_file}")
             return True
         except Exception as e:
@@ -83,6 +102,10 @@ class KeywordSearcher:
             if '.' in field:
                 parts = field.split('.')
                 field_value = item
+                if parts[0] == 'raw_data':
+                    # Raw payloads are loaded from the side store only when searched
+                    field_value = self.raw_store.resolve(item) or {}
+                    parts = parts[1:]
                 for part in parts:
                     if isinstance(field_value, dict):
                         field_value = field_value.get(part, '')
@@ -406,9 +429,29 @@ def main():
     parser.add_argument('--report-only', action='store_true',
                        help='Only generate report, no output files')
     parser.add_argument('--report-file', help='Save report to file')
+    parser.add_argument('--start-date', help='Only search partitions from this date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='Only search partitions up to this date (YYYY-MM-DD)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Profile loading, searching and saving with cProfile; .prof files and summary.txt '
+                            'go to profiles/ next to --output-master')
+    parser.add_argument('--profile-memory', action='store_true',
+                       help='With --profile, also trace allocations per phase with tracemalloc (slow)')
+    parser.add_argument('--profile-top', type=int, default=25,
+                       help='Functions and allocation sites listed per phase in summary.txt (default: 25)')
     
     args = parser.parse_args()
     
+    profiler = None
+    if args.profile or args.profile_memory:
+        import atexit
+        from profiling import Profiler
+        
+        profiler = Profiler(Path(args.output_master).parent, args.profile_top, memory=args.profile_memory)
+        atexit.register(profiler.write)
+    
+    def profiled(phase: str):
+        return profiler.section(phase) if profiler else nullcontext()
+    
     # Get keywords from file or command line
     keywords = []
     if args.keywords_file:
@@ -428,7 +471,9 @@ def main():
     searcher = KeywordSearcher(args.master_file)
     
     # Load master data
-    if not searcher.load_master_data():
+    with profiled('load_master_data'):
+        loaded = searcher.load_master_data(args.start_date, args.end_date)
+    if not loaded:
         sys.exit(1)
     
     print(f"\nSearching for {len(keywords)} keywords")
@@ -441,15 +486,17 @@ def main():
     print()
     
     # Perform search
-    results = searcher.search_announcements(
-        keywords=keywords,
-        fields=args.fields,
-        mode=args.mode,
-        case_sensitive=args.case_sensitive
-    )
+    with profiled('search'):
+        results = searcher.search_announcements(
+            keywords=keywords,
+            fields=args.fields,
+            mode=args.mode,
+            case_sensitive=args.case_sensitive
+        )
     
     # Generate report
-    report = searcher.generate_report()
+    with profiled('report'):
+        report = searcher.generate_report()
     print("\n" + report)
     
     # Save report if requested
@@ -463,14 +510,16 @@ def main():
     # Save outputs unless report-only mode
     if not args.report_only:
         # Save keyword master
-        searcher.save_keyword_master(args.output_master)
+        with profiled('save_keyword_master'):
+            searcher.save_keyword_master(args.output_master)
         
         # Generate and save feed
-        searcher.generate_keyword_feed(
-            args.output_feed,
-            max_items=args.max_feed_items,
-            sort_by=args.sort_by
-        )
+        with profiled('keyword_feed'):
+            searcher.generate_keyword_feed(
+                args.output_feed,
+                max_items=args.max_feed_items,
+                sort_by=args.sort_by
+            )
         
         print(f"\n✓ Keyword master created: {args.output_master}")
         print(f"✓ Keyword feed created: {args.output_feed}")
@@ -0,0 +1,149 @@
+"""
+Prometheus Metrics Export
+Renders the orchestrator's run instrumentation in the Prometheus text
+exposition format. Cron runs write it for node-exporter's textfile
+collector; daemon mode can also serve it from a local HTTP port, so
+slowdowns and throughput drops can be alerted on.
+"""
+
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from instrumentation import Instrumentation, LabelKey
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+HELP = {
+    'requests_total': 'HTTP requests sent, by host and status code (error: no response)',
+    'fetch_seconds': 'HTTP response latency per host',
+    'fetch_bytes': 'Downloaded body size per host',
+    'rate_limit_wait_seconds': 'Time a request waited on the per-host rate limit',
+    'stage_seconds': 'Duration of run stages (listing, full content, master file, feeds)',
+    'items_found_total': 'Announcements returned by listing pages',
+    'items_new_total': 'Announcements stored as new',
+    'items_duplicate_total': 'Announcements skipped as already stored',
+    'items_filtered_total': 'Announcements dropped by the content filter, by reason',
+    'content_fetched_total': 'Full content pages stored',
+    'errors_total': 'Errors reported by scraper runs',
+    'last_run_duration_seconds': 'Wall time of the last run of a scraper',
+    'last_run_timestamp_seconds': 'Unix time the last run of a scraper finished',
+    'last_run_success': '1 if the last run of a scraper had no errors',
+    'master_file_bytes': 'Size of the master JSON file',
+    'stored_items': 'Items stored in the master file, by kind',
+    'run_duration_seconds': 'Wall time since the run started (uptime in daemon mode)'
+}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{label}="{_escape(value)}"' for label, value in pairs) + '}'
+
+
+def _group(samples: Dict[LabelKey, Any]) -> Dict[str, List[Tuple[Tuple[Tuple[str, str], ...], Any]]]:
+    """Samples by metric name, in a stable order"""
+    grouped = {}
+    for (name, labels), value in sorted(samples.items()):
+        grouped.setdefault(name, []).append((labels, value))
+    return grouped
+
+
+def render(metrics: Instrumentation, prefix: str = 'scraper') -> str:
+    """All metrics of a registry in the Prometheus text format"""
+    counters, gauges, histograms = metrics.snapshot()
+    lines = []
+
+    def header(name: str, kind: str) -> str:
+        full_name = f"{prefix}_{name}" if prefix else name
+        lines.append(f"# HELP {full_name} {HELP.get(name, name.replace('_', ' '))}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        return full_name
+
+    for name, samples in _group(counters).items():
+        full_name = header(name, 'counter')
+        for labels, value in samples:
+            lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+
+    for name, samples in _group(gauges).items():
+        full_name = header(name, 'gauge')
+        for labels, value in samples:
+            lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+
+    for name, samples in _group(histograms).items():
+        full_name = header(name, 'histogram')
+        for labels, histogram in samples:
+            cumulative = 0
+            for bound, count in zip(list(histogram.bounds) + [math.inf], histogram.buckets):
+                cumulative += count
+                lines.append(f"{full_name}_bucket{_labels(labels, (('le', _number(bound)),))} {cumulative}")
+            lines.append(f"{full_name}_sum{_labels(labels)} {_number(histogram.sum)}")
+            lines.append(f"{full_name}_count{_labels(labels)} {histogram.count}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(metrics: Instrumentation, path: str, prefix: str = 'scraper') -> str:
+    """Write the metrics atomically, so the textfile collector never reads half a file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')  # Not *.prom, so the collector skips it
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render(metrics, prefix))
+    tmp_path.replace(path)
+    return str(path)
+
+
+class MetricsServer:
+    """Serve /metrics from a background thread"""
+
+    def __init__(self, metrics: Instrumentation, port: int, host: str = '127.0.0.1', prefix: str = 'scraper'):
+        self.metrics = metrics
+        self.port = port
+        self.host = host
+        self.prefix = prefix
+        self._server = None
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = render(server.metrics, server.prefix).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would drown the run output
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True).start()
+        print(f"Serving metrics on http://{self.host}:{self._server.server_port}/metrics")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
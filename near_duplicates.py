@@ -0,0 +1,150 @@
+"""
+Near-Duplicate Detection
+SimHash fingerprints with a banded LSH index for finding the same story
+published by several sources under different URLs
+"""
+
+import hashlib
+import re
+from typing import Dict, List, Optional, Iterable
+
+FINGERPRINT_BITS = 64
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _token_hash(token: str) -> int:
+    """Stable 64-bit hash of a token (Python's hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash of text
+
+    Word shingles are used for long text; short text such as titles falls
+    back to single words so a handful of tokens still produce a signature.
+    """
+    tokens = _TOKEN_RE.findall((text or '').lower())
+    if not tokens:
+        return 0
+
+    if len(tokens) < shingle_size * 4:
+        shingle_size = 1
+
+    weights = {}
+    for i in range(len(tokens) - shingle_size + 1):
+        shingle = ' '.join(tokens[i:i + shingle_size])
+        weights[shingle] = weights.get(shingle, 0) + 1
+
+    vector = [0] * FINGERPRINT_BITS
+    for shingle, weight in weights.items():
+        h = _token_hash(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            if h >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if vector[bit] > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def fingerprint_to_hex(fingerprint: int) -> str:
+    """Serialize a fingerprint for the master file"""
+    return f"{fingerprint:016x}"
+
+
+def fingerprint_from_hex(value: str) -> Optional[int]:
+    """Parse a serialized fingerprint (None if missing or malformed)"""
+    if not value:
+        return None
+    try:
+        return int(value, 16)
+    except (TypeError, ValueError):
+        return None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """
+    Banded LSH index over SimHash fingerprints
+
+    The fingerprint is split into max_distance + 1 bands, so by the pigeonhole
+    principle any two fingerprints within max_distance bits share at least one
+    identical band. Lookups only compare against items in matching buckets.
+    """
+
+    def __init__(self, max_distance: int = 6):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self.buckets = [{} for _ in range(self.bands)]
+        self.fingerprints = {}
+        self._parents = {}
+
+    def _band_keys(self, fingerprint: int) -> Iterable[int]:
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield (fingerprint >> (band * self.band_bits)) & mask
+
+    def query(self, fingerprint: int) -> List[str]:
+        """Return ids of indexed items within max_distance of fingerprint"""
+        candidates = set()
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        return [
+            item_id for item_id in candidates
+            if hamming_distance(self.fingerprints[item_id], fingerprint) <= self.max_distance
+        ]
+
+    def add(self, item_id: str, fingerprint: int) -> List[str]:
+        """Index an item, clustering it with any near duplicates; returns the matches"""
+        if not fingerprint:
+            return []  # Empty text carries no signal
+
+        matches = [match for match in self.query(fingerprint) if match != item_id]
+
+        self.fingerprints[item_id] = fingerprint
+        self._parents.setdefault(item_id, item_id)
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            self.buckets[band].setdefault(key, []).append(item_id)
+
+        for match in matches:
+            self._union(item_id, match)
+
+        return matches
+
+    def _find(self, item_id: str) -> str:
+        root = item_id
+        while self._parents[root] != root:
+            root = self._parents[root]
+        # Path compression
+        while self._parents[item_id] != root:
+            self._parents[item_id], item_id = root, self._parents[item_id]
+        return root
+
+    def _union(self, a: str, b: str):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parents[root_b] = root_a
+
+    def cluster_of(self, item_id: str) -> Optional[str]:
+        """Return the cluster key of an indexed item"""
+        if item_id not in self._parents:
+            return None
+        return self._find(item_id)
+
+    def clusters(self) -> Dict[str, List[str]]:
+        """Return all clusters with more than one member"""
+        groups = {}
+        for item_id in self._parents:
+            groups.setdefault(self._find(item_id), []).append(item_id)
+        return {key: members for key, members in groups.items() if len(members) > 1}
@@ -0,0 +1,268 @@
+"""
+Partitioned Master Store
+Keeps announcements and full content in per-scraper monthly partitions.
+Recent months stay as plain JSON (hot tier); older months are gzip-compressed
+into a cold tier. Readers only open the partitions that overlap their date range.
+"""
+
+import gzip
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterable, Callable
+
+UNDATED = 'undated'
+DATE_FIELDS = {
+    'announcements': 'date',
+    'full_content': 'date_published'
+}
+_DATE_FORMATS = ['%B %d, %Y', '%b %d, %Y', '%m/%d/%Y']
+
+
+def get_item_date(item: Dict[str, Any], date_field: str = 'date') -> Optional[str]:
+    """Return the YYYY-MM-DD day of a record's date field, or None if it has no full date"""
+    value = str(item.get(date_field) or '').strip()
+
+    # ISO dates and datetimes (2025-09-17, 2025-09-17T10:00:00Z)
+    if len(value) >= 10 and value[:4].isdigit() and value[4] == '-' and value[7] == '-' and value[8:10].isdigit():
+        return value[:10]
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+
+    return None
+
+
+def get_item_month(item: Dict[str, Any], date_field: str = 'date') -> str:
+    """Return the YYYY-MM month of a record's date field, or 'undated'"""
+    value = str(item.get(date_field) or '').strip()
+
+    # ISO dates, datetimes and months (2025-09-17, 2025-09-17T10:00:00Z, 2025-09)
+    if len(value) >= 7 and value[:4].isdigit() and value[4] == '-' and value[5:7].isdigit():
+        return value[:7]
+
+    date = get_item_date(item, date_field)
+    return date[:7] if date else UNDATED
+
+
+class PartitionedMasterStore:
+    """Month-partitioned storage for results_by_scraper items with hot/cold tiers"""
+
+    def __init__(self, directory: str = "scraped_data/partitions", hot_months: int = 3):
+        self.directory = Path(directory)
+        self.hot_months = hot_months
+        self.manifest_path = self.directory / "_manifest.json"
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load partition bookkeeping: tier and item counts per scraper/month"""
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load partition manifest, rebuilding: {e}")
+            return self._rebuild_manifest()
+
+    def _rebuild_manifest(self) -> Dict[str, Any]:
+        """Reconstruct the manifest by scanning partition files"""
+        manifest = {}
+        if not self.directory.exists():
+            return manifest
+
+        for scraper_dir in self.directory.iterdir():
+            if not scraper_dir.is_dir():
+                continue
+            for tier, pattern in (('hot', '*.json'), ('cold', 'cold/*.json.gz')):
+                for path in scraper_dir.glob(pattern):
+                    month = path.name.split('.')[0]
+                    partition = self._read(path)
+                    manifest.setdefault(scraper_dir.name, {})[month] = {
+                        'tier': tier,
+                        'announcements': len(partition.get('announcements', [])),
+                        'full_content': len(partition.get('full_content', []))
+                    }
+        return manifest
+
+    def _save_manifest(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write(self.manifest_path, self.manifest)
+
+    def _path(self, scraper_name: str, month: str, tier: str) -> Path:
+        if tier == 'cold':
+            return self.directory / scraper_name / "cold" / f"{month}.json.gz"
+        return self.directory / scraper_name / f"{month}.json"
+
+    def _read(self, path: Path) -> Dict[str, Any]:
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write(self, path: Path, data: Dict[str, Any]):
+        """Write atomically so an interrupted run never leaves a half-written partition"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+    def _is_hot(self, month: str, today: datetime = None) -> bool:
+        """Undated items and the last hot_months months stay uncompressed"""
+        if month == UNDATED:
+            return True
+        today = today or datetime.now()
+        year, mon = int(month[:4]), int(month[5:7])
+        age = (today.year - year) * 12 + (today.month - mon)
+        return age < self.hot_months
+
+    @staticmethod
+    def month_in_range(month: str, start_date: str = None, end_date: str = None) -> bool:
+        """Check whether a partition can hold items in [start_date, end_date]"""
+        if month == UNDATED:
+            return True  # Unknown dates can't be pruned safely
+        if start_date and month < start_date[:7]:
+            return False
+        if end_date and month > end_date[:7]:
+            return False
+        return True
+
+    def scrapers(self) -> List[str]:
+        return list(self.manifest.keys())
+
+    def partitions(self, scraper_name: str, start_date: str = None, end_date: str = None) -> List[str]:
+        """List the months of a scraper that overlap a date range"""
+        return sorted(
+            month for month in self.manifest.get(scraper_name, {})
+            if self.month_in_range(month, start_date, end_date)
+        )
+
+    def read_partition(self, scraper_name: str, month: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Load one partition from whichever tier holds it"""
+        info = self.manifest.get(scraper_name, {}).get(month)
+        if not info:
+            return {'announcements': [], 'full_content': []}
+
+        path = self._path(scraper_name, month, info['tier'])
+        try:
+            return self._read(path)
+        except Exception as e:
+            print(f"Warning: Could not read partition {path}: {e}")
+            return {'announcements': [], 'full_content': []}
+
+    def _write_partition(self, scraper_name: str, month: str, data: Dict[str, Any], today: datetime = None):
+        tier = 'hot' if self._is_hot(month, today) else 'cold'
+        previous = self.manifest.get(scraper_name, {}).get(month)
+
+        self._write(self._path(scraper_name, month, tier), data)
+        if previous and previous['tier'] != tier:
+            self._path(scraper_name, month, previous['tier']).unlink(missing_ok=True)
+
+        self.manifest.setdefault(scraper_name, {})[month] = {
+            'tier': tier,
+            'announcements': len(data.get('announcements', [])),
+            'full_content': len(data.get('full_content', []))
+        }
+
+    def append(self, scraper_name: str, announcements: Iterable[Dict[str, Any]] = (),
+               full_content: Iterable[Dict[str, Any]] = ()) -> int:
+        """Add items to their monthly partitions; returns the number of partitions touched"""
+        grouped = {}
+        for key, items in (('announcements', announcements), ('full_content', full_content)):
+            for item in items:
+                month = get_item_month(item, DATE_FIELDS[key])
+                grouped.setdefault(month, {'announcements': [], 'full_content': []})[key].append(item)
+
+        for month, new_items in grouped.items():
+            partition = self.read_partition(scraper_name, month)
+            for key in DATE_FIELDS:
+                partition.setdefault(key, []).extend(new_items[key])
+            self._write_partition(scraper_name, month, partition)
+
+        if grouped:
+            self._save_manifest()
+        return len(grouped)
+
+    def replace(self, scraper_name: str, key: str, items: List[Dict[str, Any]],
+                merge: Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Swap stored items for merge(stored, new) by URL; returns the items nothing was stored for"""
+        pending = {item['url']: item for item in items if item.get('url')}
+        stored_months = self.partitions(scraper_name)
+
+        # An updated item usually sits in its own month, so look there before the rest
+        hinted = {get_item_month(item, DATE_FIELDS[key]) for item in pending.values()}
+        months = [month for month in stored_months if month in hinted]
+        months += [month for month in stored_months if month not in hinted]
+
+        touched = 0
+        for month in months:
+            if not pending:
+                break
+            partition = self.read_partition(scraper_name, month)
+            stored_items = partition.get(key, [])
+            changed = False
+            for i, stored in enumerate(stored_items):
+                new = pending.pop(stored.get('url'), None)
+                if new is not None:
+                    stored_items[i] = merge(stored, new)
+                    changed = True
+            if changed:
+                self._write_partition(scraper_name, month, partition)
+                touched += 1
+
+        if touched:
+            self._save_manifest()
+        return [item for item in items if not item.get('url') or item['url'] in pending]
+
+    def load(self, scraper_name: str, start_date: str = None, end_date: str = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Load a scraper's items from the partitions overlapping a date range"""
+        result = {'announcements': [], 'full_content': []}
+        for month in self.partitions(scraper_name, start_date, end_date):
+            partition = self.read_partition(scraper_name, month)
+            for key in DATE_FIELDS:
+                result[key].extend(partition.get(key, []))
+        return result
+
+    def counts(self, scraper_name: str) -> Dict[str, int]:
+        """Total items stored for a scraper, from the manifest alone"""
+        totals = {'announcements': 0, 'full_content': 0}
+        for info in self.manifest.get(scraper_name, {}).values():
+            for key in totals:
+                totals[key] += info.get(key, 0)
+        return totals
+
+    def compact(self, today: datetime = None) -> int:
+        """Move partitions that aged out of the hot window into the cold tier"""
+        moved = 0
+        for scraper_name, months in self.manifest.items():
+            for month, info in list(months.items()):
+                if info['tier'] == 'hot' and not self._is_hot(month, today):
+                    data = self.read_partition(scraper_name, month)
+                    self._write_partition(scraper_name, month, data, today)
+                    moved += 1
+
+        if moved:
+            self._save_manifest()
+            print(f"Moved {moved} partitions to the cold tier")
+        return moved
+
+    def tier_summary(self) -> Dict[str, int]:
+        """Count partitions per tier"""
+        summary = {'hot': 0, 'cold': 0}
+        for months in self.manifest.values():
+            for info in months.values():
+                summary[info['tier']] += 1
+        return summary
+
+
+def open_store_for_master(master_data: Dict[str, Any], master_file_path: Path) -> Optional[PartitionedMasterStore]:
+    """Return the partition store a master file points at, if it uses one"""
+    storage = master_data.get('storage', {})
+    if storage.get('layout') != 'partitioned':
+        return None
+    directory = Path(master_file_path).parent / storage.get('directory', 'partitions')
+    return PartitionedMasterStore(directory, storage.get('hot_months', 3))
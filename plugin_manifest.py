@@ -0,0 +1,193 @@
+"""
+Scraper Plugin Manifest
+Finds scraper classes by reading the source of each *_scraper.py file
+instead of importing it, and caches the result keyed by file mtime and
+hash. Modules are only imported, and scrapers only instantiated, when a
+scraper is first used.
+"""
+
+import ast
+import hashlib
+import importlib.util
+import json
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, List, Any, Callable, Iterator
+
+INTERFACE_NAME = 'BaseScraperInterface'
+
+
+def find_scraper_classes(source: str) -> List[str]:
+    """Names of the classes in a module that derive (possibly indirectly) from BaseScraperInterface"""
+    tree = ast.parse(source)
+    classes = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name != INTERFACE_NAME:
+            bases = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    bases.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    bases.append(base.attr)
+            classes[node.name] = bases
+
+    def is_scraper(name: str, seen: set) -> bool:
+        if name in seen:
+            return False
+        seen.add(name)
+        return any(base == INTERFACE_NAME or (base in classes and is_scraper(base, seen))
+                   for base in classes.get(name, []))
+
+    return sorted(name for name in classes if is_scraper(name, set()))
+
+
+class PluginManifest:
+    """Scraper names and classes of a scrapers directory, cached on disk"""
+
+    VERSION = 1
+
+    def __init__(self, scrapers_directory: str, manifest_path: str):
+        self.scrapers_directory = Path(scrapers_directory)
+        self.manifest_path = Path(manifest_path)
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load scraper manifest: {e}")
+            return {}
+        if manifest.get('version') != self.VERSION:
+            return {}
+        return manifest.get('files', {})
+
+    def _save(self, files: Dict[str, Any]):
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'directory': str(self.scrapers_directory.absolute()),
+                           'files': files}, f, indent=2)
+            tmp_path.replace(self.manifest_path)
+        except OSError as e:
+            print(f"Warning: Could not save scraper manifest: {e}")
+
+    def scan(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Map scraper name (file stem) to its file and class, without importing
+
+        Unchanged files (same mtime and size) are taken from the manifest; a
+        changed mtime with the same content hash only refreshes the mtime.
+        """
+        cached = self._load()
+        files = {}
+        changed = False
+
+        for scraper_file in sorted(self.scrapers_directory.glob("*_scraper.py")):
+            stat = scraper_file.stat()
+            entry = cached.get(scraper_file.name)
+
+            if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                data = scraper_file.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if not entry or entry['sha256'] != digest:
+                    try:
+                        classes = find_scraper_classes(data.decode('utf-8'))
+                    except (SyntaxError, UnicodeDecodeError) as e:
+                        print(f"Error reading scraper {scraper_file}: {e}")
+                        classes = []
+                    entry = {'sha256': digest, 'classes': classes}
+                entry = {**entry, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+                changed = True
+
+            files[scraper_file.name] = entry
+
+        if changed or set(files) != set(cached):
+            self._save(files)
+
+        scrapers = {}
+        for file_name, entry in files.items():
+            if entry['classes']:
+                # The last class wins, as when every class of the module was instantiated in dir() order
+                scrapers[Path(file_name).stem] = {
+                    'file': str(self.scrapers_directory / file_name),
+                    'class': entry['classes'][-1]
+                }
+        return scrapers
+
+
+class LazyScraperRegistry(Mapping):
+    """
+    Read-only mapping of scraper name to scraper instance
+
+    Membership and listing come from the manifest; a scraper's module is
+    imported and its class instantiated on first lookup.
+    """
+
+    def __init__(self, entries: Dict[str, Dict[str, Any]], scrapers_directory: str,
+                 configure: Callable[[Any], None] = None):
+        self.entries = entries
+        self.scrapers_directory = Path(scrapers_directory)
+        self.configure = configure
+        self._instances = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def keys(self):
+        return self.entries.keys()
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self.entries:
+            raise KeyError(name)
+
+        entry = self.entries[name]
+        try:
+            scraper = self._load(name, entry)
+        except Exception as e:
+            raise KeyError(f"Error loading scraper {name}: {e}")
+
+        if self.configure:
+            self.configure(scraper)
+        self._instances[name] = scraper
+        print(f"Loaded scraper: {name}")
+        return scraper
+
+    def _load(self, name: str, entry: Dict[str, Any]) -> Any:
+        """Import the scraper module and instantiate its class"""
+        # Scrapers import their siblings and base_scraper by bare name
+        scrapers_path_str = str(self.scrapers_directory.absolute())
+        added = scrapers_path_str not in sys.path
+        if added:
+            sys.path.insert(0, scrapers_path_str)
+
+        try:
+            module = sys.modules.get(name)
+            if module is None or getattr(module, '__file__', None) != entry['file']:
+                spec = importlib.util.spec_from_file_location(name, entry['file'])
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[name] = module
+                try:
+                    spec.loader.exec_module(module)
+                except Exception:
+                    del sys.modules[name]
+                    raise
+        finally:
+            if added and scrapers_path_str in sys.path:
+                sys.path.remove(scrapers_path_str)
+
+        scraper = getattr(module, entry['class'])()
+        if not hasattr(scraper, 'get_scraper_info'):
+            raise TypeError(f"{entry['class']} has no get_scraper_info")
+        return scraper
@@ -0,0 +1,183 @@
+"""
+Profiling Hooks
+Per-section cProfile (and optional tracemalloc) capture for --profile.
+Each scraper phase (e.g. fda_scraper.full_content) or search step gets its
+own profile, so time spent in FDAScraper._extract_full_content is not
+mixed with KeywordSearcher._search_in_item or another scraper's listing.
+cProfile only sees the thread that enabled it, so each thread running a
+section gets its own profile; threads started inside a section join it
+through wrap(). A section's profiles are merged with pstats when written.
+Profiles are dumped as .prof files (for pstats, snakeviz, ...) next to a
+plain-text top-N summary.
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+
+class _Section:
+    """Accumulated profile of one named section over every time it ran"""
+
+    def __init__(self):
+        self.profiles: Dict[int, cProfile.Profile] = {}  # Thread id -> profile of that thread
+        self.runs = 0
+        self.seconds = 0.0
+        self.peak_bytes = 0
+        self.allocations: Dict[str, List[int]] = {}  # Traceback -> [size_diff, count_diff]
+
+
+class Profiler:
+    """
+    Profile named sections per thread; nested sections count towards the outer one
+
+    Memory figures come from process-wide tracemalloc, so sections running
+    at the same time in other threads show up in each other's growth.
+    """
+
+    def __init__(self, output_dir: str, top_n: int = 25, memory: bool = False, memory_frames: int = 5):
+        self.directory = Path(output_dir) / "profiles" / datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.top_n = top_n
+        self.memory = memory
+        self.sections: Dict[str, _Section] = {}
+        self._local = threading.local()  # Section the current thread is profiling
+        self._lock = threading.Lock()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(memory_frames)
+
+    @contextmanager
+    def section(self, name: str, worker: bool = False):
+        """Profile the block under name; worker sections add profile data but no runs or time"""
+        if getattr(self._local, 'active', None) is not None:
+            yield
+            return
+        self._local.active = name
+
+        with self._lock:
+            section = self.sections.setdefault(name, _Section())
+            profile = section.profiles.setdefault(threading.get_ident(), cProfile.Profile())
+        before = None
+        if self.memory and not worker:
+            tracemalloc.reset_peak()
+            before = self._snapshot()
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            profiling = True
+        except ValueError as e:  # Another profiler is active (python -m cProfile, or any other thread on 3.12+)
+            if not worker:
+                print(f"Warning: Could not profile {name}: {e}")
+            profiling = False
+
+        try:
+            yield
+        finally:
+            if profiling:
+                profile.disable()
+            if not worker:
+                with self._lock:
+                    section.seconds += time.perf_counter() - started
+                    section.runs += 1
+            if before is not None:
+                section.peak_bytes = max(section.peak_bytes, tracemalloc.get_traced_memory()[1])
+                self._add_allocations(section, self._snapshot().compare_to(before, 'traceback'))
+            self._local.active = None
+
+    def wrap(self, function: Callable) -> Callable:
+        """Make function, when run in another thread, profile into the section active here"""
+        name = getattr(self._local, 'active', None)
+        if name is None:
+            return function
+
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            with self.section(name, worker=True):
+                return function(*args, **kwargs)
+        return profiled
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        # Leave out the snapshots' own allocations
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ))
+
+    def _add_allocations(self, section: _Section, diffs: List[Any]):
+        # Keep the biggest growers only, so repeated sections (daemon polls) stay small
+        for diff in diffs[:self.top_n * 4]:
+            key = '\n'.join(f"      {frame.filename}:{frame.lineno}" for frame in diff.traceback)
+            totals = section.allocations.setdefault(key, [0, 0])
+            totals[0] += diff.size_diff
+            totals[1] += diff.count_diff
+
+    @staticmethod
+    def _file_name(name: str) -> str:
+        return ''.join(char if char.isalnum() or char in '._-' else '_' for char in name)
+
+    @staticmethod
+    def _stats(section: _Section, stream: io.StringIO = None) -> Optional[pstats.Stats]:
+        """The section's thread profiles merged into one, or None if nothing was recorded"""
+        profiles = []
+        for profile in section.profiles.values():
+            profile.create_stats()
+            if profile.stats:  # pstats rejects empty profiles (e.g. enable() failed)
+                profiles.append(profile)
+        return pstats.Stats(*profiles, stream=stream) if profiles else None
+
+    def _stats_lines(self, section: _Section, sort: str) -> List[str]:
+        stream = io.StringIO()
+        stats = self._stats(section, stream)
+        if stats is None:
+            return ["    (no calls recorded)"]
+        stats.strip_dirs().sort_stats(sort).print_stats(self.top_n)
+        # Drop pstats' header ("N function calls in X seconds", "Ordered by", ...)
+        lines = stream.getvalue().splitlines()
+        start = next((i for i, line in enumerate(lines) if line.strip().startswith('ncalls')), 0)
+        return ["    " + line for line in lines[start:] if line.strip()]
+
+    def write(self) -> Optional[str]:
+        """Dump a .prof file per section and summary.txt; returns the summary path"""
+        if not self.sections:
+            return None
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        lines = [
+            "PROFILE SUMMARY",
+            f"Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            ""
+        ]
+        for name, section in sorted(self.sections.items(), key=lambda item: -item[1].seconds):
+            stats = self._stats(section)
+            if stats is not None:
+                stats.dump_stats(str(self.directory / f"{self._file_name(name)}.prof"))
+
+            heading = f"{name}: {section.seconds:.3f}s over {section.runs} run(s) in {len(section.profiles)} thread(s)"
+            if self.memory:
+                heading += f", peak traced memory {section.peak_bytes / (1024 * 1024):.1f} MB"
+            lines.extend([heading, f"  Top {self.top_n} by own time:"])
+            lines.extend(self._stats_lines(section, 'tottime'))
+            lines.append(f"  Top {self.top_n} by cumulative time:")
+            lines.extend(self._stats_lines(section, 'cumulative'))
+
+            if section.allocations:
+                lines.append(f"  Top {self.top_n} memory growth (size / blocks, by allocation traceback):")
+                grown = sorted(section.allocations.items(), key=lambda item: -abs(item[1][0]))[:self.top_n]
+                for traceback, (size, count) in grown:
+                    lines.append(f"    {size / 1024:+.1f} KB / {count:+d} blocks")
+                    lines.append(traceback)
+            lines.append("")
+
+        summary_path = self.directory / "summary.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+        print(f"Profiles saved to: {self.directory} ({len(self.sections)} sections, see summary.txt)")
+        return str(summary_path)
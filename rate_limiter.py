@@ -0,0 +1,343 @@
+"""
+Per-Host Rate Limiting
+Token buckets shared by every scraper in the process, so two scrapers hitting
+the same host are throttled together and nobody sleeps when no wait is needed
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    """Return the lowercase host[:port] of a URL (or the value itself if it is a bare host)"""
+    netloc = urlparse(url).netloc
+    return (netloc or url).lower()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+
+    Callers reserve a token and are told how long to wait for it. Tokens may
+    go negative, which queues concurrent callers in order instead of letting
+    them all race for the next refill.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """Take one token; returns seconds to wait before it may be used"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+            return max(wait, self.paused_until - now)
+
+    def pause(self, seconds: float):
+        """Hold every request for a while (e.g. a server's Retry-After)"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def set_rate(self, rate: float, burst: int = None):
+        """Change the refill rate (and optionally the burst size)"""
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            if burst is not None:
+                self.capacity = max(1, burst)
+                self.tokens = min(self.tokens, self.capacity)
+
+
+class HostRateLimiter:
+    """Per-host token buckets with a default rate and per-host overrides"""
+
+    def __init__(self, default_rate: float = 1.0, default_burst: int = 1,
+                 host_rates: Dict[str, Any] = None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_rates = {}
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+        for host, setting in (host_rates or {}).items():
+            self.set_host_rate(host, **self._parse_setting(setting))
+
+    @staticmethod
+    def _parse_setting(setting: Any) -> Dict[str, Any]:
+        """Accept either a bare rate or {'rate': .., 'burst': ..}"""
+        if isinstance(setting, dict):
+            return {'rate': float(setting['rate']), 'burst': setting.get('burst')}
+        return {'rate': float(setting), 'burst': None}
+
+    def bucket(self, url_or_host: str) -> TokenBucket:
+        """Return (creating if needed) the bucket of a host"""
+        host = host_of(url_or_host)
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                rate, burst = self.host_rates.get(host, (self.default_rate, self.default_burst))
+                bucket = TokenBucket(rate, burst)
+                self.buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str) -> float:
+        """Block until a request to the URL's host is allowed; returns seconds waited"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, url_or_host: str, seconds: float):
+        """Hold all requests to a host for the given number of seconds"""
+        if seconds > 0:
+            self.bucket(url_or_host).pause(seconds)
+
+    def get_rate(self, url_or_host: str) -> float:
+        """Current rate of a host"""
+        return self.bucket(url_or_host).rate
+
+    def set_host_rate(self, url_or_host: str, rate: float, burst: Optional[int] = None):
+        """Override the rate of one host"""
+        host = host_of(url_or_host)
+        burst = burst if burst is not None else self.host_rates.get(host, (None, self.default_burst))[1]
+        with self._lock:
+            self.host_rates[host] = (rate, burst)
+            bucket = self.buckets.get(host)
+        if bucket is not None:
+            bucket.set_rate(rate, burst)
+
+    def configure(self, default_rate: float = None, default_burst: int = None,
+                  host_rates: Dict[str, Any] = None):
+        """Update defaults and overrides; existing buckets without an override follow the new defaults"""
+        if default_rate is not None:
+            self.default_rate = default_rate
+        if default_burst is not None:
+            self.default_burst = default_burst
+
+        with self._lock:
+            default_hosts = [host for host in self.buckets if host not in self.host_rates]
+        for host in default_hosts:
+            self.buckets[host].set_rate(self.default_rate, self.default_burst)
+
+        for host, setting in (host_rates or {}).items():
+            self.set_host_rate(host, **self._parse_setting(setting))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateController:
+    """
+    AIMD politeness controller
+
+    Each host's rate and concurrency grow additively while responses are fast
+    and successful, and are cut multiplicatively on 429/503/5xx, connection
+    errors or latency rising well above the host's baseline. Retry-After is
+    honored by pausing the host's bucket. State persists between runs.
+    """
+
+    THROTTLE_STATUSES = {429, 503}
+
+    def __init__(self, rate_limiter: HostRateLimiter, state_file: str = None,
+                 min_rate: float = 0.2, max_rate: float = 2.0,
+                 increase_step: float = 0.1, decrease_factor: float = 0.5,
+                 max_concurrency: int = 4, latency_factor: float = 2.0):
+        self.rate_limiter = rate_limiter
+        self.state_file = Path(state_file) if state_file else None
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.max_concurrency = max_concurrency
+        self.latency_factor = latency_factor
+
+        self.hosts = {}
+        self.ceilings = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._slots_changed = threading.Condition(self._lock)
+
+        self.load_state()
+
+    def _state(self, host: str) -> Dict[str, Any]:
+        state = self.hosts.get(host)
+        if state is None:
+            state = {
+                'rate': self.rate_limiter.get_rate(host),
+                'concurrency': 1,
+                'latency_fast': None,  # Recent latency (EWMA, alpha 0.3)
+                'latency_baseline': None,  # Long-run latency (EWMA, alpha 0.05)
+                'successes': 0,
+                'throttled': 0,
+                'errors': 0,
+                'blocked_until': 0.0  # Wall clock, so it survives restarts
+            }
+            self.hosts[host] = state
+        return state
+
+    def set_ceiling(self, url_or_host: str, max_rate: float):
+        """Cap a host below max_rate (e.g. from robots.txt Crawl-delay)"""
+        host = host_of(url_or_host)
+        with self._lock:
+            self.ceilings[host] = max_rate
+            state = self._state(host)
+            if state['rate'] > max_rate:
+                state['rate'] = max_rate
+                self.rate_limiter.set_host_rate(host, max_rate)
+
+    def _max_rate(self, host: str) -> float:
+        return min(self.max_rate, self.ceilings.get(host, self.max_rate))
+
+    @contextmanager
+    def slot(self, url: str):
+        """Hold one of the host's concurrent request slots"""
+        host = host_of(url)
+        with self._slots_changed:
+            while self._in_flight.get(host, 0) >= self._state(host)['concurrency']:
+                self._slots_changed.wait()
+            self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        try:
+            yield
+        finally:
+            with self._slots_changed:
+                self._in_flight[host] -= 1
+                self._slots_changed.notify_all()
+
+    def record(self, url: str, status_code: Optional[int], latency: float, retry_after: Optional[str] = None):
+        """Feed one request outcome into the controller (status None means a connection error)"""
+        host = host_of(url)
+        with self._slots_changed:
+            state = self._state(host)
+
+            if latency is not None and status_code is not None:
+                fast, baseline = state['latency_fast'], state['latency_baseline']
+                state['latency_fast'] = latency if fast is None else 0.7 * fast + 0.3 * latency
+                state['latency_baseline'] = latency if baseline is None else 0.95 * baseline + 0.05 * latency
+
+            throttled = status_code in self.THROTTLE_STATUSES
+            failed = status_code is None or status_code >= 500
+            slow = (state['latency_baseline'] is not None and
+                    state['latency_fast'] > self.latency_factor * state['latency_baseline'])
+
+            if throttled:
+                state['throttled'] += 1
+            elif failed:
+                state['errors'] += 1
+
+            if throttled or failed or slow:
+                state['rate'] = min(self._max_rate(host), max(self.min_rate, state['rate'] * self.decrease_factor))
+                state['concurrency'] = max(1, state['concurrency'] // 2)
+                if slow and not (throttled or failed):
+                    # Re-anchor so one slow spell doesn't keep cutting the rate
+                    state['latency_fast'] = state['latency_baseline']
+            else:
+                state['successes'] += 1
+                state['rate'] = min(self._max_rate(host), state['rate'] + self.increase_step)
+                if state['successes'] % 10 == 0:
+                    state['concurrency'] = min(self.max_concurrency, state['concurrency'] + 1)
+
+            delay = parse_retry_after(retry_after) if throttled else None
+            if delay:
+                state['blocked_until'] = max(state['blocked_until'], time.time() + delay)
+
+            self._slots_changed.notify_all()
+            rate = state['rate']
+
+        self.rate_limiter.set_host_rate(host, rate)
+        if delay:
+            print(f"{host} asked us to back off for {delay:.0f}s (Retry-After)")
+            self.rate_limiter.pause(host, delay)
+
+    def load_state(self):
+        """Restore per-host state saved by a previous run"""
+        if not self.state_file or not self.state_file.exists():
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load host state: {e}")
+            return
+
+        now = time.time()
+        for host, state in saved.get('hosts', {}).items():
+            state['rate'] = min(max(self.min_rate, state.get('rate', self.min_rate)), self.max_rate)
+            state['concurrency'] = min(max(1, state.get('concurrency', 1)), self.max_concurrency)
+            self.hosts[host] = {**self._state(host), **state}
+            self.rate_limiter.set_host_rate(host, state['rate'])
+            if state.get('blocked_until', 0) > now:
+                self.rate_limiter.pause(host, state['blocked_until'] - now)
+
+    def save_state(self):
+        """Persist per-host state for the next run"""
+        if not self.state_file:
+            return
+
+        with self._lock:
+            data = {'saved_at': time.time(), 'hosts': json.loads(json.dumps(self.hosts))}
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        tmp_path.replace(self.state_file)
+
+
+_shared_rate_limiter = None
+_shared_rate_controller = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> HostRateLimiter:
+    """Return the process-wide limiter every scraper uses by default"""
+    global _shared_rate_limiter
+    with _shared_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = HostRateLimiter()
+        return _shared_rate_limiter
+
+
+def get_shared_rate_controller() -> Optional[AdaptiveRateController]:
+    """Return the process-wide adaptive controller, if one was installed"""
+    return _shared_rate_controller
+
+
+def set_shared_rate_controller(controller: Optional[AdaptiveRateController]):
+    """Install (or remove with None) the adaptive controller used by every Fetcher"""
+    global _shared_rate_controller
+    with _shared_lock:
+        _shared_rate_controller = controller
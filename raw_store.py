@@ -0,0 +1,157 @@
+"""
+Raw Payload Side Store
+Content-addressed, compressed storage for the original scraper payloads
+that used to be embedded in every master file record as `raw_data`
+"""
+
+import gzip
+import hashlib
+import json
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class RawDataStore:
+    """Store raw payloads on disk keyed by the SHA-256 of their JSON form"""
+
+    EXTENSIONS = {
+        'zstd': '.json.zst',
+        'gzip': '.json.gz'
+    }
+
+    def __init__(self, directory: str = "scraped_data/raw", compression: str = None, cache_size: int = 1024):
+        self.directory = Path(directory)
+
+        # Prefer zstd when available, gzip is always there as a fallback
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            print("Warning: zstandard not installed, falling back to gzip for raw store")
+            compression = 'gzip'
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.compression = compression
+        # Recently loaded payloads, least recently used evicted first
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _serialize(self, payload: Dict[str, Any]) -> bytes:
+        """Canonical JSON encoding so identical payloads hash identically"""
+        return json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _path_for(self, raw_id: str, compression: str) -> Path:
+        """Fan out by hash prefix to keep directories small"""
+        return self.directory / raw_id[:2] / f"{raw_id}{self.EXTENSIONS[compression]}"
+
+    def _find_path(self, raw_id: str) -> Optional[Path]:
+        """Locate a stored payload regardless of which compression wrote it"""
+        for compression in self.EXTENSIONS:
+            path = self._path_for(raw_id, compression)
+            if path.exists():
+                return path
+        return None
+
+    def put(self, payload: Dict[str, Any]) -> str:
+        """Store a payload and return its content address"""
+        data = self._serialize(payload)
+        raw_id = hashlib.sha256(data).hexdigest()
+
+        if self._find_path(raw_id) is not None:
+            return raw_id  # Already stored
+
+        path = self._path_for(raw_id, self.compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.compression == 'zstd':
+            compressed = zstandard.ZstdCompressor(level=10).compress(data)
+        else:
+            compressed = gzip.compress(data, compresslevel=6)
+
+        # Write to a temp file first so a crash never leaves a truncated payload;
+        # the name is unique because backfill threads may store the same payload at once
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{raw_id}.", suffix='.tmp', delete=False) as f:
+            f.write(compressed)
+        try:
+            Path(f.name).replace(path)
+        except OSError:
+            Path(f.name).unlink(missing_ok=True)
+            raise
+
+        return raw_id
+
+    def get(self, raw_id: str) -> Optional[Dict[str, Any]]:
+        """Load a payload by its content address (None if missing)"""
+        if not raw_id:
+            return None
+
+        with self._cache_lock:
+            if raw_id in self._cache:
+                self._cache.move_to_end(raw_id)
+                return self._cache[raw_id]
+
+        path = self._find_path(raw_id)
+        if path is None:
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                compressed = f.read()
+
+            if path.name.endswith(self.EXTENSIONS['zstd']):
+                if zstandard is None:
+                    print(f"Warning: zstandard needed to read {path}")
+                    return None
+                data = zstandard.ZstdDecompressor().decompress(compressed)
+            else:
+                data = gzip.decompress(compressed)
+
+            payload = json.loads(data.decode('utf-8'))
+        except Exception as e:
+            print(f"Warning: Could not load raw payload {raw_id}: {e}")
+            return None
+
+        with self._cache_lock:
+            self._cache[raw_id] = payload
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return payload
+
+    def exists(self, raw_id: str) -> bool:
+        """Check whether a payload is stored"""
+        return self._find_path(raw_id) is not None
+
+    def resolve(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the raw payload of a record, inline or from the store"""
+        if 'raw_data' in item:
+            return item['raw_data']
+        return self.get(item.get('raw_ref', ''))
+
+    def externalize(self, item: Dict[str, Any]) -> bool:
+        """Move an inline `raw_data` payload into the store (in place)"""
+        if 'raw_data' not in item:
+            return False
+
+        raw_data = item.pop('raw_data')
+        if isinstance(raw_data, dict):
+            item['raw_ref'] = self.put(raw_data)
+        return True
+
+    def externalize_master(self, master_data: Dict[str, Any]) -> int:
+        """Migrate every inline payload of a master structure into the store"""
+        moved = 0
+        for scraper_data in master_data.get('results_by_scraper', {}).values():
+            for key in ('announcements', 'full_content'):
+                for item in scraper_data.get(key, []):
+                    if self.externalize(item):
+                        moved += 1
+        return moved
@@ -0,0 +1,261 @@
+"""
+Re-Crawl of Known URLs
+Revisits stored articles so corrections and updates are picked up. Each
+URL is due again after an interval that grows with the article's age (a
+day-old press release is checked daily, a year-old one every few months).
+Requests are conditional (If-None-Match / If-Modified-Since), so unchanged
+pages usually cost a 304 with no body. A new version is stored only when
+the hash of the extracted full_content text differs from the stored one;
+it replaces the stored item, whose previous state moves to its versions list.
+"""
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+from run_budget import BudgetExhaustedError
+
+# Fields of the stored item kept in its versions list when a newer version replaces it
+VERSION_FIELDS = ['title', 'date_published', 'full_content', 'word_count', 'metadata', 'scraped_at', 'simhash', 'raw_ref']
+
+
+class TransientFetchError(Exception):
+    """A re-crawl fetch the scraper gave up on with an error worth retrying"""
+
+
+def content_hash(text: str) -> str:
+    """Hash of the article text, insensitive to whitespace changes"""
+    return hashlib.sha256(' '.join((text or '').split()).encode('utf-8')).hexdigest()
+
+
+def _header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive lookup in a plain dict of response headers"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def merge_version(stored: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """The new version of a stored full content item, with the stored one moved into its history"""
+    previous = {field: stored[field] for field in VERSION_FIELDS if field in stored}
+    merged = dict(new)
+    merged['id'] = stored.get('id', new.get('id'))  # Feeds and exports keep seeing the same item
+    merged['versions'] = stored.get('versions', []) + [previous]
+    return merged
+
+
+class RecrawlScheduler:
+    """Decide which stored URLs are due and re-fetch them with conditional GETs"""
+
+    def __init__(self, orchestrator: Any, min_interval_days: float = 1.0, max_interval_days: float = 90.0,
+                 age_factor: float = 0.25, state_file: str = None, retry_minutes: float = 15.0):
+        self.orchestrator = orchestrator
+        self.min_interval_days = min_interval_days
+        self.max_interval_days = max_interval_days
+        self.age_factor = age_factor  # Interval as a fraction of the article's age
+        self.retry_minutes = retry_minutes  # First retry after a transient failure, doubled per failure
+        self.state_path = Path(state_file) if state_file else orchestrator.output_directory / "recrawl_state.json"
+        self.urls = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('urls', {})
+        except Exception as e:
+            print(f"Warning: Could not load re-crawl state: {e}")
+            return {}
+
+    def save_state(self):
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': datetime.now().isoformat(), 'urls': self.urls}, f, indent=2)
+        tmp_path.replace(self.state_path)
+
+    @staticmethod
+    def _published(date_str: str) -> Optional[datetime]:
+        date_str = (date_str or '')[:10]
+        try:
+            if len(date_str) == 4:
+                return datetime(int(date_str), 1, 1)  # Dated to the year only (alz.org)
+            return datetime.strptime(date_str, '%Y-%m-%d')
+        except ValueError:
+            return None
+
+    def interval_days(self, entry: Dict[str, Any]) -> float:
+        """Days until the next check: age_factor of the article's age, within the bounds"""
+        published = self._published(entry.get('published'))
+        age_days = (datetime.now() - published).days if published else self.max_interval_days / self.age_factor
+        return min(self.max_interval_days, max(self.min_interval_days, age_days * self.age_factor))
+
+    def _schedule(self, entry: Dict[str, Any], changed: bool = False):
+        # A page that just changed is likely to change again soon
+        days = self.min_interval_days if changed else self.interval_days(entry)
+        entry['next_check'] = time.time() + days * 86400
+        entry.pop('failures', None)
+
+    def _schedule_retry(self, entry: Dict[str, Any]):
+        # Timeouts and 5xx retry soon, backing off up to the normal interval
+        entry['failures'] = entry.get('failures', 0) + 1
+        seconds = self.retry_minutes * 60 * 2 ** (entry['failures'] - 1)
+        entry['next_check'] = time.time() + min(seconds, self.interval_days(entry) * 86400)
+
+    def seed(self, scraper_name: str, scraper_data: Dict[str, Any]):
+        """Track stored full content items not seen before"""
+        dates = {item.get('url'): item.get('date') for item in scraper_data.get('announcements', [])}
+        added = 0
+        for item in scraper_data.get('full_content', []):
+            url = item.get('url')
+            if not url:
+                continue
+            entry = self.urls.get(url)
+            if entry is None:
+                entry = self.urls[url] = {
+                    'scraper': scraper_name,
+                    'published': dates.get(url) or item.get('date_published') or item.get('scraped_at', ''),
+                    'etag': None,
+                    'last_modified': None,
+                    'checks': 0,
+                    'changes': 0
+                }
+                added += 1
+            entry['content_hash'] = item.get('metadata', {}).get('content_hash') or content_hash(item.get('full_content', ''))
+            entry['version'] = item.get('metadata', {}).get('version', 1)
+            if 'next_check' not in entry:
+                self._schedule(entry)
+        if added:
+            print(f"Tracking {added} new URLs of {scraper_name} for re-crawls")
+
+    def due(self, scraper_name: str, limit: int = None) -> List[str]:
+        """URLs of a scraper whose next check has passed, most overdue first"""
+        now = time.time()
+        due = sorted(
+            (entry['next_check'], url) for url, entry in self.urls.items()
+            if entry['scraper'] == scraper_name and entry['next_check'] <= now
+        )
+        return [url for _, url in due[:limit]]
+
+    def _fetch(self, scraper: Any, url: str, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Current full content of a URL, or None if the server says it is unchanged"""
+        fetcher = getattr(scraper, 'fetcher', None)
+        if fetcher is not None:
+            headers = {}
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+            page = fetcher.get_html(url, headers=headers)
+            entry['etag'] = _header(page.headers, 'ETag') or entry.get('etag')
+            entry['last_modified'] = _header(page.headers, 'Last-Modified') or entry.get('last_modified')
+            if page.status_code == 304:
+                return None
+            try:
+                return scraper.parse_full_content(url, page.content)
+            except NotImplementedError:
+                pass
+
+        # No parse hook: fetch again through the scraper, without validators
+        scraper.failed_urls = []
+        contents = scraper.scrape_full_content([url])
+        if contents:
+            return contents[0]
+
+        # The scraper swallows fetch errors; the transient ones it recorded still deserve a retry
+        failures = [failure for failure in scraper.failed_urls if failure.get('url') == url]
+        if failures:
+            raise TransientFetchError(failures[-1].get('error', 'fetch failed'))
+        return None
+
+    def check(self, scraper: Any, url: str) -> Optional[Dict[str, Any]]:
+        """Re-fetch one URL; returns the new version of its full content if the text changed"""
+        entry = self.urls[url]
+        entry['checks'] += 1
+        entry['last_checked'] = datetime.now().isoformat()
+
+        content = self._fetch(scraper, url, entry)
+        if content is None or not content.get('full_content'):
+            self._schedule(entry)
+            return None
+
+        new_hash = content_hash(content['full_content'])
+        if new_hash == entry['content_hash']:
+            self._schedule(entry)
+            return None
+
+        entry['changes'] += 1
+        entry['version'] += 1
+        content['metadata'] = {
+            **content.get('metadata', {}),
+            'version': entry['version'],
+            'content_hash': new_hash,
+            'previous_hash': entry['content_hash'],
+            'recrawled_at': entry['last_checked']
+        }
+        entry['content_hash'] = new_hash
+        self._schedule(entry, changed=True)
+        return content
+
+    def run(self, scraper_names: List[str] = None, limit: int = None) -> Dict[str, Any]:
+        """Re-crawl due URLs of each scraper (at most limit each) and store changed versions"""
+        from base_scraper import ScraperResult
+
+        orchestrator = self.orchestrator
+        if orchestrator.run_budget:
+            orchestrator.run_budget.reset()
+        existing_data = orchestrator.load_existing_data()
+        results = {}
+
+        for scraper_name in scraper_names or list(orchestrator.loaded_scrapers):
+            scraper_data = existing_data['results_by_scraper'].get(scraper_name)
+            if not scraper_data:
+                continue
+            self.seed(scraper_name, scraper_data)
+
+            urls = orchestrator._fetchable(self.due(scraper_name, limit))
+            if not urls:
+                print(f"{scraper_name}: no stored URLs due for a re-crawl")
+                continue
+
+            scraper = orchestrator.loaded_scrapers[scraper_name]
+            info = scraper.get_scraper_info()
+            result = ScraperResult(info['name'], info.get('website', 'Unknown'), raw_store=orchestrator.raw_store)
+            result.statistics['date_range'] = 're-crawl'
+            unchanged = 0
+
+            print(f"Re-crawling {len(urls)} stored URLs of {scraper_name}...")
+            with orchestrator._profiled(f"{scraper_name}.recrawl"):
+                for url in urls:
+                    try:
+                        content = self.check(scraper, url)
+                    except BudgetExhaustedError:
+                        break  # Still due, so the next run picks them up
+                    except Exception as e:
+                        fetcher = getattr(scraper, 'fetcher', None)
+                        if isinstance(e, TransientFetchError) or (fetcher is not None and fetcher.is_retryable(e)):
+                            self._schedule_retry(self.urls[url])
+                            print(f"Re-crawl of {url} failed, retrying in "
+                                  f"{(self.urls[url]['next_check'] - time.time()) / 60:.0f} min: {e}")
+                        else:
+                            print(f"Re-crawl of {url} failed: {e}")
+                            self._schedule(self.urls[url])
+                        continue
+                    if content:
+                        print(f"Changed: {url} (version {content['metadata']['version']})")
+                        result.add_full_content(content)
+                    else:
+                        unchanged += 1
+
+            print(f"{scraper_name}: {len(result.full_content)} changed, {unchanged} unchanged")
+            results[scraper_name] = result
+
+        changed = {name: result for name, result in results.items() if result.full_content}
+        if changed:
+            orchestrator.update_master_file(changed, merge_content=merge_version)
+        self.save_state()
+        return results
@@ -0,0 +1,217 @@
+"""
+Retry Handling
+Jittered exponential backoff for transient failures, a per-host circuit
+breaker that stops hammering a dead host, and a persistent queue of URLs
+that failed so the next run can pick them up first
+"""
+
+import json
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any
+
+from rate_limiter import host_of
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+class RetryPolicy:
+    """Decide which failures are worth retrying and how long to back off"""
+
+    RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Connection problems, timeouts and throttling/5xx statuses are transient"""
+        import requests
+
+        if isinstance(error, (requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.ChunkedEncodingError)):
+            return True
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code in self.RETRY_STATUSES
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given (0-based) attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    After failure_threshold consecutive transient failures a host's circuit
+    opens and requests fail immediately. Once reset_timeout has passed a
+    single probe request is let through; success closes the circuit, another
+    failure opens it again. A probe that never reports back (e.g. its thread
+    died) expires after another reset_timeout, and a new probe is let through.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> Dict[str, Any]:
+        return self.hosts.setdefault(host, {'state': 'closed', 'failures': 0, 'opened_at': 0.0})
+
+    def check(self, url: str):
+        """Raise CircuitOpenError if requests to the URL's host should not be sent"""
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+            if state['state'] == 'closed':
+                return
+
+            now = time.monotonic()
+            if state['state'] == 'half_open':
+                remaining = state['probe_started'] + self.reset_timeout - now
+            else:
+                remaining = state['opened_at'] + self.reset_timeout - now
+            if remaining <= 0:
+                state.update({'state': 'half_open', 'probe_started': now})  # This caller is the probe
+                return
+
+        if state['state'] == 'half_open':
+            raise CircuitOpenError(f"Circuit for {host} is being probed")
+        raise CircuitOpenError(f"Circuit for {host} is open, retrying in {remaining:.0f}s")
+
+    def is_open(self, url: str) -> bool:
+        """Check whether a host is currently refusing requests"""
+        with self._lock:
+            return self._state(host_of(url))['state'] != 'closed'
+
+    def record_success(self, url: str):
+        """The host answered; close its circuit"""
+        with self._lock:
+            state = self._state(host_of(url))
+            if state['state'] != 'closed':
+                print(f"Circuit for {host_of(url)} closed again")
+            state.update({'state': 'closed', 'failures': 0})
+
+    def record_failure(self, url: str):
+        """Count a transient failure, opening the circuit past the threshold"""
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+            state['failures'] += 1
+            if state['state'] == 'half_open' or state['failures'] >= self.failure_threshold:
+                if state['state'] != 'open':
+                    print(f"Circuit for {host} opened after {state['failures']} failures")
+                state.update({'state': 'open', 'opened_at': time.monotonic()})
+
+
+class RetryQueue:
+    """URLs that failed transiently, persisted so the next run fetches them first"""
+
+    def __init__(self, path: str, max_runs: int = 5):
+        self.path = Path(path)
+        self.max_runs = max_runs
+        self.entries = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('entries', [])
+        except Exception as e:
+            print(f"Warning: Could not load retry queue: {e}")
+            return []
+
+    def save(self):
+        """Persist the queue atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'updated_at': datetime.now().isoformat(), 'entries': self.entries}, f, indent=2)
+        tmp_path.replace(self.path)
+
+    def pending(self, scraper_name: str, kind: str = None) -> List[Dict[str, Any]]:
+        """Queued entries of a scraper, optionally of one kind ('listing' or 'content')"""
+        return [
+            entry for entry in self.entries
+            if entry['scraper'] == scraper_name and (kind is None or entry['kind'] == kind)
+        ]
+
+    def add(self, scraper_name: str, failure: Dict[str, Any], start_date: str = None, end_date: str = None):
+        """Queue a failure reported by a scraper, bumping its attempt count if already queued"""
+        now = datetime.now().isoformat()
+        for entry in self.entries:
+            if entry['scraper'] == scraper_name and entry['url'] == failure['url']:
+                entry['attempts'] += 1
+                entry['last_error'] = failure.get('error', '')
+                entry['last_failed'] = now
+                break
+        else:
+            self.entries.append({
+                'scraper': scraper_name,
+                'url': failure['url'],
+                'kind': failure.get('kind', 'content'),
+                'start_date': start_date,
+                'end_date': end_date,
+                'attempts': 1,
+                'last_error': failure.get('error', ''),
+                'first_failed': now,
+                'last_failed': now
+            })
+
+    def defer(self, scraper_name: str, url: str, item: Dict[str, Any] = None, kind: str = 'content',
+              start_date: str = None, end_date: str = None):
+        """Queue a URL a budget left unfetched; unlike a failure it doesn't count as an attempt"""
+        for entry in self.entries:
+            if entry['scraper'] == scraper_name and entry['url'] == url:
+                if item:
+                    entry['item'] = item
+                return
+        self.entries.append({
+            'scraper': scraper_name,
+            'url': url,
+            'kind': kind,
+            'start_date': start_date,
+            'end_date': end_date,
+            'attempts': 0,
+            'last_error': 'deferred',
+            'item': item or {},
+            'first_failed': datetime.now().isoformat(),
+            'last_failed': datetime.now().isoformat()
+        })
+
+    def remove(self, scraper_name: str, url: str):
+        """Drop an entry once it has been fetched"""
+        self.entries = [
+            entry for entry in self.entries
+            if not (entry['scraper'] == scraper_name and entry['url'] == url)
+        ]
+
+    def prune(self) -> List[Dict[str, Any]]:
+        """Give up on entries that kept failing for max_runs runs"""
+        dropped = [entry for entry in self.entries if entry['attempts'] >= self.max_runs]
+        if dropped:
+            self.entries = [entry for entry in self.entries if entry['attempts'] < self.max_runs]
+            print(f"Giving up on {len(dropped)} URLs that failed {self.max_runs} runs in a row")
+        return dropped
+
+
+_shared_circuit_breaker = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_circuit_breaker() -> CircuitBreaker:
+    """Return the process-wide breaker, so every scraper sees a dead host as dead"""
+    global _shared_circuit_breaker
+    with _shared_lock:
+        if _shared_circuit_breaker is None:
+            _shared_circuit_breaker = CircuitBreaker()
+        return _shared_circuit_breaker
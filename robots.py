@@ -0,0 +1,285 @@
+"""
+robots.txt Policy Cache
+Fetches each host's robots.txt once per TTL, compiles its rules for our
+user agent into regexes and answers "may this URL be fetched?" without
+re-parsing. Crawl-delay is handed to the rate limiter as a ceiling, and the
+cache persists between runs so robots.txt isn't fetched on every run.
+robots.txt goes through a Fetcher, so it gets the same retries and circuit
+breaker as pages. A host whose robots.txt can't be fetched keeps its last
+known rules; with none cached it is unreachable, not disallowed, so callers
+can put its URLs off instead of dropping them.
+"""
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+
+from rate_limiter import host_of
+
+
+class RobotsRules:
+    """The compiled rules of one robots.txt group"""
+
+    def __init__(self, allow: List[str] = None, disallow: List[str] = None,
+                 crawl_delay: Optional[float] = None, disallow_all: bool = False, unreachable: bool = False):
+        self.crawl_delay = crawl_delay
+        self.disallow_all = disallow_all or unreachable
+        self.unreachable = unreachable  # robots.txt couldn't be fetched: keep out for now, try again later
+        rules = [(pattern, True) for pattern in allow or []] + [(pattern, False) for pattern in disallow or []]
+        # Longest pattern wins, and Allow wins a tie (RFC 9309)
+        rules.sort(key=lambda rule: (len(rule[0]), rule[1]), reverse=True)
+        self.rules = [(self._compile(pattern), allowed) for pattern, allowed in rules]
+
+    @staticmethod
+    def _compile(pattern: str) -> re.Pattern:
+        anchored = pattern.endswith('$')
+        if anchored:
+            pattern = pattern[:-1]
+        regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+        return re.compile(regex + ('$' if anchored else ''))
+
+    def allowed(self, path: str) -> bool:
+        """Check a path (with query string) against the rules"""
+        if self.disallow_all:
+            return False
+        for regex, allowed in self.rules:
+            if regex.match(path):
+                return allowed
+        return True
+
+
+def parse_robots(text: str, user_agent: str) -> RobotsRules:
+    """Rules of the groups naming our user agent, or of the '*' groups if none do"""
+    agent = user_agent.lower()
+    groups = {'specific': {'allow': [], 'disallow': [], 'delay': None, 'seen': False},
+              'default': {'allow': [], 'disallow': [], 'delay': None, 'seen': False}}
+
+    current = []
+    in_agents = False
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        field, _, value = line.partition(':')
+        field, value = field.strip().lower(), value.strip()
+
+        if field == 'user-agent':
+            if not in_agents:
+                current = []
+                in_agents = True
+            name = value.lower()
+            if name == '*':
+                current.append(groups['default'])
+            elif name == agent:
+                current.append(groups['specific'])
+            continue
+
+        in_agents = False
+        for group in current:
+            group['seen'] = True
+            if field == 'allow' and value:
+                group['allow'].append(value)
+            elif field == 'disallow' and value:
+                group['disallow'].append(value)
+            elif field == 'crawl-delay':
+                try:
+                    group['delay'] = float(value)
+                except ValueError:
+                    pass
+
+    group = groups['specific'] if groups['specific']['seen'] else groups['default']
+    return RobotsRules(group['allow'], group['disallow'], group['delay'])
+
+
+class RobotsCache:
+    """Per-host robots.txt rules, fetched lazily and refreshed after ttl seconds"""
+
+    def __init__(self, session: Any = None, user_agent: str = 'web-scraper-orchestrator',
+                 state_file: str = None, ttl: float = 24 * 3600, error_ttl: float = 600,
+                 rate_limiter: Any = None, controller: Any = None, timeout: float = 15):
+        self.session = session  # Transport for robots.txt; the shared one when None
+        self.user_agent = user_agent
+        self.state_file = Path(state_file) if state_file else None
+        self.ttl = ttl
+        self.error_ttl = error_ttl  # Unreachable robots.txt is retried sooner
+        self.rate_limiter = rate_limiter
+        self.controller = controller
+        self.timeout = timeout
+
+        self.hosts = {}  # host -> {'fetched_at', 'expires_at', 'status', 'text'} (wall clock)
+        self._fetcher = None
+        self._rules = {}
+        self._lock = threading.Lock()
+        self._host_locks = {}
+
+        self.load_state()
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _get_fetcher(self) -> Any:
+        """Fetcher for robots.txt: rate limits, retries and circuit breaker, but no robots check"""
+        from fetcher import Fetcher
+
+        if self.session is None:
+            from transport import get_shared_transport
+            self.session = get_shared_transport()
+        if self._fetcher is None or self._fetcher.session is not self.session:
+            self._fetcher = Fetcher(self.session, rate_limiter=self.rate_limiter, timeout=self.timeout,
+                                    controller=self.controller)
+        return self._fetcher
+
+    @staticmethod
+    def _failed(entry: Dict[str, Any]) -> bool:
+        return entry['status'] is None or entry['status'] >= 500
+
+    def _fetch(self, url: str) -> Dict[str, Any]:
+        """Download robots.txt; a 4xx means no rules, a 5xx or no answer means unreachable"""
+        now = time.time()
+        try:
+            response = self._get_fetcher().get(url)
+            status, text = response.status_code, response.text
+        except Exception as e:
+            # Fetcher raises for error statuses once retries are used up
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            text = ''
+            if status is None or status >= 500:
+                print(f"Warning: Could not fetch {url}: {e}")
+
+        failed = status is None or status >= 500
+        return {
+            'fetched_at': now,
+            'expires_at': now + (self.error_ttl if failed else self.ttl),
+            'status': status,
+            'text': text
+        }
+
+    def _compile(self, entry: Dict[str, Any]) -> RobotsRules:
+        status = entry['status']
+        if self._failed(entry):
+            return RobotsRules(unreachable=True)
+        if status >= 400:
+            return RobotsRules()
+        return parse_robots(entry['text'], self.user_agent)
+
+    def rules(self, url: str) -> RobotsRules:
+        """Compiled rules for the URL's host, fetching robots.txt when stale"""
+        host = host_of(url)
+        with self._lock:
+            entry = self.hosts.get(host)
+            if entry and entry['expires_at'] > time.time() and host in self._rules:
+                return self._rules[host]
+
+        with self._host_lock(host):
+            with self._lock:
+                entry = self.hosts.get(host)
+                if entry and entry['expires_at'] > time.time() and host in self._rules:
+                    return self._rules[host]
+
+            parts = urlsplit(url)
+            entry = self._fetch(f"{parts.scheme or 'https'}://{parts.netloc}/robots.txt")
+            with self._lock:
+                previous = self.hosts.get(host)
+            if self._failed(entry) and previous and not self._failed(previous):
+                # Keep the rules we last saw and ask again after error_ttl
+                print(f"Using the cached robots.txt of {host} until it can be fetched again")
+                entry = {**previous, 'expires_at': entry['expires_at']}
+            rules = self._compile(entry)
+            with self._lock:
+                self.hosts[host] = entry
+                self._rules[host] = rules
+
+        self._apply_crawl_delay(host, rules)
+        return rules
+
+    def _apply_crawl_delay(self, host: str, rules: RobotsRules):
+        """Cap the host's rate at one request per Crawl-delay"""
+        if not rules.crawl_delay or rules.crawl_delay <= 0:
+            return
+        rate = 1.0 / rules.crawl_delay
+        if self.controller:
+            # Keep a tighter ceiling set by the user (--host-rate)
+            ceiling = self.controller.ceilings.get(host)
+            self.controller.set_ceiling(host, min(rate, ceiling) if ceiling else rate)
+        elif self.rate_limiter and self.rate_limiter.get_rate(host) > rate:
+            self.rate_limiter.set_host_rate(host, rate)
+
+    def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch the URL"""
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if path == '/robots.txt':
+            return True
+        if parts.query:
+            path += '?' + parts.query
+        return self.rules(url).allowed(path)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        return self.rules(url).crawl_delay
+
+    def unreachable(self, url: str) -> bool:
+        """Whether the URL's host is kept out only because its robots.txt couldn't be fetched"""
+        return self.rules(url).unreachable
+
+    def filter_urls(self, urls: List[str], unreachable: List[str] = None) -> List[str]:
+        """
+        Drop URLs robots.txt disallows, reporting how many
+
+        URLs of hosts whose robots.txt couldn't be fetched go to unreachable
+        if a list is given, so they can be tried again later.
+        """
+        allowed = []
+        postponed = 0
+        for url in urls:
+            if self.allowed(url):
+                allowed.append(url)
+            elif unreachable is not None and self.unreachable(url):
+                unreachable.append(url)
+                postponed += 1
+        if postponed:
+            print(f"Postponing {postponed} URLs until their host's robots.txt can be fetched")
+        if len(allowed) + postponed < len(urls):
+            print(f"Skipping {len(urls) - len(allowed) - postponed} URLs disallowed by robots.txt")
+        return allowed
+
+    def load_state(self):
+        """Restore robots.txt bodies fetched by earlier runs"""
+        if not self.state_file or not self.state_file.exists():
+            return
+
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load robots.txt cache: {e}")
+            return
+
+        for host, entry in saved.get('hosts', {}).items():
+            self.hosts[host] = entry
+            self._rules[host] = self._compile(entry)
+
+    def apply_saved_delays(self):
+        """Feed cached Crawl-delays into the rate limits before any request is sent"""
+        with self._lock:
+            cached = list(self._rules.items())
+        for host, rules in cached:
+            self._apply_crawl_delay(host, rules)
+
+    def save_state(self):
+        """Persist fetched robots.txt bodies for the next run"""
+        if not self.state_file:
+            return
+
+        with self._lock:
+            data = {'saved_at': time.time(), 'hosts': dict(self.hosts)}
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        tmp_path.replace(self.state_file)
@@ -0,0 +1,82 @@
+"""
+Run Budgets
+Caps a run's wall time, request count and downloaded bytes across every
+scraper and phase. Fetchers check the budget before each request; once it
+runs out they raise BudgetExhaustedError without touching the network, the
+scrapers report the URL as unfinished and the orchestrator queues it for
+the next run, so a run ends on time with everything it did fetch saved.
+"""
+
+import threading
+import time
+from typing import Dict, Any, Optional, Set
+
+
+class BudgetExhaustedError(Exception):
+    """The run's time, request or byte budget is used up"""
+
+
+class RunBudget:
+    """Shared wall-time / request / byte limits for one run"""
+
+    def __init__(self, max_seconds: float = None, max_requests: int = None, max_bytes: int = None):
+        self.max_seconds = max_seconds
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new run; the clock starts with the first check"""
+        with self._lock:
+            self.started = None
+            self.requests = 0
+            self.bytes = 0
+            self.refused: Set[str] = set()  # URLs not fetched because the budget ran out
+            self._reason = None
+
+    def _exceeded(self) -> Optional[str]:
+        if self._reason:
+            return self._reason
+        if self.started is None:
+            self.started = time.monotonic()
+        if self.max_seconds is not None and time.monotonic() - self.started >= self.max_seconds:
+            self._reason = f"time budget of {self.max_seconds:.0f}s"
+        elif self.max_requests is not None and self.requests >= self.max_requests:
+            self._reason = f"request budget of {self.max_requests}"
+        elif self.max_bytes is not None and self.bytes >= self.max_bytes:
+            self._reason = f"byte budget of {self.max_bytes / (1024 * 1024):.1f} MB"
+        if self._reason:
+            print(f"Run budget exhausted ({self._reason}); unfinished URLs are queued for the next run")
+        return self._reason
+
+    @property
+    def exhausted(self) -> Optional[str]:
+        """Which limit ran out, or None while the run may continue"""
+        with self._lock:
+            return self._exceeded()
+
+    def acquire(self, url: str):
+        """Count a request about to be sent, or raise BudgetExhaustedError"""
+        with self._lock:
+            reason = self._exceeded()
+            if reason:
+                self.refused.add(url)
+                raise BudgetExhaustedError(f"Run stopped by the {reason}: {url}")
+            self.requests += 1
+
+    def record_bytes(self, size: int):
+        """Count downloaded body bytes"""
+        with self._lock:
+            self.bytes += size
+
+    def usage(self) -> Dict[str, Any]:
+        """Spent amounts, for reports"""
+        with self._lock:
+            elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+            return {
+                'seconds': round(elapsed, 1),
+                'requests': self.requests,
+                'bytes': self.bytes,
+                'exhausted': self._reason
+            }
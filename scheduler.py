@@ -0,0 +1,187 @@
+"""
+Daemon Mode Scheduler
+Keeps one orchestrator alive (scrapers, sessions, rate-limiter state and an
+in-memory URL index) and polls each scraper on its own interval. Intervals
+follow each source's observed publication frequency: a source publishing
+several items a day is checked often, one that publishes weekly is checked
+a few times a week. New items go into the master store and feeds as soon as
+a poll finds them.
+"""
+
+import json
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional
+
+
+class PollingScheduler:
+    """Poll each scraper on an interval adapted to how often it publishes"""
+
+    def __init__(self, orchestrator: Any, scraper_names: List[str] = None,
+                 min_interval: float = 15 * 60, max_interval: float = 24 * 3600,
+                 initial_interval: float = 3600, polls_per_item: float = 2.0,
+                 window_days: int = 30, lookback_days: int = 7,
+                 scrape_full_content: bool = True, feed_options: Dict[str, Any] = None,
+                 run_kwargs: Dict[str, Any] = None):
+        self.orchestrator = orchestrator
+        self.scraper_names = scraper_names or list(orchestrator.loaded_scrapers)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.polls_per_item = polls_per_item  # Polls per expected new item
+        self.window_days = window_days  # Publication history used for the rate estimate
+        self.lookback_days = lookback_days  # Re-check this far back for late-dated items
+        self.scrape_full_content = scrape_full_content
+        self.feed_options = feed_options or {}
+        self.run_kwargs = run_kwargs or {}
+
+        self.state_path = orchestrator.output_directory / "schedule_state.json"
+        self.state = self._load_state()
+        self._stop = threading.Event()
+
+    def _load_state(self) -> Dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('scrapers', {})
+        except Exception as e:
+            print(f"Warning: Could not load schedule state: {e}")
+            return {}
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': datetime.now().isoformat(), 'scrapers': self.state}, f, indent=2)
+        tmp_path.replace(self.state_path)
+
+    def _scraper_state(self, name: str) -> Dict[str, Any]:
+        return self.state.setdefault(name, {
+            'interval': self.initial_interval,
+            'next_run': 0.0,  # Wall clock, so the schedule survives restarts
+            'last_poll_date': None,
+            'observed_since': None,  # Earliest date the polls have covered
+            'item_dates': [],  # Publication dates of new items within the window
+            'polls': 0,
+            'new_items': 0
+        })
+
+    def publication_rate(self, name: str) -> Optional[float]:
+        """New items per day over the recent window, or None without history"""
+        state = self._scraper_state(name)
+        if not state['item_dates']:
+            return None
+        observed = (datetime.now() - datetime.strptime(state['observed_since'], '%Y-%m-%d')).days
+        return len(state['item_dates']) / min(self.window_days, max(1, observed))
+
+    def _adapt_interval(self, name: str, found_new: bool, failed: bool):
+        """Poll polls_per_item times per expected item; back off while nothing arrives"""
+        state = self._scraper_state(name)
+        rate = self.publication_rate(name)
+
+        if failed:
+            interval = state['interval'] * 2
+        elif rate:
+            interval = 86400 / (rate * self.polls_per_item)
+            if not found_new:
+                # Quiet lately: drift towards max_interval instead of trusting an old burst
+                interval = max(interval, state['interval'] * 1.5)
+        else:
+            interval = state['interval'] * 1.5
+
+        state['interval'] = min(self.max_interval, max(self.min_interval, interval))
+        state['next_run'] = time.time() + state['interval']
+
+    def _record_items(self, name: str, result: Any):
+        """Add the publication dates of a poll's new items to the history"""
+        state = self._scraper_state(name)
+        cutoff = (datetime.now() - timedelta(days=self.window_days)).strftime('%Y-%m-%d')
+        today = datetime.now().strftime('%Y-%m-%d')
+        for record in result.announcements:
+            date = (record.date or '')[:10]
+            # Undated items, or items dated only to the year (alz.org), count as published today
+            if len(date) != 10 or not cutoff <= date <= today:
+                date = today
+            state['item_dates'].append(date)
+        state['item_dates'] = sorted(date for date in state['item_dates'] if date >= cutoff)
+
+    def poll(self, name: str) -> Any:
+        """Run one scraper over the days since its last poll and store what's new"""
+        state = self._scraper_state(name)
+        today = datetime.now()
+        since = state['last_poll_date'] or today.strftime('%Y-%m-%d')
+        start_date = (datetime.strptime(since, '%Y-%m-%d') - timedelta(days=self.lookback_days)).strftime('%Y-%m-%d')
+        end_date = today.strftime('%Y-%m-%d')
+
+        print(f"\n[{today.strftime('%H:%M:%S')}] Polling {name} ({start_date} to {end_date})")
+        if self.orchestrator.run_budget:
+            self.orchestrator.run_budget.reset()  # Budgets apply to each poll
+        result = self.orchestrator.run_scraper(name, start_date, end_date, self.scrape_full_content,
+                                               **self.run_kwargs)
+
+        failed = bool(result.errors)
+        new_count = len(result.announcements)
+        if new_count or result.full_content:
+            self.orchestrator.update_master_file({name: result})
+            self.orchestrator.generate_feeds(**self.feed_options)
+
+        if not failed:
+            state['last_poll_date'] = end_date
+        state['observed_since'] = state['observed_since'] or start_date
+        state['polls'] += 1
+        state['new_items'] += new_count
+        self._record_items(name, result)
+        self._adapt_interval(name, new_count > 0, failed)
+        self._save_state()
+
+        rate = self.publication_rate(name)
+        rate_text = f"{rate:.2f}/day" if rate is not None else "unknown"
+        print(f"{name}: {new_count} new items, publication rate {rate_text}, "
+              f"next poll in {state['interval'] / 60:.0f} min")
+        return result
+
+    def due(self) -> List[str]:
+        """Scrapers whose next poll time has passed"""
+        now = time.time()
+        return [name for name in self.scraper_names if self._scraper_state(name)['next_run'] <= now]
+
+    def stop(self, *args):
+        """Finish the current poll, then exit"""
+        print("Stopping after the current poll...")
+        self._stop.set()
+
+    def run(self, once: bool = False):
+        """Poll due scrapers until stopped (SIGINT/SIGTERM); once=True polls each due scraper a single time"""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+
+        self.orchestrator.warm_url_index()
+        print(f"Daemon polling {len(self.scraper_names)} scrapers: {self.scraper_names}")
+
+        while not self._stop.is_set():
+            for name in self.due():
+                if self._stop.is_set():
+                    break
+                try:
+                    self.poll(name)
+                except Exception as e:
+                    print(f"Poll of {name} failed: {e}")
+                    self._adapt_interval(name, False, True)
+                    self._save_state()
+                self.orchestrator.export_metrics()
+
+            if once:
+                break
+
+            next_run = min(self._scraper_state(name)['next_run'] for name in self.scraper_names)
+            wait = max(1.0, next_run - time.time())
+            print(f"Sleeping {wait / 60:.1f} min until the next poll")
+            self._stop.wait(wait)
+
+        if self.orchestrator.rate_controller:
+            self.orchestrator.rate_controller.save_state()
+        if self.orchestrator.robots:
+            self.orchestrator.robots.save_state()
@@ -4,36 +4,44 @@ Alzheimer's Association News Scraper
 Scrapes news and press releases from alz.org
 """
 
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional
 import uuid
-import time
 import re
 import sys
 from pathlib import Path
 
+# requests and bs4 are imported where pages are fetched and parsed, keeping imports of this module cheap
+
 # Import base scraper if running standalone
 try:
     from base_scraper import BaseScraperInterface
+    from fetcher import Fetcher
+    from discovery import Discovery, DiscoveryUnavailable
 except ImportError:
     # If running standalone, add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from base_scraper import BaseScraperInterface
+    from fetcher import Fetcher
+    from discovery import Discovery, DiscoveryUnavailable
 
 
 class AlzOrgScraper(BaseScraperInterface):
     """Scraper for Alzheimer's Association news from alz.org"""
     
     def __init__(self):
+        import requests
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.base_url = "https://www.alz.org"
         self.news_url = "https://www.alz.org/news"
-        self.delay = 1.0  # Delay between requests in seconds
+        self.sitemap_url = "https://www.alz.org/sitemap.xml"
+        self.fetcher = Fetcher(self.session)  # Rate limited per host, shared with other scrapers
+        self.failed_urls = []  # Transient failures, queued by the orchestrator for the next run
+        self.fetched_pages = {}  # Sitemap-only articles parsed for their announcement, reused for full content
     
     def get_scraper_info(self) -> Dict[str, str]:
         """Return scraper metadata"""
@@ -75,13 +83,26 @@ class AlzOrgScraper(BaseScraperInterface):
         start_dt = datetime.strptime(start_date, '%Y-%m-%d')
         end_dt = datetime.strptime(end_date, '%Y-%m-%d')
         
+        # The sitemap also lists articles that dropped off the /news page, but has no titles,
+        # summaries or publication dates: it is opt-in and only contributes URLs
+        sitemap_urls = []
+        self.fetched_pages = {}
+        if kwargs.get('use_discovery', True) and kwargs.get('sitemap_discovery', False):
+            try:
+                sitemap_urls = self._discover_urls(start_date, start_dt, end_dt)
+                print(f"[ALZ.ORG] Found {len(sitemap_urls)} articles in the sitemap")
+            except DiscoveryUnavailable as e:
+                print(f"[ALZ.ORG] Sitemap discovery unavailable ({e}), using the news page only")
+        
         announcements = []
         
         # Try to scrape from the main news page
         try:
-            response = self.session.get(self.news_url, timeout=30)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            from bs4 import BeautifulSoup
+            
+            response = self.fetcher.get_html(self.news_url)
+            with self.fetcher.timed('parse_listing'):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
             # Look for news articles on the page
             # The structure appears to have news items as links with specific patterns
@@ -216,6 +237,8 @@ class AlzOrgScraper(BaseScraperInterface):
             
         except Exception as e:
             print(f"[ALZ.ORG] Error fetching news page: {e}")
+            if self.fetcher.is_retryable(e):
+                self.failed_urls.append({'url': self.news_url, 'kind': 'listing', 'error': str(e)})
         
         # Remove duplicates based on URL
         seen_urls = set()
@@ -225,9 +248,61 @@ class AlzOrgScraper(BaseScraperInterface):
                 seen_urls.add(ann['url'])
                 unique_announcements.append(ann)
         
+        # Articles only the sitemap knows about get their title, date and excerpt from the page itself
+        for url in sitemap_urls:
+            if url not in seen_urls:
+                seen_urls.add(url)
+                announcement = self._announcement_from_page(url, start_dt, end_dt)
+                if announcement:
+                    unique_announcements.append(announcement)
+        
         print(f"[ALZ.ORG] Found {len(unique_announcements)} unique announcements")
         return unique_announcements
     
+    def _discover_urls(self, start_date: str, start_dt: datetime, end_dt: datetime) -> List[str]:
+        """Article URLs under /news/YYYY/ in the sitemap, for the years of the range"""
+        entries = Discovery(self.fetcher).sitemap_entries(self.sitemap_url, start_date, url_pattern=r'/news/\d{4}/')
+        
+        urls = []
+        for entry in entries:
+            year_match = re.search(r'/news/(\d{4})/[^/?#]+', entry['url'])
+            if year_match and start_dt.year <= int(year_match.group(1)) <= end_dt.year:
+                urls.append(entry['url'])
+        return urls
+    
+    def _announcement_from_page(self, url: str, start_dt: datetime, end_dt: datetime) -> Optional[Dict[str, Any]]:
+        """Announcement for a sitemap-only URL, from the article page; None if it is out of range or unusable"""
+        try:
+            response = self.fetcher.get_html(url)
+            with self.fetcher.timed('parse_listing'):
+                page = self.parse_full_content(url, response.content)
+        except Exception as e:
+            print(f"[ALZ.ORG] Error fetching sitemap article {url}: {e}")
+            if self.fetcher.is_retryable(e):
+                self.failed_urls.append({'url': url, 'kind': 'listing', 'error': str(e)})
+            return None
+        
+        date = page['date_published']
+        if page['title'] == "Untitled" or date == "Unknown":
+            return None
+        if date.endswith('-01-01'):
+            # Only the year is known (from the URL)
+            in_range = start_dt.year <= int(date[:4]) <= end_dt.year
+        else:
+            in_range = start_dt.strftime('%Y-%m-%d') <= date <= end_dt.strftime('%Y-%m-%d')
+        if not in_range:
+            return None
+        
+        self.fetched_pages[url] = page
+        return {
+            'id': str(uuid.uuid4()),
+            'title': page['title'],
+            'url': url,
+            'date': date,
+            'category': page['tags'][0] if page['tags'] else "Press Release",
+            'excerpt': page['full_content'][:500]
+        }
+    
     def scrape_full_content(self, announcement_urls: List[str], **kwargs) -> List[Dict[str, Any]]:
         """
         Scrape full content from announcement URLs
@@ -241,130 +316,144 @@ class AlzOrgScraper(BaseScraperInterface):
         """
         print(f"[ALZ.ORG] Scraping full content for {len(announcement_urls)} articles...")
         
-        full_content_list = []
+        full_content_list = list(self.iter_full_content(announcement_urls, **kwargs))
+        
+        print(f"[ALZ.ORG] Successfully scraped {len(full_content_list)} articles")
+        return full_content_list
+    
+    def iter_full_content(self, announcement_urls: Iterable[str], **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield full content one article at a time as URLs arrive"""
+        if 'delay' in kwargs:
+            # Legacy per-request delay becomes the host rate
+            self.fetcher.set_min_interval(self.base_url, kwargs['delay'])
+        
+        total = len(announcement_urls) if hasattr(announcement_urls, '__len__') else '?'
         
         for i, url in enumerate(announcement_urls, 1):
             try:
-                print(f"[ALZ.ORG] Fetching {i}/{len(announcement_urls)}: {url}")
-                
-                # Add delay to be respectful
-                if i > 1:
-                    time.sleep(self.delay)
-                
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract title
-                title = ""
-                title_elem = soup.find(['h1', 'h2'], class_=re.compile(r'(title|headline)', re.I))
-                if not title_elem:
-                    title_elem = soup.find('h1')
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                
-                # Extract date
-                date_published = ""
-                # Look for date patterns
-                date_elem = soup.find(['time', 'span', 'p'], class_=re.compile(r'(date|published|time)', re.I))
-                if date_elem:
-                    date_text = date_elem.get_text(strip=True)
-                    # Try to parse various date formats
-                    date_published = self._parse_date(date_text)
-                
-                # If no date found, try to extract from URL
-                if not date_published:
-                    year_match = re.search(r'/news/(\d{4})/', url)
-                    if year_match:
-                        date_published = f"{year_match.group(1)}-01-01"
-                
-                # Extract main content
-                content = ""
+                full_content = self.fetched_pages.pop(url, None)
+                if full_content is None:
+                    print(f"[ALZ.ORG] Fetching {i}/{total}: {url}")
+                    response = self.fetcher.get_html(url)
+                    with self.fetcher.timed('parse_content'):
+                        full_content = self.parse_full_content(url, response.content)
+                title = full_content['title']
+                word_count = full_content['word_count']
                 
-                # Look for main content area
-                content_elem = soup.find(['article', 'div'], class_=re.compile(r'(content|body|article|text|main)', re.I))
-                if not content_elem:
-                    content_elem = soup.find('article')
-                if not content_elem:
-                    # Try to find the largest text block
-                    content_elem = soup.find('main')
-                
-                if content_elem:
-                    # Extract all paragraphs
-                    paragraphs = content_elem.find_all('p')
-                    content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-                
-                # If no content found, try getting all paragraphs from body
-                if not content or len(content) < 100:
-                    all_paragraphs = soup.find_all('p')
-                    content = '\n\n'.join([p.get_text(strip=True) for p in all_paragraphs if len(p.get_text(strip=True)) > 50])
-                
-                # Extract images
-                images = []
-                if content_elem:
-                    img_tags = content_elem.find_all('img')
-                    for img in img_tags:
-                        img_src = img.get('src', '')
-                        if img_src:
-                            if img_src.startswith('/'):
-                                img_src = self.base_url + img_src
-                            images.append(img_src)
-                
-                # Extract links
-                links = []
-                if content_elem:
-                    link_tags = content_elem.find_all('a', href=True)
-                    for link in link_tags[:20]:  # Limit to first 20 links
-                        link_url = link.get('href', '')
-                        if link_url and not link_url.startswith('#'):
-                            if link_url.startswith('/'):
-                                link_url = self.base_url + link_url
-                            links.append(link_url)
-                
-                # Calculate word count
-                word_count = len(content.split()) if content else 0
-                
-                # Extract contact info if available
-                contact_info = ""
-                contact_elem = soup.find(['div', 'p'], class_=re.compile(r'contact', re.I))
-                if contact_elem:
-                    contact_info = contact_elem.get_text(strip=True)
-                
-                # Extract tags/categories
-                tags = []
-                tag_elems = soup.find_all(['span', 'a'], class_=re.compile(r'(tag|category|topic)', re.I))
-                for tag in tag_elems[:10]:
-                    tag_text = tag.get_text(strip=True)
-                    if tag_text and len(tag_text) < 50:
-                        tags.append(tag_text)
-                
-                # Create full content entry
-                full_content = {
-                    'id': str(uuid.uuid4()),
-                    'url': url,
-                    'title': title if title else "Untitled",
-                    'date_published': date_published if date_published else "Unknown",
-                    'full_content': content,
-                    'word_count': word_count,
-                    'images': images,
-                    'links': links,
-                    'contact_info': contact_info,
-                    'tags': tags,
-                    'metadata': {
-                        'source': 'alz.org',
-                        'scraper_version': '1.0'
-                    }
-                }
-                
-                full_content_list.append(full_content)
                 print(f"[ALZ.ORG] Successfully scraped: {title[:60]}... ({word_count} words)")
+                yield full_content
                 
             except Exception as e:
                 print(f"[ALZ.ORG] Error scraping {url}: {e}")
+                if self.fetcher.is_retryable(e):
+                    self.failed_urls.append({'url': url, 'kind': 'content', 'error': str(e)})
                 continue
+    
+    def parse_full_content(self, url: str, html: bytes) -> Dict[str, Any]:
+        """Extract the full content entry from a fetched article page"""
+        from bs4 import BeautifulSoup
         
-        print(f"[ALZ.ORG] Successfully scraped {len(full_content_list)} articles")
-        return full_content_list
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Extract title
+        title = ""
+        title_elem = soup.find(['h1', 'h2'], class_=re.compile(r'(title|headline)', re.I))
+        if not title_elem:
+            title_elem = soup.find('h1')
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+        
+        # Extract date
+        date_published = ""
+        # Look for date patterns
+        date_elem = soup.find(['time', 'span', 'p'], class_=re.compile(r'(date|published|time)', re.I))
+        if date_elem:
+            date_text = date_elem.get_text(strip=True)
+            # Try to parse various date formats
+            date_published = self._parse_date(date_text)
+        
+        # If no date found, try to extract from URL
+        if not date_published:
+            year_match = re.search(r'/news/(\d{4})/', url)
+            if year_match:
+                date_published = f"{year_match.group(1)}-01-01"
+        
+        # Extract main content
+        content = ""
+        
+        # Look for main content area
+        content_elem = soup.find(['article', 'div'], class_=re.compile(r'(content|body|article|text|main)', re.I))
+        if not content_elem:
+            content_elem = soup.find('article')
+        if not content_elem:
+            # Try to find the largest text block
+            content_elem = soup.find('main')
+        
+        if content_elem:
+            # Extract all paragraphs
+            paragraphs = content_elem.find_all('p')
+            content = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+        
+        # If no content found, try getting all paragraphs from body
+        if not content or len(content) < 100:
+            all_paragraphs = soup.find_all('p')
+            content = '\n\n'.join([p.get_text(strip=True) for p in all_paragraphs if len(p.get_text(strip=True)) > 50])
+        
+        # Extract images
+        images = []
+        if content_elem:
+            img_tags = content_elem.find_all('img')
+            for img in img_tags:
+                img_src = img.get('src', '')
+                if img_src:
+                    if img_src.startswith('/'):
+                        img_src = self.base_url + img_src
+                    images.append(img_src)
+        
+        # Extract links
+        links = []
+        if content_elem:
+            link_tags = content_elem.find_all('a', href=True)
+            for link in link_tags[:20]:  # Limit to first 20 links
+                link_url = link.get('href', '')
+                if link_url and not link_url.startswith('#'):
+                    if link_url.startswith('/'):
+                        link_url = self.base_url + link_url
+                    links.append(link_url)
+        
+        # Calculate word count
+        word_count = len(content.split()) if content else 0
+        
+        # Extract contact info if available
+        contact_info = ""
+        contact_elem = soup.find(['div', 'p'], class_=re.compile(r'contact', re.I))
+        if contact_elem:
+            contact_info = contact_elem.get_text(strip=True)
+        
+        # Extract tags/categories
+        tags = []
+        tag_elems = soup.find_all(['span', 'a'], class_=re.compile(r'(tag|category|topic)', re.I))
+        for tag in tag_elems[:10]:
+            tag_text = tag.get_text(strip=True)
+            if tag_text and len(tag_text) < 50:
+                tags.append(tag_text)
+        
+        return {
+            'id': str(uuid.uuid4()),
+            'url': url,
+            'title': title if title else "Untitled",
+            'date_published': date_published if date_published else "Unknown",
+            'full_content': content,
+            'word_count': word_count,
+            'images': images,
+            'links': links,
+            'contact_info': contact_info,
+            'tags': tags,
+            'metadata': {
+                'source': 'alz.org',
+                'scraper_version': '1.0'
+            }
+        }
     
     def _parse_date(self, date_str: str) -> str:
         """
@@ -4,14 +4,29 @@ FDA Press Announcements Scraper - Refactored for Base Scraper System
 Implements BaseScraperInterface for integration with the universal scraper orchestrator
 """
 
-import requests
-from bs4 import BeautifulSoup
-import time
 import re
+import sys
 from datetime import datetime
+from pathlib import Path
 from urllib.parse import urljoin
 import uuid
-from typing import Dict, List, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterable, Iterator, TYPE_CHECKING
+
+# requests and bs4 are imported where pages are fetched and parsed, keeping imports of this module cheap
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Import the shared fetch path if running standalone
+try:
+    from fetcher import Fetcher
+    from discovery import Discovery, DiscoveryUnavailable
+except ImportError:
+    # If running standalone, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from fetcher import Fetcher
+    from discovery import Discovery, DiscoveryUnavailable
 
 from abc import ABC, abstractmethod
 class BaseScraperInterface(ABC):
@@ -34,13 +49,20 @@ class BaseScraperInterface(ABC):
 class FDAScraper(BaseScraperInterface):
     """FDA Press Announcements Scraper implementing BaseScraperInterface"""
     
+    backfill_shard_by = 'pages'  # One long paginated listing that can't be queried by date
+    
     def __init__(self):
+        import requests
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
         self.base_url = "https://www.fda.gov"
-        self.delay = 1.0  # Default delay between requests
+        self.fetcher = Fetcher(self.session)  # Rate limited per host, shared with other scrapers
+        self.failed_urls = []  # Transient failures, queued by the orchestrator for the next run
+        self.listing_url = "https://www.fda.gov/news-events/fda-newsroom/press-announcements"
+        self.rss_url = "https://www.fda.gov/about-fda/contact-fda/stay-informed/rss-feeds/press-releases/rss.xml"
         
     def get_scraper_info(self) -> Dict[str, str]:
         """Return scraper metadata"""
@@ -61,21 +83,32 @@ class FDAScraper(BaseScraperInterface):
         except ValueError:
             return False
     
-    def _get_page(self, url: str, page: int = 0) -> Optional[BeautifulSoup]:
+    def _get_page(self, url: str, page: int = 0) -> Optional['BeautifulSoup']:
         """Get a page from the FDA website"""
+        if page > 0:
+            url = f"{url}?page={page}"
+        
         try:
-            if page > 0:
-                url = f"{url}?page={page}"
-            
-            print(f"Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            time.sleep(self.delay)
-            return BeautifulSoup(response.content, 'html.parser')
+            return self._fetch_soup(url)
         except Exception as e:
-            print(f"Error fetching {url}: {e}")
+            self._page_failed(url, e)
             return None
     
+    def _fetch_soup(self, url: str) -> 'BeautifulSoup':
+        """Fetch and parse a page, raising on failure"""
+        from bs4 import BeautifulSoup
+        
+        print(f"Fetching: {url}")
+        response = self.fetcher.get_html(url)
+        with self.fetcher.timed('parse_listing'):
+            return BeautifulSoup(response.content, 'html.parser')
+    
+    def _page_failed(self, url: str, error: Exception):
+        """Report a listing page failure, queueing it for retry if transient"""
+        print(f"Error fetching {url}: {error}")
+        if self.fetcher.is_retryable(error):
+            self.failed_urls.append({'url': url, 'kind': 'listing', 'error': str(error)})
+    
     def _parse_date(self, date_text: str) -> Optional[datetime]:
         """Parse date from text"""
         if not date_text:
@@ -138,14 +171,8 @@ class FDAScraper(BaseScraperInterface):
         
         return "General"
     
-    def _scrape_page(self, page_num: int = 0) -> List[Dict[str, Any]]:
-        """Scrape one page of press announcements"""
-        url = "https://www.fda.gov/news-events/fda-newsroom/press-announcements"
-        soup = self._get_page(url, page_num)
-        
-        if not soup:
-            return []
-        
+    def _parse_listing(self, soup: 'BeautifulSoup', page_num: int = 0) -> List[Dict[str, Any]]:
+        """Extract announcements from a press announcements listing page"""
         announcements = []
         processed_urls = set()
         
@@ -208,7 +235,12 @@ class FDAScraper(BaseScraperInterface):
     
     def scrape_announcements(self, start_date: str, end_date: str, **kwargs) -> List[Dict[str, Any]]:
         """Scrape announcements within a date range"""
+        return list(self.iter_announcements(start_date, end_date, **kwargs))
+    
+    def iter_announcements(self, start_date: str, end_date: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield announcements within a date range page by page, as each listing page is parsed"""
         max_pages = kwargs.get('max_pages', 10)
+        start_page = kwargs.get('start_page', 0)  # Backfill shards cover page ranges
         
         # Validate and parse dates
         if not self.validate_date_format(start_date) or not self.validate_date_format(end_date):
@@ -219,44 +251,133 @@ class FDAScraper(BaseScraperInterface):
         
         print(f"Scraping FDA announcements from {start_date} to {end_date}")
         
-        all_announcements = []
+        # The press release RSS feed answers recent ranges with one small XML fetch
+        if kwargs.get('use_discovery', True):
+            try:
+                discovered = self._discover_announcements(start_date, end_date)
+                print(f"Found {len(discovered)} announcements in the RSS feed")
+                yield from discovered
+                return
+            except DiscoveryUnavailable as e:
+                print(f"RSS discovery unavailable ({e}), using HTML listing pages")
         
-        for page in range(max_pages):
-            page_announcements = self._scrape_page(page)
-            
-            if not page_announcements:
-                print(f"No announcements found on page {page + 1}, stopping")
-                break
+        # Keep the next prefetch_pages listing pages in flight while the current one is parsed
+        prefetch_pages = max(0, kwargs.get('prefetch_pages', 3))
+        pages = iter(range(start_page, start_page + max_pages))
+        executor = ThreadPoolExecutor(max_workers=prefetch_pages + 1, thread_name_prefix='fda-listing')
+        in_flight = deque()
+        
+        def submit_next():
+            page = next(pages, None)
+            if page is not None:
+                url = f"{self.listing_url}?page={page}" if page > 0 else self.listing_url
+                in_flight.append((page, url, executor.submit(self.fetcher.in_thread(self._fetch_soup), url)))
+        
+        try:
+            for _ in range(prefetch_pages + 1):
+                submit_next()
             
-            # Filter by date
-            filtered = []
-            has_older_than_start = False
+            while in_flight:
+                page, url, future = in_flight.popleft()
+                submit_next()
+                
+                try:
+                    soup = future.result()
+                except Exception as e:
+                    self._page_failed(url, e)
+                    # A failed page is queued for retry; it doesn't mean the listing ended
+                    if self.fetcher.circuit_breaker.is_open(self.base_url):
+                        print(f"{self.base_url} is unreachable, stopping")
+                        break
+                    print(f"Page {page + 1} failed, continuing with the next page")
+                    continue
+                
+                page_announcements = self._parse_listing(soup, page)
+                if not page_announcements:
+                    print(f"No announcements found on page {page + 1}, stopping")
+                    break
+                
+                filtered, has_older_than_start = self._filter_by_date(page_announcements, start_dt, end_dt)
+                print(f"Page {page + 1}: {len(filtered)} announcements in date range\n")
+                yield from filtered
+                
+                # If we found announcements older than our start date, we can stop
+                if has_older_than_start and page > start_page:
+                    print("Found announcements older than start date, stopping search")
+                    break
+        finally:
+            # Past the cutoff: drop prefetches that haven't started, ignore the rest
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _discover_announcements(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Build announcements from the press release RSS feed"""
+        from bs4 import BeautifulSoup
+        
+        entries = Discovery(self.fetcher).feed_entries(
+            self.rss_url, start_date, end_date, url_pattern=r'/press-announcements/'
+        )
+        
+        announcements = []
+        for entry in entries:
+            clean_title = self._clean_title(entry['title'])
+            if not clean_title or len(clean_title) < 10:
+                continue
+            excerpt = BeautifulSoup(entry['summary'], 'html.parser').get_text(strip=True) if entry['summary'] else clean_title
             
-            for ann in page_announcements:
-                if ann['date']:
-                    ann_date = datetime.strptime(ann['date'], '%Y-%m-%d')
-                    
-                    if start_dt <= ann_date <= end_dt:
-                        filtered.append(ann)
-                        print(f"INCLUDED: {ann['title'][:50]}... ({ann['date']})")
-                    elif ann_date < start_dt:
-                        has_older_than_start = True
-                        print(f"TOO OLD: {ann['title'][:50]}... ({ann['date']})")
-                    else:
-                        print(f"TOO NEW: {ann['title'][:50]}... ({ann['date']})")
+            announcements.append({
+                'id': str(uuid.uuid4()),
+                'title': clean_title,
+                'url': entry['url'],
+                'date': entry['lastmod'],
+                'category': self._categorize_announcement(clean_title),
+                'excerpt': excerpt if len(excerpt) <= 200 else excerpt[:200] + "...",
+                'raw_title': entry['title'],
+                'source': 'FDA Press Announcements'
+            })
+        
+        return announcements
+    
+    def _filter_by_date(self, announcements: List[Dict[str, Any]], start_dt: datetime,
+                        end_dt: datetime) -> tuple[List[Dict[str, Any]], bool]:
+        """Keep announcements in range; also report whether any were older than the range"""
+        filtered = []
+        has_older_than_start = False
+        
+        for ann in announcements:
+            if ann['date']:
+                ann_date = datetime.strptime(ann['date'], '%Y-%m-%d')
+                
+                if start_dt <= ann_date <= end_dt:
+                    filtered.append(ann)
+                    print(f"INCLUDED: {ann['title'][:50]}... ({ann['date']})")
+                elif ann_date < start_dt:
+                    has_older_than_start = True
+                    print(f"TOO OLD: {ann['title'][:50]}... ({ann['date']})")
                 else:
-                    print(f"NO DATE: {ann['title'][:50]}... (skipping)")
-            all_announcements.extend(filtered)
-            print(f"Page {page + 1}: {len(filtered)} announcements in date range\n")
-            
-            # If we found announcements older than our start date, we can stop
-            if has_older_than_start and page > 0:
-                print("Found announcements older than start date, stopping search")
-                break
+                    print(f"TOO NEW: {ann['title'][:50]}... ({ann['date']})")
+            else:
+                print(f"NO DATE: {ann['title'][:50]}... (skipping)")
         
-        return all_announcements
+        return filtered, has_older_than_start
     
-    def _extract_full_content(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def scrape_listing_page(self, url: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """Re-scrape one listing page that failed in an earlier run"""
+        soup = self._get_page(url)
+        if not soup:
+            return []
+        
+        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+        end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+        filtered, _ = self._filter_by_date(self._parse_listing(soup), start_dt, end_dt)
+        return filtered
+    
+    def parse_full_content(self, url: str, html: bytes) -> Dict[str, Any]:
+        """Extract full content from a fetched announcement page"""
+        from bs4 import BeautifulSoup
+        
+        return self._extract_full_content(BeautifulSoup(html, 'html.parser'), url)
+    
+    def _extract_full_content(self, soup: 'BeautifulSoup', url: str) -> Dict[str, Any]:
         """Extract comprehensive content from an FDA announcement page"""
         content_data = {
             'id': str(uuid.uuid4()),
@@ -436,44 +557,46 @@ class FDAScraper(BaseScraperInterface):
     
     def scrape_full_content(self, announcement_urls: List[str], **kwargs) -> List[Dict[str, Any]]:
         """Scrape full content from announcement URLs"""
-        delay = kwargs.get('delay', self.delay)
-        self.delay = delay
+        print(f"Scraping full content from {len(announcement_urls)} URLs...")
         
-        full_content = []
-        failed_urls = []
+        full_content = list(self.iter_full_content(announcement_urls, **kwargs))
         
-        print(f"Scraping full content from {len(announcement_urls)} URLs...")
+        print(f"Successfully scraped: {len(full_content)}/{len(announcement_urls)}")
+        failed_count = len([url for url in announcement_urls if url]) - len(full_content)
+        if failed_count:
+            print(f"Failed URLs: {failed_count}")
+        
+        return full_content
+    
+    def iter_full_content(self, announcement_urls: Iterable[str], **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield full content one URL at a time; the URLs may arrive while pagination is still running"""
+        if 'delay' in kwargs:
+            # Legacy per-request delay becomes the host rate
+            self.fetcher.set_min_interval(self.base_url, kwargs['delay'])
+        
+        total = len(announcement_urls) if hasattr(announcement_urls, '__len__') else '?'
         
         for i, url in enumerate(announcement_urls, 1):
             if not url:
                 continue
                 
-            print(f"Processing {i}/{len(announcement_urls)}: {url}")
+            print(f"Processing {i}/{total}: {url}")
             
             try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                time.sleep(delay)
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                content = self._extract_full_content(soup, url)
+                response = self.fetcher.get_html(url)
+                with self.fetcher.timed('parse_content'):
+                    content = self.parse_full_content(url, response.content)
                 
                 if content['full_content']:
-                    full_content.append(content)
                     print(f"Success! Extracted {content['word_count']} words")
+                    yield content
                 else:
-                    failed_urls.append(url)
                     print(f"No content extracted")
                     
             except Exception as e:
-                failed_urls.append(url)
                 print(f"Error: {e}")
-        
-        print(f"Successfully scraped: {len(full_content)}/{len(announcement_urls)}")
-        if failed_urls:
-            print(f"Failed URLs: {len(failed_urls)}")
-        
-        return full_content
+                if self.fetcher.is_retryable(e):
+                    self.failed_urls.append({'url': url, 'kind': 'content', 'error': str(e)})
 
 
 # Standalone usage capability for backward compatibility
@@ -485,6 +608,7 @@ def main():
     parser.add_argument('--start-date', required=True, help='Start date (YYYY-MM-DD)')
     parser.add_argument('--end-date', required=True, help='End date (YYYY-MM-DD)')
     parser.add_argument('--max-pages', type=int, default=10, help='Max pages to scrape')
+    parser.add_argument('--prefetch-pages', type=int, default=3, help='Listing pages fetched ahead of the one being parsed')
     parser.add_argument('--full-content', action='store_true', help='Also scrape full content')
     parser.add_argument('--output', default='fda_results.json', help='Output file')
     
@@ -501,7 +625,8 @@ def main():
     announcements = scraper.scrape_announcements(
         args.start_date, 
         args.end_date, 
-        max_pages=args.max_pages
+        max_pages=args.max_pages,
+        prefetch_pages=args.prefetch_pages
     )
     
     results = {
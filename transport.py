@@ -0,0 +1,214 @@
+"""
+Shared HTTP Transport
+One connection pool for every scraper, so scrapers hitting the same domain
+reuse keep-alive connections instead of each opening their own. The default
+backend is a tuned requests.Session; with httpx installed an HTTP/2 client
+can multiplex all requests to a host over a single connection.
+
+requests and httpx are imported when a transport is built, not with this
+module, so entry points that never fetch don't pay for them.
+"""
+
+import importlib.util
+import socket
+import threading
+import time
+from typing import Dict, Any
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class DNSCache:
+    """
+    TTL cache in front of socket.getaddrinfo
+
+    Installed process-wide, so both the requests (urllib3) and httpx
+    backends skip the resolver for hosts looked up in the last ttl seconds.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._original = None
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            cached = self.entries.get(key)
+            if cached and cached[0] > now:
+                return cached[1]
+
+        result = self._original(host, port, family, type, proto, flags)
+        with self._lock:
+            self.entries[key] = (now + self.ttl, result)
+        return result
+
+    def install(self):
+        """Route socket.getaddrinfo through the cache"""
+        if self._original is None:
+            self._original = socket.getaddrinfo
+            socket.getaddrinfo = self.getaddrinfo
+
+    def uninstall(self):
+        """Restore the original resolver"""
+        if self._original is not None:
+            socket.getaddrinfo = self._original
+            self._original = None
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+class RequestsTransport:
+    """A requests.Session with keep-alive pools sized for concurrent scrapers"""
+
+    name = 'requests'
+
+    def __init__(self, pool_size: int = 10, max_hosts: int = 32):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.pool_size = pool_size
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = DEFAULT_USER_AGENT
+        # Retries are the Fetcher's job; urllib3 must not retry behind its back
+        adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, **kwargs) -> Any:
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxResponse:
+    """Expose an httpx response through the parts of the requests API the Fetcher uses"""
+
+    def __init__(self, response: Any):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.http_version = response.http_version
+
+    @property
+    def content(self) -> bytes:
+        return self._response.read()
+
+    @property
+    def text(self) -> str:
+        self._response.read()
+        return self._response.text
+
+    def iter_content(self, chunk_size: int = 64 * 1024):
+        import httpx
+        import requests
+
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e))
+
+    def raise_for_status(self):
+        # Raise the requests exception so RetryPolicy treats both backends alike
+        if self.status_code >= 400:
+            import requests
+
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._response.close()
+
+
+class HttpxTransport:
+    """httpx client with HTTP/2 multiplexing (falls back to HTTP/1.1 without the h2 package)"""
+
+    name = 'httpx'
+
+    def __init__(self, pool_size: int = 10, http2: bool = True, keepalive_expiry: float = 30.0):
+        import httpx
+
+        if http2 and importlib.util.find_spec('h2') is None:
+            print("Warning: h2 not installed (pip install 'httpx[http2]'), using HTTP/1.1")
+            http2 = False
+
+        self.http2 = http2
+        self.client = httpx.Client(
+            http2=http2,
+            follow_redirects=True,
+            headers={'User-Agent': DEFAULT_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=pool_size * 4,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+
+    def get(self, url: str, timeout: float = None, stream: bool = False,
+            headers: Dict[str, str] = None, **kwargs) -> HttpxResponse:
+        import httpx
+        import requests
+
+        request = self.client.build_request('GET', url, headers=headers, timeout=timeout, **kwargs)
+        try:
+            response = self.client.send(request, stream=True)
+            if not stream:
+                try:
+                    response.read()
+                finally:
+                    response.close()
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e))
+        return HttpxResponse(response)
+
+    def close(self):
+        self.client.close()
+
+
+def build_transport(backend: str = 'requests', pool_size: int = 10, http2: bool = True) -> Any:
+    """Create a transport, falling back to requests when httpx is unavailable"""
+    if backend == 'httpx':
+        if importlib.util.find_spec('httpx') is not None:
+            return HttpxTransport(pool_size, http2=http2)
+        print("Warning: httpx not installed, falling back to requests transport")
+    return RequestsTransport(pool_size)
+
+
+_shared_transport = None
+_shared_dns_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_transport() -> Any:
+    """Return the process-wide transport, creating a requests one on first use"""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is None:
+            _shared_transport = RequestsTransport()
+        return _shared_transport
+
+
+def set_shared_transport(transport: Any):
+    """Install the transport scrapers should share"""
+    global _shared_transport
+    with _shared_lock:
+        _shared_transport = transport
+
+
+def install_dns_cache(ttl: float = 300.0) -> DNSCache:
+    """Install the process-wide DNS cache once; later calls only update its TTL"""
+    global _shared_dns_cache
+    with _shared_lock:
+        if _shared_dns_cache is None:
+            _shared_dns_cache = DNSCache(ttl)
+            _shared_dns_cache.install()
+        _shared_dns_cache.ttl = ttl
+        return _shared_dns_cache
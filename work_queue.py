@@ -0,0 +1,298 @@
+"""
+Durable Work Queue
+Listing pages and article URLs as leased tasks, so any number of worker
+processes (on one host, or several sharing the file) can crawl in parallel
+while a single writer owns the master store. Tasks are leased for a
+visibility timeout: a worker that dies mid-task simply lets its lease expire
+and the task is handed to another worker.
+
+The SQLite implementation needs no external services. By default it uses
+WAL mode, which keeps its index in shared memory, so every process must run
+on the host that holds the file. For workers on several hosts, open the
+queue with shared=True: it then uses a rollback journal, which only needs
+working POSIX locks on the network filesystem (slower, but safe over NFS).
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Any, Iterable
+
+
+def default_worker_id() -> str:
+    """host:pid:random, unique across the hosts sharing a queue"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass(slots=True)
+class Task:
+    """A leased unit of work"""
+    id: int
+    kind: str  # 'listing', 'listing_page' or 'content'
+    scraper: str
+    key: str
+    payload: Dict[str, Any]
+    attempts: int
+
+
+@dataclass(slots=True)
+class TaskResult:
+    """Output of a task, waiting for the writer"""
+    id: int
+    task_id: int
+    kind: str  # 'announcements' or 'content'
+    scraper: str
+    payload: Dict[str, Any]
+
+
+class WorkQueue(ABC):
+    """Leased tasks for workers and a result channel to the single writer"""
+
+    @abstractmethod
+    def push(self, kind: str, scraper: str, key: str, payload: Dict[str, Any], priority: float = 0) -> bool:
+        """Queue a task unless an unfinished task with the same key exists; returns whether it was queued"""
+
+    @abstractmethod
+    def lease(self, owner: str, kinds: Iterable[str] = None, limit: int = 1) -> List[Task]:
+        """Take up to limit ready tasks for visibility_timeout seconds"""
+
+    @abstractmethod
+    def extend(self, task: Task, owner: str) -> bool:
+        """Renew a lease still held by owner"""
+
+    @abstractmethod
+    def complete(self, task: Task, owner: str, results: List[Dict[str, Any]] = None) -> bool:
+        """Finish a task and hand its results to the writer; False if the lease was lost"""
+
+    @abstractmethod
+    def fail(self, task: Task, owner: str, error: str, retry: bool = True):
+        """Give a task back (after a backoff) or, past max_attempts, mark it dead"""
+
+    @abstractmethod
+    def results(self, limit: int = 100) -> List[TaskResult]:
+        """Oldest results not yet acknowledged by the writer"""
+
+    @abstractmethod
+    def ack_results(self, result_ids: List[int]):
+        """Drop results the writer has stored"""
+
+    @abstractmethod
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew a named lock (e.g. the single writer)"""
+
+    @abstractmethod
+    def release_lock(self, name: str, owner: str):
+        """Give up a named lock"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Task counts by kind and status"""
+
+    @abstractmethod
+    def outstanding(self) -> int:
+        """Tasks not yet done or dead, plus results the writer hasn't stored"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    """WorkQueue in a SQLite file; safe for concurrent processes"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            scraper TEXT NOT NULL,
+            key TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            priority REAL NOT NULL DEFAULT 0,
+            status TEXT NOT NULL DEFAULT 'pending',
+            lease_owner TEXT,
+            available_at REAL NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            UNIQUE (scraper, kind, key)
+        );
+        CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, kind, priority DESC, id);
+        CREATE TABLE IF NOT EXISTS results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            scraper TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS locks (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = "scraped_data/work_queue.db", visibility_timeout: float = 600,
+                 max_attempts: int = 5, retry_delay: float = 60, shared: bool = False):
+        self.path = Path(path)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay  # Doubled on every failed attempt
+        # WAL needs shared memory between all connections; a network share needs a rollback journal
+        self.journal_mode = 'DELETE' if shared else 'WAL'
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")  # Persisted in the file
+            conn.executescript(self.SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """A connection inside BEGIN IMMEDIATE, so concurrent writers queue on the file lock"""
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            conn.execute("PRAGMA busy_timeout=60000")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def push(self, kind: str, scraper: str, key: str, payload: Dict[str, Any], priority: float = 0) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            # A finished task with the same key is queued again; an unfinished one is left alone
+            cursor = conn.execute(
+                """INSERT INTO tasks (kind, scraper, key, payload, priority, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (scraper, kind, key) DO UPDATE SET
+                       payload = excluded.payload, priority = excluded.priority, status = 'pending',
+                       attempts = 0, available_at = 0, last_error = NULL, updated_at = excluded.updated_at
+                   WHERE tasks.status IN ('done', 'dead')""",
+                (kind, scraper, key, json.dumps(payload, default=str), priority, now, now)
+            )
+            return cursor.rowcount > 0
+
+    def lease(self, owner: str, kinds: Iterable[str] = None, limit: int = 1) -> List[Task]:
+        now = time.time()
+        kinds = list(kinds or [])
+        kind_filter = f"AND kind IN ({','.join('?' * len(kinds))})" if kinds else ""
+
+        with self._transaction() as conn:
+            # Expired leases of workers that died count as failed attempts
+            conn.execute(
+                """UPDATE tasks SET status = 'dead', last_error = 'lease expired', lease_owner = NULL
+                   WHERE status = 'leased' AND available_at < ? AND attempts >= ?""",
+                (now, self.max_attempts)
+            )
+            rows = conn.execute(
+                f"""SELECT id, kind, scraper, key, payload, attempts FROM tasks
+                    WHERE status IN ('pending', 'leased') AND available_at <= ? {kind_filter}
+                    ORDER BY priority DESC, id LIMIT ?""",
+                (now, *kinds, limit)
+            ).fetchall()
+
+            tasks = []
+            for task_id, kind, scraper, key, payload, attempts in rows:
+                conn.execute(
+                    """UPDATE tasks SET status = 'leased', lease_owner = ?, available_at = ?,
+                       attempts = attempts + 1, updated_at = ? WHERE id = ?""",
+                    (owner, now + self.visibility_timeout, now, task_id)
+                )
+                tasks.append(Task(task_id, kind, scraper, key, json.loads(payload), attempts + 1))
+            return tasks
+
+    def extend(self, task: Task, owner: str) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE tasks SET available_at = ?, updated_at = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (now + self.visibility_timeout, now, task.id, owner)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, task: Task, owner: str, results: List[Dict[str, Any]] = None) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE tasks SET status = 'done', lease_owner = NULL, updated_at = ?
+                   WHERE id = ? AND status = 'leased' AND lease_owner = ?""",
+                (now, task.id, owner)
+            )
+            if cursor.rowcount == 0:
+                return False  # Lease expired and the task went to another worker
+            for result in results or []:
+                conn.execute(
+                    "INSERT INTO results (task_id, kind, scraper, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (task.id, result['kind'], task.scraper, json.dumps(result['payload'], default=str), now)
+                )
+            return True
+
+    def fail(self, task: Task, owner: str, error: str, retry: bool = True):
+        now = time.time()
+        dead = not retry or task.attempts >= self.max_attempts
+        with self._transaction() as conn:
+            conn.execute(
+                """UPDATE tasks SET status = ?, lease_owner = NULL, available_at = ?, last_error = ?, updated_at = ?
+                   WHERE id = ? AND lease_owner = ?""",
+                ('dead' if dead else 'pending', now + self.retry_delay * (2 ** (task.attempts - 1)),
+                 error[:1000], now, task.id, owner)
+            )
+
+    def results(self, limit: int = 100) -> List[TaskResult]:
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, task_id, kind, scraper, payload FROM results ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [TaskResult(row[0], row[1], row[2], row[3], json.loads(row[4])) for row in rows]
+
+    def ack_results(self, result_ids: List[int]):
+        if not result_ids:
+            return
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM results WHERE id = ?", [(result_id,) for result_id in result_ids])
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT owner, expires_at FROM locks WHERE name = ?", (name,)).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO locks (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + ttl)
+            )
+            return True
+
+    def release_lock(self, name: str, owner: str):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM locks WHERE name = ? AND owner = ?", (name, owner))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._transaction() as conn:
+            rows = conn.execute("SELECT kind, status, COUNT(*) FROM tasks GROUP BY kind, status").fetchall()
+            pending_results = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        counts = {}
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        counts['results'] = {'pending': pending_results}
+        return counts
+
+    def outstanding(self) -> int:
+        with self._transaction() as conn:
+            tasks = conn.execute("SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+            results = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return tasks + results